@@ -1,38 +1,48 @@
+import json
+import os
+
 import dash
 import dash_mantine_components as dmc
 import pandas as pd
 import plotly.graph_objs as go
-from dash import html, dcc, callback, Input, Output, State, ALL
+from dash import html, dcc, callback, clientside_callback, ClientsideFunction, Input, Output, State, ALL
 from dash.exceptions import PreventUpdate
 from dash_iconify import DashIconify
-from typing import Union
+from flask import jsonify
+from plotly.io.json import to_json_plotly
+from typing import Optional
 
 # Import Constants
 from constants.metrics import (
     financial_performance_metrics, engagement_metrics, arr_metrics, attrition_metrics, all_metrics,
-    BREAKDOWN_OPTIONS_MAPPING, ONE_TIME_FREQUENCY
+    BREAKDOWN_OPTIONS_MAPPING
 )
-from constants.time import YEAR_MIN, YEAR_MAX, today
 from constants.ui import (
     METRIC_PANEL_SIZE_COL, CHART_PANEL_SIZE_COL, OFFSET_COL,
     SHADOW, HEIGHT_RIGHT_CHART, NO_ENOUGH_DATA_LAYOUT,
     GITHUB, GITHUB_ICON_WIDTH
 )
-from constants.colors import HEADER_COLOR, COLOR_POSITIVE, COLOR_NEUTRAL, COLOR_NEGATIVE, TITLE_COLOR
+from constants.colors import (
+    HEADER_COLOR, COLOR_POSITIVE, COLOR_NEUTRAL, COLOR_NEGATIVE, TITLE_COLOR, SELECTED_ROW_BACKGROUND
+)
 from constants.charts import FIG_CONFIG
+from constants.settings import (
+    OUTPUT_CACHE_SIZE, OUTPUT_CACHE_TTL, WARMUP, WARMUP_BLOCKING, RESULT_STORE, SINGLE_FLIGHT_FILE_LOCK,
+    DATA_REFRESH_INTERVAL, MINIFY_FIGURES, FIGURE_PRECISION, START_AFTER_FORK
+)
 
 # Import data
-from load_data.load_targets import targets_data
-from load_data.load_payments_and_pledges import df_payments_and_pledges
+from load_data.load_targets import targets_data, TARGETS_PATH
+from load_data.load_payments_and_pledges import get_file_fingerprint, CACHE_DIR
+from load_data.data_manager import data_manager
 
 # Import helpers functions
 from utils.helpers import (
-    get_year_bounds, get_comparison_quarters, add_quarter,
-    filter_to_period, filter_to_specific_quarter,
-    find_metric_by_slug,
+    get_year_bounds, get_comparison_quarters,
+    filter_to_period, get_comparison_period_bounds,
     get_combined_comparison_df,
 )
-from utils.figures import make_timeseries_chart, make_breakdown_bar_chart
+from utils.figures import make_timeseries_chart, get_breakdown_bar_values, FIGURE_TEMPLATES
 from utils.metric_panel_layout import (
     add_header_to_panel,
     create_subcategory_layout,
@@ -41,6 +51,14 @@ from utils.metric_panel_layout import (
     make_line_legend
 )
 from utils.modal import make_modal
+from utils.metrics_engine import Metric, evaluate_metrics
+from utils.data_store import SelectionStore
+from utils.cache import OutputCache, SingleFlight
+from utils.decorators import cache_output
+from utils.patches import make_patch
+from utils.serialization import FigureMinimizer, factor_templates, round_value
+from utils.warmup import Warmup, WarmupTask
+from utils.result_store import ResultStore, get_namespace, get_code_fingerprint
 
 # Pandas config
 pd.set_option('display.max_columns', None)
@@ -68,331 +86,376 @@ app = dash.Dash(
 
 server = app.server
 
-app.layout = dmc.MantineProvider(
-    [
-        html.Link(
-            href="https://fonts.googleapis.com/css2?family=Palanquin:wght@400;500;600;700&display=swap",
-            rel="stylesheet"
-        ),
-        make_modal(),
-        dcc.Store('payments-pledges-data'),
-        dcc.Store('active-metric-slug'),
-        dmc.Grid(
-            [
-                dmc.GridCol(
-                    span={'md': METRIC_PANEL_SIZE_COL + (2 * OFFSET_COL)},
-                    style={
-                        'background-color': HEADER_COLOR,
-                    },
-                    className='left-header'
-                ),
-                dmc.GridCol(
-                    [
-                        dmc.Flex(
-                            [
-                                dmc.Stack(
-                                    [
-                                        dmc.Image(src='assets/images/logo.png', alt='OFTW Logo', w=200),
-                                        dmc.Box(
-                                            [
-                                                dmc.Title(
-                                                    'Scaling the effective giving movement addressing extreme poverty',
-                                                    order=5,
-                                                    c='rgba(255, 255, 255, 0.7)',
-                                                    fw=400
-                                                ),
-                                                dmc.Text(f'Last update: {today.date()}', c='rgba(255, 255, 255, 0.5)'),
-                                            ],
-                                            ml=7
-                                        )
-                                    ],
-                                    style={'width': '95%'},
-                                    gap=0,
-                                ),
-                                dmc.Anchor(
-                                    [
-                                        DashIconify(icon='uil:github', color='rgba(255, 255, 255, 0.8)',
-                                                    width=GITHUB_ICON_WIDTH),
-                                    ],
-                                    style={
-                                        'width': 'auto',
-                                    },
-                                    href=GITHUB
-                                )
-                            ],
-                            mt='xs',
-                            justify='space-around'
-                        )
-                    ],
-                    span={
-                        'md': CHART_PANEL_SIZE_COL
-                    },
-                    className='right-header',
-                    style={'background-color': HEADER_COLOR, 'height': '190px'}
-                ),
-                dmc.GridCol(span='auto', style={'background-color': HEADER_COLOR}, className='left-header')
-            ],
-            # mb='xl',
-            gutter=0
-        ),
-        dmc.Grid(
-            [
-                dmc.GridCol(
-                    [
-                        dmc.Box(
-                            [
-                                dmc.Flex(
-                                    [
-                                        dmc.Title(
-                                            'Are we on pace to reach our goals?', c=HEADER_COLOR, order=3,
-                                            style={'width': '100%'}
-                                        ),
-                                        dmc.ActionIcon(
-                                            DashIconify(icon='ph:question-bold', width=25, color=HEADER_COLOR),
-                                            variant='transparent',
-                                            style={'width': 'auto'},
-                                            id='about-data-source'
-                                        ),
-                                    ],
-                                    justify='space-around'
-                                ),
-                                dmc.Group(
-                                    [
-                                        dmc.Group(
-                                            [
-                                                make_color_legend("On Track", COLOR_POSITIVE),
-                                                make_color_legend("Slightly Behind", COLOR_NEUTRAL),
-                                                make_color_legend("Off Track", COLOR_NEGATIVE)
-                                            ],
-                                            gap='md',
-                                            mt='md'
-                                        ),
-                                        dmc.Group([
-                                            make_line_legend("Target", style='solid', color=HEADER_COLOR),
-                                            make_line_legend("Pace", style='dashed')
-                                        ], gap='md', mt='md')
-                                    ],
-                                    gap='xl',
-                                    mb='xl'
-                                ),
-                                dcc.Loading(
-                                    [
-                                        # Financial Performance
-                                        *create_subcategory_layout(
-                                            container_id='financial-performance-metric-panel-container',
-                                            subcategory_title='Financial Performance',
-                                            is_first_category=True
-                                        ),
-
-                                        # Donor Engagement
-                                        *create_subcategory_layout(
-                                            container_id='donor-engagement-metric-panel-container',
-                                            subcategory_title='Donor Engagement'
-                                        ),
-
-                                        # Revenue Projection (ARR)
-                                        *create_subcategory_layout(
-                                            container_id='arr-metric-panel-container',
-                                            subcategory_title='Revenue Projection (ARR)'
-                                        ),
-
-                                        # Attrition
-                                        *create_subcategory_layout(
-                                            container_id='attrition-metric-panel-container',
-                                            subcategory_title='Attrition',
-                                            annotation_text='Less is better',
-                                            label_tooltip="Shows the absolute change in percentage points (pp) from the previous period."
-                                                          " For example, 12% → 9% = -3pp."
-                                        ),
-                                    ],
-                                    overlay_style={"visibility": "visible", "opacity": .6, "backgroundColor": "white"},
-                                    type='circle',
-                                    color=HEADER_COLOR
-                                ),
-                            ],
-                            mt=-125,
-                            style={
-                                'width': '100%',
-                                'padding': '25px',
-                                'background-color': '#FFFFFF',
-                                'border-radius': '10px',
-                                **SHADOW,
-                            }
-                        )
-
-                    ],
-                    span={
-                        'md': METRIC_PANEL_SIZE_COL
-                    },
-                    offset={'md': OFFSET_COL},
-                    mb=55,
-                ),
-                dmc.GridCol(
-                    [
-                        dmc.Stack(
-                            [
-                                dmc.Group(
-                                    [
-                                        dmc.SegmentedControl(
-                                            data=[
-                                                {'value': 'fy', 'label': 'Fiscal Year'},
-                                                {'value': 'cy', 'label': 'Calendar Year'},
-                                            ],
-                                            id="segmented-control-year-mode",
-                                            value="fy",
-                                            style={'width': '40%'},
-                                            styles={
-                                                'innerLabel': {'color': HEADER_COLOR}
-                                            }
-                                        ),
-                                        dmc.Select(
-                                            label=None,
-                                            id="select-year",
-                                            value=str(YEAR_MAX),
-                                            # value='2023',
-                                            style={'width': '20%'},
-                                            data=[
-                                                {'value': str(year), 'label': str(year)}
-                                                for year in range(YEAR_MIN, YEAR_MAX + 1)
-                                            ],
-                                            clearable=False,
-                                            allowDeselect=False
-                                        ),
-                                        dmc.Select(
-                                            label=None,
-                                            id="select-quarter",
-                                            value='all',
-                                            style={'width': '20%'},
-                                            # value='3',
-                                            data=[
-                                                *[{'value': 'all', 'label': 'All Quarters'}],
-                                                *[{'value': str(i), 'label': f'Q{i}'} for i in range(1, 5)]
-                                            ],
-                                            clearable=False,
-                                            allowDeselect=False,
-                                        ),
-                                    ],
-                                    mt=-40,
-                                    justify='center',
-                                    style={
-                                        'padding': '15px',
-                                        'width': '100%',
-                                        'backgroundColor': 'white',
-                                        'borderRadius': '10px',
-                                        **SHADOW
-                                    }
-                                ),
-                                dmc.Box(
-                                    [
-                                        dmc.Title(
-                                            'Times series of',
-                                            order=4,
-                                            id='title-times-series',
-                                            c=HEADER_COLOR,
-                                            style={'width': '45%'}
-                                        ),
-                                        dcc.Loading(
-                                            [html.Div(id='times-series-chart-container')],
-                                            overlay_style={"visibility": "visible", "opacity": .6,
-                                                           "backgroundColor": "white"},
-                                            type='circle',
-                                            color=HEADER_COLOR
-                                        )
-                                    ],
-                                    style={
-                                        'width': '100%',
-                                        'padding': '25px',
-                                        'background-color': '#FFFFFF',
-                                        'border-radius': '10px',
-                                        **SHADOW
-                                    }
-                                ),
-                                dmc.Box(
-                                    [
-                                        dmc.Group(
-                                            [
-                                                dmc.Title(
-                                                    'Breakdown by',
-                                                    order=4,
-                                                    id='title-breakdown',
-                                                    c=HEADER_COLOR,
-                                                    style={'width': '45%'}
-                                                ),
-                                                dmc.Group(
-                                                    [
-                                                        dmc.Select(
-                                                            value='platform',
-                                                            data=[
-                                                                {'value': 'platform', 'label': 'Payment Platform'},
-                                                                {'value': 'chapter', 'label': 'Chapter Type'},
-                                                                {'value': 'channel', 'label': 'Channel'},
-                                                                {'value': 'recurring',
-                                                                 'label': 'Reoccuring v. One-Time'},
-                                                            ],
-                                                            style={'width': '50%'},
-                                                            clearable=False,
-                                                            id='breakdown-dropdown-category',
-                                                            allowDeselect=False
-                                                        ),
-                                                        dmc.Select(
-                                                            value='5',
-                                                            data=[
-                                                                {'value': '5', 'label': '5'},
-                                                                {'value': '10', 'label': '10'},
-                                                                {'value': 'all', 'label': 'All'},
-                                                            ],
-                                                            clearable=False,
-                                                            style={'width': '20%'},
-                                                            id='breakdown-dropdown-top',
-                                                            allowDeselect=False
-                                                        )
-                                                    ],
-                                                    justify='flex-end',
-                                                    style={'width': '50%'}
-                                                )
-                                            ],
-                                            mb='lg',
-                                            justify='space-between'
-                                        ),
-                                        dcc.Loading(
-                                            [html.Div(id='breakdown-chart-container')],
-                                            overlay_style={"visibility": "visible", "opacity": .6,
-                                                           "backgroundColor": "white"},
-                                            type='circle',
-                                            color=HEADER_COLOR
-                                        )
-                                    ],
-                                    style={
-                                        'width': '100%',
-                                        'padding': '25px',
-                                        'background-color': '#FFFFFF',
-                                        'border-radius': '10px',
-                                        **SHADOW
-                                    }
-                                )
-                            ],
-                            align='center'
-                        )
-                    ],
-                    span={
-                        'md': CHART_PANEL_SIZE_COL
-                    },
-                    offset={'md': OFFSET_COL},
-                )
-            ],
-            style={
-                'height': '95vh',
-            },
-            gutter=0
-        ),
-    ],
-    theme={
-        'headings': {
-            'fontFamily': "'Palanquin', sans-serif"
-        }
-    }
+# Filtered dataset slices, kept server side (the browser only stores the selection key)
+selection_store = SelectionStore(
+    df=data_manager.dataset.df,
+    cube=data_manager.dataset.cube,
+    donor_index=data_manager.dataset.donor_index,
+    version=data_manager.version
+)
+
+# New data versions (rows appended to the CSV, see `data_manager`) are swapped in without a restart
+data_manager.subscribe(selection_store.swap)
+if DATA_REFRESH_INTERVAL and not START_AFTER_FORK:
+    data_manager.start(interval=DATA_REFRESH_INTERVAL)
+
+# Rendered outputs of the heavy callbacks, per selection and data version (persisted across restarts when enabled,
+# for as long as the targets and the code are unchanged)
+output_cache = OutputCache(
+    maxsize=OUTPUT_CACHE_SIZE,
+    ttl=OUTPUT_CACHE_TTL or None,
+    persistent_store=ResultStore(
+        namespace=get_namespace(get_file_fingerprint(TARGETS_PATH), get_code_fingerprint())
+    ) if RESULT_STORE else None
 )
 
+# Concurrent requests for the same output wait for a single computation
+single_flight = SingleFlight(lock_dir=os.path.join(CACHE_DIR, 'locks') if SINGLE_FLIGHT_FILE_LOCK else None)
+
+# Figures are minimized once when rendered, and served minimized from the cache
+figure_minimizer = FigureMinimizer(digits=FIGURE_PRECISION) if MINIFY_FIGURES else None
+
+
+def serve_layout() -> dmc.MantineProvider:
+    """
+    Builds the layout on every page load, so the year options and the last update date follow
+    the data version currently loaded (see `data_manager`).
+    """
+    summary = data_manager.summary
+
+    return dmc.MantineProvider(
+        [
+            html.Link(
+                href="https://fonts.googleapis.com/css2?family=Palanquin:wght@400;500;600;700&display=swap",
+                rel="stylesheet"
+            ),
+            make_modal(),
+            dcc.Store('payments-pledges-data'),
+            dcc.Store('active-metric-slug'),
+            dcc.Store('metric-bundle'),
+            dcc.Store('metric-panels-rendered'),
+            # Colors of the selected metric row, read by the clientside highlight (see `clientside.js`)
+            dcc.Store('metric-row-colors', data={'background': SELECTED_ROW_BACKGROUND, 'border': HEADER_COLOR}),
+            dmc.Grid(
+                [
+                    dmc.GridCol(
+                        span={'md': METRIC_PANEL_SIZE_COL + (2 * OFFSET_COL)},
+                        style={
+                            'background-color': HEADER_COLOR,
+                        },
+                        className='left-header'
+                    ),
+                    dmc.GridCol(
+                        [
+                            dmc.Flex(
+                                [
+                                    dmc.Stack(
+                                        [
+                                            dmc.Image(src='assets/images/logo.png', alt='OFTW Logo', w=200),
+                                            dmc.Box(
+                                                [
+                                                    dmc.Title(
+                                                        'Scaling the effective giving movement addressing extreme poverty',
+                                                        order=5,
+                                                        c='rgba(255, 255, 255, 0.7)',
+                                                        fw=400
+                                                    ),
+                                                    dmc.Text(f'Last update: {summary.date_max.date()}',
+                                                             c='rgba(255, 255, 255, 0.5)'),
+                                                ],
+                                                ml=7
+                                            )
+                                        ],
+                                        style={'width': '95%'},
+                                        gap=0,
+                                    ),
+                                    dmc.Anchor(
+                                        [
+                                            DashIconify(icon='uil:github', color='rgba(255, 255, 255, 0.8)',
+                                                        width=GITHUB_ICON_WIDTH),
+                                        ],
+                                        style={
+                                            'width': 'auto',
+                                        },
+                                        href=GITHUB
+                                    )
+                                ],
+                                mt='xs',
+                                justify='space-around'
+                            )
+                        ],
+                        span={
+                            'md': CHART_PANEL_SIZE_COL
+                        },
+                        className='right-header',
+                        style={'background-color': HEADER_COLOR, 'height': '190px'}
+                    ),
+                    dmc.GridCol(span='auto', style={'background-color': HEADER_COLOR}, className='left-header')
+                ],
+                # mb='xl',
+                gutter=0
+            ),
+            dmc.Grid(
+                [
+                    dmc.GridCol(
+                        [
+                            dmc.Box(
+                                [
+                                    dmc.Flex(
+                                        [
+                                            dmc.Title(
+                                                'Are we on pace to reach our goals?', c=HEADER_COLOR, order=3,
+                                                style={'width': '100%'}
+                                            ),
+                                            dmc.ActionIcon(
+                                                DashIconify(icon='ph:question-bold', width=25, color=HEADER_COLOR),
+                                                variant='transparent',
+                                                style={'width': 'auto'},
+                                                id='about-data-source'
+                                            ),
+                                        ],
+                                        justify='space-around'
+                                    ),
+                                    dmc.Group(
+                                        [
+                                            dmc.Group(
+                                                [
+                                                    make_color_legend("On Track", COLOR_POSITIVE),
+                                                    make_color_legend("Slightly Behind", COLOR_NEUTRAL),
+                                                    make_color_legend("Off Track", COLOR_NEGATIVE)
+                                                ],
+                                                gap='md',
+                                                mt='md'
+                                            ),
+                                            dmc.Group([
+                                                make_line_legend("Target", style='solid', color=HEADER_COLOR),
+                                                make_line_legend("Pace", style='dashed')
+                                            ], gap='md', mt='md')
+                                        ],
+                                        gap='xl',
+                                        mb='xl'
+                                    ),
+                                    dcc.Loading(
+                                        [
+                                            # Financial Performance
+                                            *create_subcategory_layout(
+                                                container_id='financial-performance-metric-panel-container',
+                                                subcategory_title='Financial Performance',
+                                                is_first_category=True
+                                            ),
+
+                                            # Donor Engagement
+                                            *create_subcategory_layout(
+                                                container_id='donor-engagement-metric-panel-container',
+                                                subcategory_title='Donor Engagement'
+                                            ),
+
+                                            # Revenue Projection (ARR)
+                                            *create_subcategory_layout(
+                                                container_id='arr-metric-panel-container',
+                                                subcategory_title='Revenue Projection (ARR)'
+                                            ),
+
+                                            # Attrition
+                                            *create_subcategory_layout(
+                                                container_id='attrition-metric-panel-container',
+                                                subcategory_title='Attrition',
+                                                annotation_text='Less is better',
+                                                label_tooltip="Shows the absolute change in percentage points (pp) from the previous period."
+                                                              " For example, 12% → 9% = -3pp."
+                                            ),
+                                        ],
+                                        overlay_style={"visibility": "visible", "opacity": .6, "backgroundColor": "white"},
+                                        type='circle',
+                                        color=HEADER_COLOR
+                                    ),
+                                ],
+                                mt=-125,
+                                style={
+                                    'width': '100%',
+                                    'padding': '25px',
+                                    'background-color': '#FFFFFF',
+                                    'border-radius': '10px',
+                                    **SHADOW,
+                                }
+                            )
+
+                        ],
+                        span={
+                            'md': METRIC_PANEL_SIZE_COL
+                        },
+                        offset={'md': OFFSET_COL},
+                        mb=55,
+                    ),
+                    dmc.GridCol(
+                        [
+                            dmc.Stack(
+                                [
+                                    dmc.Group(
+                                        [
+                                            dmc.SegmentedControl(
+                                                data=[
+                                                    {'value': 'fy', 'label': 'Fiscal Year'},
+                                                    {'value': 'cy', 'label': 'Calendar Year'},
+                                                ],
+                                                id="segmented-control-year-mode",
+                                                value="fy",
+                                                style={'width': '40%'},
+                                                styles={
+                                                    'innerLabel': {'color': HEADER_COLOR}
+                                                }
+                                            ),
+                                            dmc.Select(
+                                                label=None,
+                                                id="select-year",
+                                                value=str(summary.year_max),
+                                                # value='2023',
+                                                style={'width': '20%'},
+                                                data=[
+                                                    {'value': str(year), 'label': str(year)}
+                                                    for year in range(summary.year_min, summary.year_max + 1)
+                                                ],
+                                                clearable=False,
+                                                allowDeselect=False
+                                            ),
+                                            dmc.Select(
+                                                label=None,
+                                                id="select-quarter",
+                                                value='all',
+                                                style={'width': '20%'},
+                                                # value='3',
+                                                data=[
+                                                    *[{'value': 'all', 'label': 'All Quarters'}],
+                                                    *[{'value': str(i), 'label': f'Q{i}'} for i in range(1, 5)]
+                                                ],
+                                                clearable=False,
+                                                allowDeselect=False,
+                                            ),
+                                        ],
+                                        mt=-40,
+                                        justify='center',
+                                        style={
+                                            'padding': '15px',
+                                            'width': '100%',
+                                            'backgroundColor': 'white',
+                                            'borderRadius': '10px',
+                                            **SHADOW
+                                        }
+                                    ),
+                                    dmc.Box(
+                                        [
+                                            dmc.Title(
+                                                'Times series of',
+                                                order=4,
+                                                id='title-times-series',
+                                                c=HEADER_COLOR,
+                                                style={'width': '45%'}
+                                            ),
+                                            dcc.Loading(
+                                                [html.Div(id='times-series-chart-container')],
+                                                overlay_style={"visibility": "visible", "opacity": .6,
+                                                               "backgroundColor": "white"},
+                                                type='circle',
+                                                color=HEADER_COLOR
+                                            )
+                                        ],
+                                        style={
+                                            'width': '100%',
+                                            'padding': '25px',
+                                            'background-color': '#FFFFFF',
+                                            'border-radius': '10px',
+                                            **SHADOW
+                                        }
+                                    ),
+                                    dmc.Box(
+                                        [
+                                            dmc.Group(
+                                                [
+                                                    dmc.Title(
+                                                        'Breakdown by',
+                                                        order=4,
+                                                        id='title-breakdown',
+                                                        c=HEADER_COLOR,
+                                                        style={'width': '45%'}
+                                                    ),
+                                                    dmc.Group(
+                                                        [
+                                                            dmc.Select(
+                                                                value='platform',
+                                                                data=[
+                                                                    {'value': 'platform', 'label': 'Payment Platform'},
+                                                                    {'value': 'chapter', 'label': 'Chapter Type'},
+                                                                    {'value': 'channel', 'label': 'Channel'},
+                                                                    {'value': 'recurring',
+                                                                     'label': 'Reoccuring v. One-Time'},
+                                                                ],
+                                                                style={'width': '50%'},
+                                                                clearable=False,
+                                                                id='breakdown-dropdown-category',
+                                                                allowDeselect=False
+                                                            ),
+                                                            dmc.Select(
+                                                                value='5',
+                                                                data=[
+                                                                    {'value': '5', 'label': '5'},
+                                                                    {'value': '10', 'label': '10'},
+                                                                    {'value': 'all', 'label': 'All'},
+                                                                ],
+                                                                clearable=False,
+                                                                style={'width': '20%'},
+                                                                id='breakdown-dropdown-top',
+                                                                allowDeselect=False
+                                                            )
+                                                        ],
+                                                        justify='flex-end',
+                                                        style={'width': '50%'}
+                                                    )
+                                                ],
+                                                mb='lg',
+                                                justify='space-between'
+                                            ),
+                                            dcc.Loading(
+                                                [html.Div(id='breakdown-chart-container')],
+                                                overlay_style={"visibility": "visible", "opacity": .6,
+                                                               "backgroundColor": "white"},
+                                                type='circle',
+                                                color=HEADER_COLOR
+                                            )
+                                        ],
+                                        style={
+                                            'width': '100%',
+                                            'padding': '25px',
+                                            'background-color': '#FFFFFF',
+                                            'border-radius': '10px',
+                                            **SHADOW
+                                        }
+                                    )
+                                ],
+                                align='center'
+                            )
+                        ],
+                        span={
+                            'md': CHART_PANEL_SIZE_COL
+                        },
+                        offset={'md': OFFSET_COL},
+                    )
+                ],
+                style={
+                    'height': '95vh',
+                },
+                gutter=0
+            ),
+        ],
+        theme={
+            'headings': {
+                'fontFamily': "'Palanquin', sans-serif"
+            }
+        }
+    )
+
+
+app.layout = serve_layout
+
 
 @callback(
     Output('payments-pledges-data', 'data'),
@@ -402,15 +465,12 @@ app.layout = dmc.MantineProvider(
 )
 def update_data(year_mode: str, year_selected: str, quarter_selected: str) -> dict:
     """
-    Filters and returns the main payments + pledges dataset based on selected year mode, year,
-    and optionally a specific quarter.
+    Stores the selection used to filter the main payments + pledges dataset (selected year mode, year,
+    and optionally a specific quarter).
 
-    The logic handles:
-        - Applying fiscal or calendar year bounds (FY vs CY)
-        - Optional quarter selection, which also includes:
-            - Current quarter
-            - Previous quarter (adjusted for rollover to previous year)
-            - Same quarter of previous year
+    Only the selection key and the data version are sent to the browser: the filtered dataset itself
+    (current and comparison periods, see `select_comparison_periods`) stays server side and is resolved
+    by the consumer callbacks through `selection_store`.
 
     Args:
         year_mode (str): Either 'fy' or 'cy'.
@@ -418,45 +478,31 @@ def update_data(year_mode: str, year_selected: str, quarter_selected: str) -> di
         quarter_selected (str): Quarter filter (e.g. '1', '2', ..., or 'all').
 
     Returns:
-        dict: A filtered dataset converted to a JSON-serializable list of dicts.
+        dict: The selection key and data version.
     """
-    year_selected = int(year_selected)
-
-    # Get full date bounds for the selected year and mode (FY or CY)
-    date_bounds = get_year_bounds(year_mode=year_mode, selected_year=year_selected, include_previous=True)
-
-    # Add quarter information to the dataset based on fiscal or calendar year logic
-    df_quarter = add_quarter(df=df_payments_and_pledges, date_col='date', year_mode=year_mode)
-
-    # Filter rows within the selected year date range
-    df_date_filtered = df_quarter.query("date >= @date_bounds.date_min and date <= @date_bounds.date_max")
-
-    # If a specific quarter is selected, filter further to 3 quarters:
-    # - Current quarter
-    # - Previous quarter (adjusted across years if needed)
-    # - Same quarter last year
-    if quarter_selected != 'all':
-        quarter_selected = int(quarter_selected)
-
-        qs = get_comparison_quarters(year_mode=year_mode, selected_year=year_selected,
-                                     quarter_selected=quarter_selected)
-
-        filters = [
-            (qs.current.year, qs.current.quarter),
-            (qs.previous.year, qs.previous.quarter),
-            (qs.same_quarter_last_year.year, qs.same_quarter_last_year.quarter)
-        ]
+    return selection_store.make_store_data(
+        year_mode=year_mode,
+        year_selected=year_selected,
+        quarter_selected=quarter_selected
+    )
 
-        # Build dynamic query string to filter on multiple (year, quarter) combinations
-        conditions = " or ".join([f"(year == {y} and quarter == {q})" for y, q in filters])
-        df_date_filtered = df_date_filtered.query(conditions)
 
-    # Convert types for JSON serialization
-    df_serializable = df_date_filtered.copy()
-    df_serializable["date"] = df_serializable["date"].astype(str)
-    df_serializable["month"] = df_serializable["month"].astype(str)
+def get_selection_args(year_selected: str, year_mode: str, quarter_selected: str) -> Optional[list]:
+    """
+    Returns the arguments of the cached renderers (`render_metric_panels`, `render_metric_bundle`) for a selection,
+    with the selection payload of the current data version, or None if the selection is not one of the values
+    offered by the selection controls.
 
-    return df_serializable.to_dict("records")
+    Only these arguments are rendered and cached, so the keys of the output cache (and of the persistent store)
+    never come from arbitrary values sent by the browser.
+    """
+    summary = data_manager.summary
+    years = [str(year) for year in range(summary.year_min, summary.year_max + 1)]
+    quarters = ['all', '1', '2', '3', '4']
+    if year_mode not in ('fy', 'cy') or year_selected not in years or quarter_selected not in quarters:
+        return None
+    store_data = selection_store.make_store_data(year_mode, year_selected, quarter_selected)
+    return [store_data, year_selected, year_mode, quarter_selected]
 
 
 @callback(
@@ -464,13 +510,64 @@ def update_data(year_mode: str, year_selected: str, quarter_selected: str) -> di
     Output('donor-engagement-metric-panel-container', 'children'),
     Output('arr-metric-panel-container', 'children'),
     Output('attrition-metric-panel-container', 'children'),
+    Output('metric-panels-rendered', 'data'),
     Input('payments-pledges-data', 'data'),
     State('select-year', 'value'),
     State('segmented-control-year-mode', 'value'),
     State('select-quarter', 'value'),
+    State('metric-panels-rendered', 'data'),
     prevent_initial_call=True
 )
 def generate_all_metric_panels(
+        payment_and_pledge_data: dict,
+        year_selected: str,
+        year_mode: str,
+        quarter_selected: str,
+        rendered: Optional[dict] = None
+) -> tuple:
+    """
+    Updates the metric panels (see `render_metric_panels`) for the selection.
+
+    The browser keeps the arguments and data version of the panels it displays (`metric-panels-rendered`).
+    When they were rendered from the current data version and are still in the output cache, only the values
+    that differ between the displayed and the new panels (numbers, colors, bar lengths, ...) are sent, as
+    `dash.Patch` updates: the panel structure never changes between selections, so components are not rebuilt
+    nor remounted in the browser. Otherwise the full panels are sent.
+
+    Arguments are checked against the values offered by the selection controls (see `get_selection_args`):
+    the displayed panels are only looked up if valid, and an invalid selection is not rendered.
+
+    Args:
+        payment_and_pledge_data (dict): Selection key from the global store (triggers the update).
+        year_selected (str): Selected year (e.g. '2025').
+        year_mode (str): 'cy' (Calendar Year) or 'fy' (Fiscal Year).
+        quarter_selected (str): Quarter selection ('all' or '1'–'4').
+        rendered (dict, optional): Arguments and data version of the panels displayed in the browser.
+
+    Returns:
+        tuple: The update of each metric category panel, and the arguments and data version of the new panels.
+    """
+    args = get_selection_args(year_selected, year_mode, quarter_selected)
+    if args is None:
+        raise PreventUpdate
+    version = selection_store.version
+    panels = render_metric_panels(*args)
+
+    previous_panels = None
+    if isinstance(rendered, dict) and rendered.get('version') == version and isinstance(rendered.get('args'), list):
+        previous_args = rendered['args']
+        if len(previous_args) == 4 and previous_args == get_selection_args(*previous_args[1:]):
+            previous_panels = render_metric_panels.get_cached(*previous_args)
+
+    if previous_panels is not None:
+        panels = [make_patch(previous, current) for previous, current in zip(previous_panels, panels)]
+
+    return *panels, {'args': args, 'version': version}
+
+
+@cache_output(output_cache, get_version=lambda: selection_store.version, single_flight=single_flight,
+              minimizer=figure_minimizer)
+def render_metric_panels(
         payment_and_pledge_data: dict,
         year_selected: str,
         year_mode: str,
@@ -485,7 +582,7 @@ def generate_all_metric_panels(
     Handles both year-level comparison (CY or FY) and quarter-level comparison.
 
     Args:
-        payment_and_pledge_data (dict): Filtered dataset from the global store.
+        payment_and_pledge_data (dict): Selection key from the global store.
         year_selected (str): Selected year (e.g. '2025').
         year_mode (str): 'cy' (Calendar Year) or 'fy' (Fiscal Year).
         quarter_selected (str): Quarter selection ('all' or '1'–'4').
@@ -496,109 +593,73 @@ def generate_all_metric_panels(
 
     # Constants
     year_selected = int(year_selected)
-    previous_date_bounds = get_year_bounds(year_mode=year_mode, selected_year=year_selected - 1, include_previous=False)
-    current_date_bounds = get_year_bounds(year_mode=year_mode, selected_year=year_selected, include_previous=False)
 
     # Load data
-    df_comparison_periods = pd.DataFrame(payment_and_pledge_data)
+    df_comparison_periods = selection_store.resolve(payment_and_pledge_data)
 
     # If no data is available, return placeholder layouts for all metric panels
     if df_comparison_periods.empty:
         return NO_ENOUGH_DATA_LAYOUT, NO_ENOUGH_DATA_LAYOUT, NO_ENOUGH_DATA_LAYOUT, NO_ENOUGH_DATA_LAYOUT
 
-    # Ensure 'date' column is in datetime format for time-based operations
-    df_comparison_periods['date'] = pd.to_datetime(df_comparison_periods['date'])
-
-    # Filter data to current period (CY or FY), with quarter-specific filtering if applicable
-    df_current_period = filter_to_period(
-        df=df_comparison_periods,
-        date_bounds=current_date_bounds,
-        quarter=quarter_selected
-    )
-
-    # Filter data to comparison period (year - 1 or quarter - 1 depending on user selection)
+    # Initialize metric panel layout, compared against previous year (n - 1) or previous quarter (Q - 1, or Q4 of
+    # previous year if Q1)
     if quarter_selected == 'all':
-        # Compare against previous year (n - 1)
-        df_previous_n = filter_to_period(
-            df=df_comparison_periods,
-            date_bounds=previous_date_bounds
-        )
-
-        # Initialize metric panel layout
         financial_metric_panel_layout = add_header_to_panel(
             year_mode=year_mode,
             year=str(year_selected - 1)
         )
     else:
-        # Compare against previous quarter (Q - 1), or Q4 of previous year if Q1
         quarter = get_comparison_quarters(
             selected_year=year_selected, quarter_selected=int(quarter_selected), year_mode=year_mode)
         previous_quarter = quarter.previous.quarter
-        df_previous_n = filter_to_specific_quarter(
-            df=df_comparison_periods,
-            year=quarter.previous.year,
-            quarter=previous_quarter
-        )
-
-        # Initialize metric panel layout
         financial_metric_panel_layout = add_header_to_panel(
             year_mode=year_mode,
             year=str(year_selected - 1) if previous_quarter == 4 else str(year_selected),
             quarter=f'Q{previous_quarter}'
         )
 
-    # Financial performance metrics
-    create_metrics_panel(
-        metrics=financial_performance_metrics,
-        df_current=df_current_period,
-        df_previous=df_previous_n,
+    # Compute value, target, pace and difference with previous period of every metric in a single pass,
+    # on the current period (CY or FY, or quarter) and the comparison period of each table metrics are computed on
+    metric_results = evaluate_metrics(
+        metrics=all_metrics,
+        period_bounds=get_comparison_period_bounds(
+            selected_year=year_selected,
+            year_mode=year_mode,
+            quarter_selected=quarter_selected
+        ),
+        resolve_periods=lambda table: selection_store.resolve_periods(payment_and_pledge_data, table=table),
+        version=selection_store.version,
         targets_data=targets_data,
         year_selected=year_selected,
         year_mode=year_mode,
         quarter_selected=quarter_selected,
-        today_override=today,
+        today_override=data_manager.summary.date_max
+    )
+
+    # Financial performance metrics
+    create_metrics_panel(
+        metric_results=[metric_results[metric.slug] for metric in financial_performance_metrics],
         metric_layout=financial_metric_panel_layout
     )
 
     # Donor engagement metrics
     donor_engagement_metric_panel_layout = []
     create_metrics_panel(
-        metrics=engagement_metrics,
-        df_current=df_current_period,
-        df_previous=df_previous_n,
-        targets_data=targets_data,
-        year_selected=year_selected,
-        year_mode=year_mode,
-        quarter_selected=quarter_selected,
-        today_override=today,
+        metric_results=[metric_results[metric.slug] for metric in engagement_metrics],
         metric_layout=donor_engagement_metric_panel_layout
     )
 
     # ARR Metrics
     arr_metric_panel_layout = []
     create_metrics_panel(
-        metrics=arr_metrics,
-        df_current=df_current_period,
-        df_previous=df_previous_n,
-        targets_data=targets_data,
-        year_selected=year_selected,
-        year_mode=year_mode,
-        quarter_selected=quarter_selected,
-        today_override=today,
+        metric_results=[metric_results[metric.slug] for metric in arr_metrics],
         metric_layout=arr_metric_panel_layout
     )
 
     # Attrition Metrics
     attrition_metric_panel_layout = []
     create_metrics_panel(
-        metrics=attrition_metrics,
-        df_current=df_current_period,
-        df_previous=df_previous_n,
-        targets_data=targets_data,
-        year_selected=year_selected,
-        year_mode=year_mode,
-        quarter_selected=quarter_selected,
-        today_override=today,
+        metric_results=[metric_results[metric.slug] for metric in attrition_metrics],
         metric_layout=attrition_metric_panel_layout
     )
 
@@ -610,280 +671,290 @@ def generate_all_metric_panels(
     )
 
 
-@callback(
+clientside_callback(
+    ClientsideFunction(namespace='clientside', function_name='update_active_metric'),
     Output('active-metric-slug', 'data'),
     Input({'type': 'metric-panel-row', 'metric-slug': ALL}, 'n_clicks'),
     prevent_initial_call=True
 )
-def update_active_metric(_) -> Union[str, type(dash.no_update)]:
-    """
-    Stores the slug of the clicked metric row to track which metric is currently active.
-
-    Args:
-        _ (list[int]): List of click counts for all metric rows.
-
-    Returns:
-        str | dash.no_update: The slug of the clicked metric (from triggered_id) or no update.
-    """
-    triggered = dash.ctx.triggered_id
-    if isinstance(triggered, dict) and (slug := triggered.get('metric-slug')):
-        return slug
-
-    return dash.no_update
 
 
-@callback(
+clientside_callback(
+    ClientsideFunction(namespace='clientside', function_name='highlight_selected_metric_row'),
     Output({'type': 'metric-panel-row', 'metric-slug': ALL}, 'style'),
     Input('active-metric-slug', 'data'),
     State({'type': 'metric-panel-row', 'metric-slug': ALL}, 'id'),
+    State('metric-row-colors', 'data'),
     prevent_initial_call=True
 )
-def highlight_selected_metric_row(selected_slug: str, all_ids: list[dict]) -> list[dict]:
+
+
+def make_line_figure(
+        metric: Metric,
+        df_comparison_periods: pd.DataFrame,
+        df_current: pd.DataFrame,
+        selected_year: int,
+        year_mode: str,
+        selected_quarter: str
+) -> go.Figure:
     """
-    Highlights the currently selected metric row in the panel by applying a distinct background color
-    and left border. All other rows reset to their default style.
+    Generates the appropriate line chart (time series or index chart) of a metric.
+
+    Time series → uses months across year (CY or FY).
+    Index chart → uses weekly accumulation within a selected quarter.
 
     Args:
-        selected_slug (str): The slug of the active/selected metric.
-        all_ids (list[dict]): List of metric row component IDs (each contains 'metric-slug').
+        metric (Metric): Metric displayed.
+        df_comparison_periods (pd.DataFrame): Selection of the table the metric is computed on.
+        df_current (pd.DataFrame): Part of the selection within the current period.
+        selected_year (int): Selected year (e.g., 2025).
+        year_mode (str): 'fy' (Fiscal) or 'cy' (Calendar).
+        selected_quarter (str): 'all' or a specific quarter ('1', '2', ...).
 
     Returns:
-        list[dict]: List of inline styles to apply to each row component.
+        go.Figure: The line chart.
     """
+    # Create dataframes based on period
+    df_combined = get_combined_comparison_df(
+        df=df_comparison_periods,
+        selected_year=selected_year,
+        year_mode=year_mode,
+        selected_quarter=selected_quarter,
+        current_date_bounds=get_year_bounds(year_mode=year_mode, selected_year=selected_year,
+                                            include_previous=False),
+        previous_date_bounds=get_year_bounds(year_mode=year_mode, selected_year=selected_year - 1,
+                                             include_previous=False)
+    )
 
-    if selected_slug:
-        styles = []
-        for item in all_ids:
-            is_selected = item['metric-slug'] == selected_slug
-            styles.append({
-                'backgroundColor': '#F3F4F6' if is_selected else 'transparent',
-                'borderLeft': f'4px solid {HEADER_COLOR if is_selected else "transparent"}',
-                'transition': 'background-color 0.3s ease-in-out, border-left 0.3s ease-in-out',
-                'borderRadius': '4px',
-                'cursor': 'pointer'
-            })
+    # Value of the metric over the current period, displayed on the last point of the current line
+    annotation_args = {
+        'year_mode': year_mode,
+        'selected_year': selected_year,
+        'selected_quarter': selected_quarter,
+        'metric': metric,
+        'value': metric.compute_on(df_current)
+    }
 
-        return styles
+    # Time series over month
+    if selected_quarter == 'all':
+        return make_timeseries_chart(
+            df=metric.build_time_series_df(df=df_combined, year_mode=year_mode),
+            x_axis_value='month_order',
+            x_axis_text='month_label',
+            selected_quarter=selected_quarter,
+            annotation_args=annotation_args
+        )
 
-    raise PreventUpdate
+    # Index chart over weeks elapsed during a specific Quarter
+    return make_timeseries_chart(
+        df=metric.build_index_chart_df(df_combined),
+        x_axis_value='weeks_elapsed',
+        x_axis_text='weeks_label',
+        x_axis_title='Weeks Elapsed',
+        selected_quarter=selected_quarter,
+        annotation_args=annotation_args
+    )
 
 
 @callback(
-    Output('title-times-series', 'children'),
-    Output('times-series-chart-container', 'children'),
+    Output('metric-bundle', 'data'),
     Input('payments-pledges-data', 'data'),
-    Input('active-metric-slug', 'data'),
     State('select-year', 'value'),
     State('segmented-control-year-mode', 'value'),
     State('select-quarter', 'value'),
     prevent_initial_call=True
 )
-def update_line_fig(
+def update_metric_bundle(
         payment_and_pledge_data: dict,
-        metric_slug: str,
         selected_year: str,
         year_mode: str,
         selected_quarter: str,
-) -> tuple[str, go.Figure]:
+) -> dict:
     """
-    Generates the appropriate line chart (time series or index chart) for the selected metric.
-
-    Time series → uses months across year (CY or FY).
-    Index chart → uses weekly accumulation within a selected quarter.
+    Updates the bundle the time series and breakdown charts are drawn from (see `render_metric_bundle`)
+    for the selection, checked against the values offered by the selection controls (see `get_selection_args`).
 
     Args:
-        payment_and_pledge_data (dict): Serialized payment + pledge data.
-        metric_slug (str): Slug of the currently selected metric.
+        payment_and_pledge_data (dict): Selection key from the global store (triggers the update).
         selected_year (str): Selected year (e.g., '2025').
         year_mode (str): 'fy' (Fiscal) or 'cy' (Calendar).
         selected_quarter (str): 'all' or a specific quarter ('1', '2', ...).
 
     Returns:
-        tuple: A tuple containing the title and the line chart (as Dash children).
+        dict: The bundle.
     """
+    args = get_selection_args(selected_year, year_mode, selected_quarter)
+    if args is None:
+        raise PreventUpdate
+    return render_metric_bundle(*args)
 
-    if metric_slug:
-        metric_instance = find_metric_by_slug(slug=metric_slug, metrics=all_metrics)
-        title_layout = dmc.Title(f'Time series of {metric_instance.name}', order=4, mb='lg', c=HEADER_COLOR),
-
-        # Define constants
-        selected_year = int(selected_year)
-        previous_date_bounds = get_year_bounds(year_mode=year_mode, selected_year=selected_year - 1,
-                                               include_previous=False)
-        current_date_bounds = get_year_bounds(year_mode=year_mode, selected_year=selected_year,
-                                              include_previous=False)
-
-        # Load data
-        df_comparison_periods = pd.DataFrame(payment_and_pledge_data)
-
-        # If no data is available, return placeholder layouts for all metric panels
-        if df_comparison_periods.empty:
-            return title_layout, NO_ENOUGH_DATA_LAYOUT
 
-        # Ensure 'date' column is in datetime format for time-based operations
-        df_comparison_periods['date'] = pd.to_datetime(df_comparison_periods['date'])
-
-        # Create dataframes based on period
-        df_combined = get_combined_comparison_df(
-            df=df_comparison_periods,
-            selected_year=selected_year,
-            year_mode=year_mode,
-            selected_quarter=selected_quarter,
-            current_date_bounds=current_date_bounds,
-            previous_date_bounds=previous_date_bounds
-        )
+# Minimized in the function itself (before its line templates are factored), not by `cache_output`
+@cache_output(output_cache, get_version=lambda: selection_store.version, single_flight=single_flight)
+def render_metric_bundle(
+        payment_and_pledge_data: dict,
+        selected_year: str,
+        year_mode: str,
+        selected_quarter: str,
+) -> dict:
+    """
+    Builds the bundle the time series and breakdown charts are drawn from in the browser, for every metric
+    of the selection (see `assets/script/clientside.js`). Switching the metric, the breakdown category or
+    the number of categories displayed then updates the charts without any request to the server.
 
-        # Time series over month
-        if selected_quarter == 'all':
-            df_series = metric_instance.build_time_series_df(df=df_combined, year_mode=year_mode)
-            fig = make_timeseries_chart(
-                df=df_series,
-                x_axis_value='month_order',
-                x_axis_text='month_label',
-                selected_quarter=selected_quarter,
-                annotation_args={
-                    'year_mode': year_mode,
-                    'selected_year': selected_year,
-                    'selected_quarter': selected_quarter,
-                    'metric': metric_instance
-                }
-            )
+    The bundle holds, for every metric:
+        - Its line chart (months of the year, or weeks of the quarter, compared to the previous periods).
+          All line charts share their layout template, sent once (see `utils.serialization.factor_templates`).
+        - Its breakdown by every category (all categories, the top N is selected in the browser).
+    And the components and breakdown chart template these are filled into.
 
-        # Index chart over weeks elapsed during a specific Quarter
-        else:
-            df_index = metric_instance.build_index_chart_df(df_combined)
-            fig = make_timeseries_chart(
-                df=df_index,
-                x_axis_value='weeks_elapsed',
-                x_axis_text='weeks_label',
-                x_axis_title='Weeks Elapsed',
-                selected_quarter=selected_quarter,
-                annotation_args={
-                    'year_mode': year_mode,
-                    'selected_year': selected_year,
-                    'selected_quarter': selected_quarter,
-                    'metric': metric_instance
-                }
-            )
+    Args:
+        payment_and_pledge_data (dict): Selection key from the global store.
+        selected_year (str): Selected year (e.g., '2025').
+        year_mode (str): 'fy' (Fiscal) or 'cy' (Calendar).
+        selected_quarter (str): 'all' or a specific quarter ('1', '2', ...).
 
-        graph = dcc.Graph(
-            id='fig-line-chart',
-            figure=fig,
-            responsive=True,
-            config=FIG_CONFIG,
-            style={'height': HEIGHT_RIGHT_CHART}
-        )
+    Returns:
+        dict: The bundle.
+    """
+    selected_year = int(selected_year)
+    current_date_bounds = get_year_bounds(year_mode=year_mode, selected_year=selected_year, include_previous=False)
+
+    metrics = {}
+    for metric in all_metrics:
+        metrics[metric.slug] = {
+            'line_title': f'Time series of {metric.name}',
+            'breakdown_title': f'{metric.name} breakdown by ',
+            'line': None,
+            'breakdowns': None,
+        }
 
-        return title_layout, graph
+        # Load data (from the table the metric is computed on)
+        df_comparison_periods = selection_store.resolve(payment_and_pledge_data, table=metric.source)
+        if df_comparison_periods.empty:
+            continue
 
-    raise PreventUpdate
+        # Dataframe filtered to current period
+        df_current = filter_to_period(df=df_comparison_periods, date_bounds=current_date_bounds,
+                                      quarter=selected_quarter)
+
+        fig = make_line_figure(metric=metric, df_comparison_periods=df_comparison_periods, df_current=df_current,
+                               selected_year=selected_year, year_mode=year_mode, selected_quarter=selected_quarter)
+        metrics[metric.slug]['line'] = fig
+
+        if not df_current.empty:
+            metrics[metric.slug]['breakdowns'] = {
+                category: get_breakdown_bar_values(
+                    df=metric.build_breakdown_df(df=df_current, group_col=group_col),
+                    metric=metric,
+                    group_col=group_col
+                )._asdict()
+                for category, group_col in BREAKDOWN_OPTIONS_MAPPING.items()
+            }
+
+    serialized = to_json_plotly({
+        'metrics': metrics,
+        'breakdown_figure': FIGURE_TEMPLATES['breakdown_bar'],
+        'components': {
+            'line_title': dmc.Title(order=4, mb='lg', c=HEADER_COLOR),
+            'line_graph': dcc.Graph(id='fig-line-chart', responsive=True, config=FIG_CONFIG,
+                                    style={'height': HEIGHT_RIGHT_CHART}),
+            'breakdown_graph': dcc.Graph(id='breakdown-bar-chart', responsive=True, config=FIG_CONFIG,
+                                         style={'height': HEIGHT_RIGHT_CHART}),
+            'no_data': NO_ENOUGH_DATA_LAYOUT,
+        },
+    })
+    bundle = json.loads(serialized)
+
+    # Templates are factored out of the minimized figures (minimizing removes the parts they don't use)
+    if figure_minimizer is not None:
+        bundle = figure_minimizer.minimize_value(bundle)
+    line_figures, bundle['line_templates'] = factor_templates({
+        slug: metric['line'] for slug, metric in bundle['metrics'].items() if metric['line'] is not None
+    })
+    for slug, metric in bundle['metrics'].items():
+        metric['line'] = line_figures.get(slug)
+
+    if figure_minimizer is not None:
+        bundle['metrics'] = round_value(bundle['metrics'], digits=figure_minimizer.digits)
+        figure_minimizer.record('render_metric_bundle', size_before=len(serialized),
+                                size_after=len(to_json_plotly(bundle)))
+    return bundle
+
+
+clientside_callback(
+    ClientsideFunction(namespace='clientside', function_name='update_line_chart'),
+    Output('title-times-series', 'children'),
+    Output('times-series-chart-container', 'children'),
+    Input('metric-bundle', 'data'),
+    Input('active-metric-slug', 'data'),
+    prevent_initial_call=True
+)
 
 
-@callback(
+clientside_callback(
+    ClientsideFunction(namespace='clientside', function_name='update_breakdown_chart'),
     Output('title-breakdown', 'children'),
     Output('breakdown-chart-container', 'children'),
-    Input('payments-pledges-data', 'data'),
+    Input('metric-bundle', 'data'),
     Input('breakdown-dropdown-category', 'value'),
     Input('breakdown-dropdown-top', 'value'),
     Input('active-metric-slug', 'data'),
-    State('select-year', 'value'),
-    State('segmented-control-year-mode', 'value'),
-    State('select-quarter', 'value'),
     prevent_initial_call=True
 )
-def update_breakdown_chart(
-        payment_and_pledge_data: dict,
-        selected_filter: str,
-        n_values: str,
-        metric_slug,
-        selected_year: str,
-        year_mode: str,
-        selected_quarter: str,
-) -> tuple[go.Figure, str]:
-    """
-    Generates a horizontal bar chart showing the breakdown of the selected metric by the selected
-    category (e.g., Payment Platform, Channel, Recurring). Optionally limits the output to the top N values.
 
-    Args:
-        selected_filter (str): Grouping dimension (e.g., 'platform', 'channel', etc.).
-        n_values (str): Max number of values to show (e.g., '5' or '10').
-        metric_slug (str): Slug of the selected metric.
-        selected_year (str): Year selected from dropdown.
-        year_mode (str): Either 'fy' or 'cy'.
-        selected_quarter (str): Quarter number or 'all'.
-        payment_and_pledge_data (dict): Serialized dataset of transactions.
 
-    Returns:
-        tuple: A Plotly bar chart figure and title string for the chart section.
+def get_warmup_tasks() -> list[WarmupTask]:
     """
-    if metric_slug:
-        metric_instance = find_metric_by_slug(slug=metric_slug, metrics=all_metrics)
-
-        # Define constants
-        title_layout = f'{metric_instance.name} breakdown by '
-        selected_year = int(selected_year)
-        current_date_bounds = get_year_bounds(year_mode=year_mode, selected_year=selected_year,
-                                              include_previous=False)
-
-        # Load data
-        df_comparison_periods = pd.DataFrame(payment_and_pledge_data)
-
-        # If no data is available, return placeholder layouts for all metric panels
-        if df_comparison_periods.empty:
-            return title_layout, NO_ENOUGH_DATA_LAYOUT
-
-        # Ensure 'date' column is in datetime format for time-based operations
-        df_comparison_periods['date'] = pd.to_datetime(df_comparison_periods['date'])
-
-        # Dataframe filtered to current period
-        df_current = filter_to_period(
-            df=df_comparison_periods,
-            date_bounds=current_date_bounds,
-            quarter=selected_quarter,
-        )
+    Lists the callback calls precomputed by the warm-up, in priority order: selections from the most recent
+    year (default view first), and for each selection the metric panels and the bundle the time series and
+    breakdown charts of every metric are drawn from.
 
-        # If no data is available, return placeholder layouts for all metric panels
-        if df_current.empty:
-            return title_layout, NO_ENOUGH_DATA_LAYOUT
+    Rendered outputs are limited to the capacity of the output cache, so the warm-up never evicts its own
+    most valuable entries.
 
-        # If the selected filter is recurring vs. one time apply a flag to group on later
-        if selected_filter == 'recurring':
-            df_current['recurring_flag'] = df_current['frequency'].apply(
-                lambda x: 'Recurring' if x not in ONE_TIME_FREQUENCY else 'One-Time',
-            )
-
-        # Get col to group by
-        group_col = BREAKDOWN_OPTIONS_MAPPING[selected_filter]
-
-        # Build breakdown df
-        df_breakdown = metric_instance.build_breakdown_df(df=df_current, group_col=group_col)
+    Returns:
+        list[WarmupTask]: The renderers to run, with their arguments as built by their callbacks.
+    """
+    summary = data_manager.summary
+    selections = [
+        (year_mode, str(year), quarter)
+        for year in range(summary.year_max, summary.year_min - 1, -1)
+        for year_mode in ('fy', 'cy')
+        for quarter in ('all', '1', '2', '3', '4')
+    ]
 
-        # Clean display (e.g. remove empty values)
-        df_breakdown = df_breakdown[df_breakdown[group_col].notna()]
-        df_breakdown = df_breakdown.sort_values('value', ascending=False)
+    tasks = []
+    for year_mode, year, quarter in selections:
+        args = tuple(get_selection_args(year, year_mode, quarter))
+        tasks.append(WarmupTask(render_metric_panels, args))
+        tasks.append(WarmupTask(render_metric_bundle, args))
 
-        # Limit the number of displayed categories to the top N (e.g., top 5 or 10 values)
-        if n_values in ['5', '10']:
-            df_breakdown = df_breakdown.head(int(n_values))
+    return tasks[:output_cache.maxsize]
 
-        # Fig
-        fig = make_breakdown_bar_chart(
-            df=df_breakdown,
-            metric=metric_instance,
-            group_col=group_col
-        )
 
-        graph = dcc.Graph(
-            id='breakdown-bar-chart',
-            config=FIG_CONFIG,
-            style={'height': HEIGHT_RIGHT_CHART},
-            responsive=True,
-            figure=fig
-        )
+warmup = Warmup(get_tasks=get_warmup_tasks)
+if WARMUP_BLOCKING:
+    warmup.run()
+elif WARMUP and not START_AFTER_FORK:
+    warmup.start()
 
-        return title_layout, graph
 
-    return 'Breakdown by', NO_ENOUGH_DATA_LAYOUT
+@server.route('/ready')
+def readiness():
+    """
+    Readiness probe: 200 once the warm-up of the process serving the request is complete (or disabled),
+    503 while it is running.
+    """
+    status = {
+        'warmup': warmup.get_status(),
+        'output_cache': output_cache.get_stats(),
+        'data_version': data_manager.version,
+        'schema_memory_report': data_manager.summary.memory_report,
+        'figure_minimizer': figure_minimizer.get_stats() if figure_minimizer else None,
+    }
+    ready = warmup.is_ready or not (WARMUP or WARMUP_BLOCKING)
+    return jsonify({'ready': ready, **status}), 200 if ready else 503
 
 
 if __name__ == '__main__':
@@ -3,6 +3,19 @@ if (!window.dash_clientside) {
     window.dash_clientside = {};
 }
 
+// Deep copy of a component or figure from the metric bundle: Plotly writes into the figures it draws
+// (e.g. axis ranges), which must not leak into the bundle shared by the next charts
+function copy(value) {
+    return JSON.parse(JSON.stringify(value));
+}
+
+// Copy of a serialized component of the metric bundle, with some of its props replaced
+function withProps(component, props) {
+    const copied = copy(component);
+    Object.assign(copied.props, props);
+    return copied;
+}
+
 window.dash_clientside.clientside = {
 
     toggle_modal_data_source: function(n_clicks, opened) {
@@ -10,5 +23,98 @@ window.dash_clientside.clientside = {
                 return window.dash_clientside.no_update;
             }
             return !opened;
+    },
+
+    // Stores the slug of the clicked metric row to track which metric is currently active
+    update_active_metric: function(_) {
+        const triggered = window.dash_clientside.callback_context.triggered;
+        if (!triggered || !triggered.length) {
+            return window.dash_clientside.no_update;
+        }
+
+        // Pattern-matching ids are triggered as '{"metric-slug":...,"type":...}.n_clicks'
+        const propId = triggered[0].prop_id;
+        const id = propId.slice(0, propId.lastIndexOf('.'));
+        if (!id.startsWith('{')) {
+            return window.dash_clientside.no_update;
+        }
+        return JSON.parse(id)['metric-slug'] || window.dash_clientside.no_update;
+    },
+
+    // Highlights the selected metric row (background color and left border, from the `metric-row-colors` store),
+    // other rows reset to their default style
+    highlight_selected_metric_row: function(selectedSlug, allIds, colors) {
+        if (!selectedSlug) {
+            throw window.dash_clientside.PreventUpdate;
+        }
+
+        return allIds.map(function(item) {
+            const isSelected = item['metric-slug'] === selectedSlug;
+            return {
+                backgroundColor: isSelected ? colors.background : 'transparent',
+                borderLeft: '4px solid ' + (isSelected ? colors.border : 'transparent'),
+                transition: 'background-color 0.3s ease-in-out, border-left 0.3s ease-in-out',
+                borderRadius: '4px',
+                cursor: 'pointer'
+            };
+        });
+    },
+
+    // Line chart (time series or index chart) of the selected metric, from the metric bundle (see
+    // `render_metric_bundle` in app.py): its figure is sent without its layout template, shared by all metrics
+    update_line_chart: function(bundle, metricSlug) {
+        const metric = bundle && metricSlug && bundle.metrics[metricSlug];
+        if (!metric) {
+            throw window.dash_clientside.PreventUpdate;
+        }
+
+        const title = withProps(bundle.components.line_title, {children: metric.line_title});
+        if (!metric.line) {
+            return [[title], copy(bundle.components.no_data)];
+        }
+
+        const figure = copy(metric.line);
+        if (typeof figure.layout.template === 'number') {
+            figure.layout.template = copy(bundle.line_templates[figure.layout.template]);
+        }
+        return [[title], withProps(bundle.components.line_graph, {figure: figure})];
+    },
+
+    // Breakdown bar chart of the selected metric by the selected category, limited to the top N categories:
+    // the first trace of the chart template draws the top category, the second one the others
+    update_breakdown_chart: function(bundle, category, nValues, metricSlug) {
+        if (!bundle) {
+            throw window.dash_clientside.PreventUpdate;
+        }
+
+        const metric = metricSlug && bundle.metrics[metricSlug];
+        if (!metric) {
+            return ['Breakdown by', copy(bundle.components.no_data)];
+        }
+
+        const breakdown = metric.breakdowns && metric.breakdowns[category];
+        if (!breakdown) {
+            return [metric.breakdown_title, copy(bundle.components.no_data)];
+        }
+
+        const count = ['5', '10'].includes(nValues) ? Number(nValues) : breakdown.values.length;
+        const figure = copy(bundle.breakdown_figure);
+        const bounds = [[0, Math.min(1, count)], [1, count]];
+
+        figure.data = figure.data
+            .map(function(trace, index) {
+                const start = bounds[index][0];
+                const end = bounds[index][1];
+                const texts = breakdown.texts.slice(start, end);
+                return Object.assign(trace, {
+                    x: breakdown.values.slice(start, end),
+                    y: breakdown.labels.slice(start, end),
+                    text: texts,
+                    customdata: texts.map(function(text) { return [text]; })
+                });
+            })
+            .filter(function(trace) { return trace.x.length; });
+
+        return [metric.breakdown_title, withProps(bundle.components.breakdown_graph, {figure: figure})];
     }
-};
\ No newline at end of file
+};
@@ -17,6 +17,7 @@ BORDER_COLOR = '#9CA3AF'
 # Backgrounds, titles, sections
 HEADER_COLOR = '#172B4D'
 TITLE_COLOR = '#0A192F'
+SELECTED_ROW_BACKGROUND = '#F3F4F6'
 
 # Mapping with line colors for time series chart (or index chart)
 LINE_STYLES = {
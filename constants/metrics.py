@@ -37,5 +37,3 @@ BREAKDOWN_OPTIONS_MAPPING = {
     'channel': 'donor_chapter',
     'recurring': 'recurring_flag'
 }
-
-ONE_TIME_FREQUENCY = ['One-Time', 'Unspecified']
\ No newline at end of file
@@ -0,0 +1,28 @@
+# Compact schema: low-cardinality labels become categoricals, identifiers become dense int32 codes
+CATEGORICAL_COLUMNS = ['pledge_status', 'frequency', 'payment_platform', 'chapter_type', 'donor_chapter', 'portfolio']
+ID_COLUMNS = ['donor_id', 'pledge_id']
+FLOAT32_COLUMNS = ['amount_usd', 'counterfactuality', 'amount_counterfactual', 'annualized_amount']
+
+# Frequencies considered as non-recurring (excluded from ARR, flagged 'One-Time' in breakdowns)
+ONE_TIME_FREQUENCY = ['One-Time', 'Unspecified']
+
+# Frequency multiplier used to compute ARR
+FREQ_MULTIPLIER = {
+    "Monthly": 12,
+    "Quarterly": 4,
+    "Annually": 1,
+    "Semi-Monthly": 24
+}
+
+# Date dimension columns, depending on the year mode ('fy' or 'cy')
+FISCAL_YEAR_START_MONTH = 7
+QUARTER_COLUMNS = {'fy': 'quarter_fy', 'cy': 'quarter_cy'}
+MONTH_ORDER_COLUMNS = {'fy': 'month_order_fy', 'cy': 'month_order_cy'}
+
+# Pre-aggregated cube of the additive measures: one row per day and combination of these dimensions
+CUBE_DIMENSIONS = ['payment_platform', 'chapter_type', 'donor_chapter', 'recurring_flag', 'pledge_status', 'frequency']
+CUBE_MEASURES = ['amount_usd', 'amount_counterfactual']
+
+# Distinct-count index: unique (day fragment, pledge status, breakdown dimensions, identifier) combinations
+DISTINCT_INDEX_DIMENSIONS = ['pledge_status', 'payment_platform', 'chapter_type', 'donor_chapter', 'recurring_flag']
+DISTINCT_INDEX_VALUES = ['donor_id']
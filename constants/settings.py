@@ -0,0 +1,65 @@
+import os
+
+
+def env_flag(name: str, default: bool) -> bool:
+    """Reads a boolean flag from the environment ('1', 'true', 'yes' and 'on' are truthy)."""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def env_int(name: str, default: int) -> int:
+    """Reads an integer from the environment, falling back to the default when unset or invalid."""
+    try:
+        return int(os.environ[name])
+    except (KeyError, ValueError):
+        return default
+
+
+# Data loading
+COMPACT_SCHEMA = env_flag('OFTW_COMPACT_SCHEMA', default=True)
+
+# Tables are cached partitioned by calendar year ('Y') or quarter ('Q'). With partitioned loading, partitions are
+# only read when a selection needs them, and at most PARTITION_CACHE_SIZE partitions per table stay in memory
+PARTITIONED_LOADING = env_flag('OFTW_PARTITIONED_LOADING', default=True)
+PARTITION_FREQ = 'Q' if os.environ.get('OFTW_PARTITION_FREQ', 'Y').strip().upper() == 'Q' else 'Y'
+PARTITION_CACHE_SIZE = env_int('OFTW_PARTITION_CACHE_SIZE', default=12)
+
+# Interval (in seconds) between checks of the source CSV for new rows, ingested without a restart (0: never check)
+DATA_REFRESH_INTERVAL = env_int('OFTW_DATA_REFRESH_INTERVAL', default=0)
+
+# Start the background threads (data refresh, warm-up) in each process after it is forked, instead of at import
+# (set by gunicorn.conf.py: threads started in the preloading master process would not survive the fork of the workers)
+START_AFTER_FORK = env_flag('OFTW_START_AFTER_FORK', default=False)
+
+# Server-side storage of the filtered dataset slices (per year mode / year / quarter selection: one slice of
+# each table, and its split into the compared periods)
+SELECTION_CACHE_SIZE = env_int('OFTW_SELECTION_CACHE_SIZE', default=96)
+
+# Memoized metric values (one entry per metric and period, shared across selections)
+METRIC_MEMO_SIZE = env_int('OFTW_METRIC_MEMO_SIZE', default=2048)
+
+# Cache of the rendered outputs of the heavy callbacks (panels, bundles of the charts), TTL in seconds (0: no expiry)
+OUTPUT_CACHE_SIZE = env_int('OFTW_OUTPUT_CACHE_SIZE', default=512)
+OUTPUT_CACHE_TTL = env_int('OFTW_OUTPUT_CACHE_TTL', default=0)
+
+# Rendering of the metric panels: 'graph' (two Plotly charts per metric) or 'html' (bars drawn with HTML/CSS,
+# much cheaper for the browser to mount and resize, especially on mobile)
+PANEL_RENDERER = 'html' if os.environ.get('OFTW_PANEL_RENDERER', 'graph').strip().lower() == 'html' else 'graph'
+
+# Minimization of the figures sent to the browser (see `utils.serialization.FigureMinimizer`): pruned template,
+# shared trace styling sent once, floats rounded to FIGURE_PRECISION significant digits, compact typed arrays
+MINIFY_FIGURES = env_flag('OFTW_MINIFY_FIGURES', default=True)
+FIGURE_PRECISION = env_int('OFTW_FIGURE_PRECISION', default=6)
+
+# Warm-up of the caches over the selection space at startup: in a background thread, or blocking the import
+# (e.g. when the app is preloaded before gunicorn forks its workers)
+WARMUP = env_flag('OFTW_WARMUP', default=False)
+WARMUP_BLOCKING = env_flag('OFTW_WARMUP_BLOCKING', default=False)
+
+# Persistent store of the rendered outputs (SQLite file), reused across restarts and deploys
+RESULT_STORE = env_flag('OFTW_RESULT_STORE', default=True)
+
+# Coalescing of concurrent computations of the same output: file locks also coalesce them across worker processes
+SINGLE_FLIGHT_FILE_LOCK = env_flag('OFTW_SINGLE_FLIGHT_FILE_LOCK', default=False)
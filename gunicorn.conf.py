@@ -0,0 +1,41 @@
+import gc
+import os
+
+# Gunicorn configuration, read from the working directory: `gunicorn app:server`
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8050')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 4))
+
+# Threads share the worker's caches (selection slices, metric values, rendered outputs)
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# Load the app, and the dataset, once in the master process. Workers are forked with the tables already in memory
+# and share their pages: tables are read-only (see `load_data.load_payments_and_pledges.make_read_only`),
+# and memory-mapped from the Arrow cache when it exists, so pages are never copied on write.
+# With partitioned loading (OFTW_PARTITIONED_LOADING, the default), only the memory maps are opened before the fork:
+# workers convert the year partitions they need on access.
+# Set OFTW_WARMUP_BLOCKING=1 to also warm up the caches before the fork.
+preload_app = True
+
+# The background threads, warm-up (OFTW_WARMUP=1) and data refresh (OFTW_DATA_REFRESH_INTERVAL), are started in each
+# worker after the fork (see `post_fork`), not in the master: threads don't survive the fork, and forking while they
+# hold a lock or a SQLite connection could deadlock the workers. Each worker reports its own readiness on /ready
+os.environ.setdefault('OFTW_START_AFTER_FORK', '1')
+
+
+def when_ready(server):
+    # Move the objects allocated while loading out of the garbage collector's reach, so collections
+    # in the workers never write to (and copy) the pages inherited from the master
+    gc.collect()
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    from constants.settings import DATA_REFRESH_INTERVAL, WARMUP, WARMUP_BLOCKING
+    from app import data_manager, warmup
+
+    if DATA_REFRESH_INTERVAL:
+        data_manager.start(interval=DATA_REFRESH_INTERVAL)
+    if WARMUP and not WARMUP_BLOCKING:
+        warmup.start()
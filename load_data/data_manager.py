@@ -0,0 +1,242 @@
+import hashlib
+import io
+import logging
+import os
+import threading
+import time
+from collections import namedtuple
+from typing import Callable, Optional
+
+import pandas as pd
+import pyarrow as pa
+
+from constants.settings import COMPACT_SCHEMA, PARTITIONED_LOADING
+from load_data.load_payments_and_pledges import (
+    LoadedDataset, DatasetSummary, PAYMENTS_AND_PLEDGES_PATH, CACHE_DIR, load_data, read_cache, write_cache,
+    get_cache_key, get_cache_path, get_file_fingerprint, append_rows, read_payments_and_pledges_csv
+)
+from utils.cache import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Part of the source CSV the loaded dataset was built from: size in bytes, modification time, header columns
+# and content fingerprint (see `load_data.load_payments_and_pledges.get_file_fingerprint`)
+SourceState = namedtuple('SourceState', 'size, mtime_ns, columns, fingerprint')
+
+
+class DataManager:
+    """
+    Owns the loaded dataset and keeps it in sync with the source CSV, without restarting the app.
+
+    `refresh` checks the file for changes: rows appended since the loaded version are parsed on their own and
+    ingested incrementally (see `load_data.load_payments_and_pledges.append_rows`), while any other change
+    (rows edited or removed, file replaced) triggers a full reload. The new dataset is swapped in with a single
+    assignment, so readers always see a consistent set of tables, summary and version, then listeners
+    (e.g. the selection store) are notified. Caches keyed on the data version are invalidated by the new version.
+
+    Processes sharing the cache directory (e.g. gunicorn workers) take turns through a file lock: the first one
+    to see a change ingests it and writes the cache of the new version, the others reopen that cache by version
+    instead of parsing the rows and rebuilding the tables themselves.
+
+    `start` runs `refresh` periodically in a daemon thread (restarted in forked gunicorn workers).
+    A failing refresh is logged and retried on the next check: the current version keeps being served.
+    """
+
+    def __init__(
+            self,
+            dataset: LoadedDataset,
+            path: str = PAYMENTS_AND_PLEDGES_PATH,
+            cache_dir: str = CACHE_DIR,
+            compact: bool = COMPACT_SCHEMA,
+            lazy: bool = PARTITIONED_LOADING
+    ):
+        self.dataset: LoadedDataset = dataset
+        self.path: str = path
+        self.cache_dir: str = cache_dir
+        self.compact: bool = compact
+        self.lazy: bool = lazy
+        # State of the source CSV, only read (hashing the whole file) by the first refresh
+        self.source: Optional[SourceState] = None
+        self.interval: Optional[float] = None
+        self._listeners: list[Callable[[LoadedDataset], None]] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._source_checked: bool = False
+        self._refresh_lock = SingleFlight(lock_dir=os.path.join(cache_dir, 'locks'))
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}: {self.path} | version='{self.version}'>"
+
+    @property
+    def version(self) -> str:
+        return self.dataset.version
+
+    @property
+    def summary(self) -> DatasetSummary:
+        return self.dataset.summary
+
+    def subscribe(self, listener: Callable[[LoadedDataset], None]) -> None:
+        """Registers a function called with every new dataset, right after it is swapped in."""
+        self._listeners.append(listener)
+
+    def read_appended_rows(self, source: SourceState) -> tuple[Optional[bytes], SourceState]:
+        """
+        Reads the rows appended to the source CSV after the part described by `source`.
+
+        Args:
+            source (SourceState): Part of the file already loaded.
+
+        Returns:
+            tuple[Optional[bytes], SourceState]: The complete rows appended (None if the part already loaded
+            changed, i.e. the file was not only appended to) and the state of the file up to these rows.
+            A row still being written (without its line break) is left for the next read.
+        """
+        digest = hashlib.blake2b(digest_size=10)
+        mtime_ns = os.stat(self.path).st_mtime_ns
+
+        with open(self.path, 'rb') as f:
+            remaining = source.size
+            while remaining and (chunk := f.read(min(remaining, 1 << 20))):
+                digest.update(chunk)
+                remaining -= len(chunk)
+
+            if remaining or digest.hexdigest() != source.fingerprint:
+                return None, source
+
+            appended = f.read()
+
+        appended = appended[:appended.rfind(b'\n') + 1]
+        digest.update(appended)
+
+        return appended, source._replace(size=source.size + len(appended), mtime_ns=mtime_ns,
+                                         fingerprint=digest.hexdigest())
+
+    def get_source_state(self, dataset: LoadedDataset) -> Optional[SourceState]:
+        """Returns the state of the source CSV, or None if it no longer matches the version of `dataset`."""
+        mtime_ns = os.stat(self.path).st_mtime_ns
+        columns = pd.read_csv(self.path, nrows=0).columns.tolist()
+        fingerprint = get_file_fingerprint(self.path)
+
+        if get_cache_key(fingerprint=fingerprint, compact=self.compact) != dataset.version:
+            return None
+        return SourceState(size=os.path.getsize(self.path), mtime_ns=mtime_ns, columns=columns,
+                           fingerprint=fingerprint)
+
+    def refresh(self) -> bool:
+        """
+        Ingests the changes of the source CSV since the loaded version, if any.
+
+        Returns:
+            bool: Whether a new data version was swapped in.
+        """
+        with self._lock:
+            if not self._source_checked:
+                self.source = self.get_source_state(self.dataset)
+                self._source_checked = True
+
+            stat = os.stat(self.path)
+            source = self.source
+            if source is not None and (stat.st_size, stat.st_mtime_ns) == (source.size, source.mtime_ns):
+                return False
+
+            appended = None
+            if source is not None:
+                appended, new_source = self.read_appended_rows(source)
+
+            if appended is None:
+                # The loaded part of the file changed: reload everything (from the cache written by another
+                # process, if it already reloaded this version)
+                with self._refresh_lock.hold('refresh'):
+                    dataset = load_data(path=self.path, cache_dir=self.cache_dir, compact=self.compact,
+                                        lazy=self.lazy)
+                self.swap(dataset=dataset, source=self.get_source_state(dataset))
+                logger.info('Data version %s reloaded from %s', dataset.version, self.path)
+                return True
+
+            if not appended.strip():
+                self.source = source._replace(mtime_ns=new_source.mtime_ns)
+                return False
+
+            version = get_cache_key(fingerprint=new_source.fingerprint, compact=self.compact)
+            with self._refresh_lock.hold('refresh'):
+                dataset = self.reopen(version)
+                if dataset is None:
+                    df_new = read_payments_and_pledges_csv(io.BytesIO(appended), names=source.columns)
+                    dataset = self.persist(append_rows(self.dataset, df_new=df_new, version=version))
+                    logger.info('Data version %s: %d rows appended to %s', version, len(df_new), self.path)
+                else:
+                    logger.info('Data version %s reopened from the cache', version)
+
+            self.swap(dataset=dataset, source=new_source)
+            return True
+
+    def reopen(self, version: str) -> Optional[LoadedDataset]:
+        """Opens the cache of `version` written by another process, or returns None if there is none."""
+        if not os.path.exists(get_cache_path(version, self.cache_dir)):
+            return None
+
+        try:
+            df, cube, donor_index, id_decoders, summary = read_cache(
+                cache_key=version, compact=self.compact, cache_dir=self.cache_dir, lazy=self.lazy)
+        except (OSError, KeyError, ValueError, pa.ArrowException):
+            logger.exception('Failed to read the cache of data version %s', version)
+            return None
+        return LoadedDataset(df=df, cube=cube, donor_index=donor_index, id_decoders=id_decoders, version=version,
+                             summary=summary)
+
+    def persist(self, dataset: LoadedDataset) -> LoadedDataset:
+        """
+        Writes the cache of an incrementally built dataset, so other processes and the next start load it without
+        parsing the CSV, and reopens it partition by partition if loading is lazy (releasing the whole tables
+        `append_rows` had to load). Failures keep the in-memory tables.
+        """
+        try:
+            write_cache(df=dataset.df, cube=dataset.cube, donor_index=dataset.donor_index,
+                        id_decoders=dataset.id_decoders, cache_key=dataset.version, cache_dir=self.cache_dir,
+                        memory_report=dataset.summary.memory_report)
+            if self.lazy:
+                df, cube, donor_index, id_decoders, summary = read_cache(
+                    cache_key=dataset.version, compact=self.compact, cache_dir=self.cache_dir, lazy=True)
+                return dataset._replace(df=df, cube=cube, donor_index=donor_index)
+        except (OSError, KeyError, ValueError, pa.ArrowException):
+            logger.exception('Failed to write the cache of data version %s', dataset.version)
+        return dataset
+
+    def swap(self, dataset: LoadedDataset, source: Optional[SourceState]) -> None:
+        """Makes `dataset` the current version and notifies the listeners."""
+        self.dataset = dataset
+        self.source = source
+        self._source_checked = True
+        for listener in self._listeners:
+            listener(dataset)
+
+    def start(self, interval: float) -> threading.Thread:
+        """
+        Checks the source CSV every `interval` seconds in a daemon thread (only once per process).
+        Threads don't survive a fork, so the thread is started again in forked processes (gunicorn workers).
+        """
+        if self._thread is None:
+            if self.interval is None:
+                os.register_at_fork(after_in_child=self._restart)
+            self.interval = interval
+            self._thread = threading.Thread(target=self._watch, name='data-manager', daemon=True)
+            self._thread.start()
+        return self._thread
+
+    def _restart(self) -> None:
+        self._lock = threading.Lock()
+        self._refresh_lock = SingleFlight(lock_dir=self._refresh_lock.lock_dir)
+        self._thread = None
+        self.start(interval=self.interval)
+
+    def _watch(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception('Failed to refresh the dataset from %s', self.path)
+
+
+# Load data
+data_manager = DataManager(dataset=load_data())
@@ -1,11 +1,692 @@
+import calendar
+import hashlib
+import io
+import json
+import logging
+import os
+from collections import namedtuple
+from datetime import datetime
+from typing import Any, Optional, Union
+
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from constants.schema import (
+    CATEGORICAL_COLUMNS, ID_COLUMNS, FLOAT32_COLUMNS, ONE_TIME_FREQUENCY, FREQ_MULTIPLIER, FISCAL_YEAR_START_MONTH,
+    CUBE_DIMENSIONS, CUBE_MEASURES, DISTINCT_INDEX_DIMENSIONS, DISTINCT_INDEX_VALUES
+)
+from constants.settings import COMPACT_SCHEMA, PARTITIONED_LOADING, PARTITION_FREQ, PARTITION_CACHE_SIZE
+from utils.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+PAYMENTS_AND_PLEDGES_PATH = 'data/payments_and_pledges.csv'
+CACHE_DIR = 'data/cache'
+CACHE_PREFIX = 'payments_and_pledges'
+
+LoadedDataset = namedtuple('LoadedDataset', 'df, cube, donor_index, id_decoders, version, summary')
+# memory_report: bytes used by each column before and after compaction (see `get_memory_report`), measured when
+# the dataset was last parsed from the CSV (None if the schema is not compact)
+DatasetSummary = namedtuple('DatasetSummary', 'year_min, year_max, date_max, memory_report', defaults=(None,))
+
+# Schema metadata key listing the partitions of a cached table: [label, first record batch, number of batches]
+PARTITIONS_METADATA_KEY = b'oftw_partitions'
+
+# Bump whenever the derived columns or their dtypes change, so stale caches are rebuilt
+CACHE_SCHEMA_VERSION = 10
+
+
+def get_file_fingerprint(path: str, chunk_size: int = 1 << 20) -> str:
+    """
+    Computes a short content hash of a file, used to key the columnar cache.
 
+    Hashing the raw bytes is a small fraction of the cost of parsing the CSV and,
+    unlike modification times, stays stable across container builds and deploys.
 
-def load_data() -> pd.DataFrame:
-    df = pd.read_csv('data/payments_and_pledges.csv', parse_dates=['date'])
+    Args:
+        path (str): Path to the file to fingerprint.
+        chunk_size (int): Number of bytes read per iteration.
+
+    Returns:
+        str: Hex digest identifying the file content.
+    """
+    digest = hashlib.blake2b(digest_size=10)
+
+    with open(path, 'rb') as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def read_payments_and_pledges_csv(
+        path: Union[str, io.BytesIO] = PAYMENTS_AND_PLEDGES_PATH,
+        names: Optional[list[str]] = None
+) -> pd.DataFrame:
+    """
+    Parses the raw payments + pledges CSV and derives the typed columns.
+
+    Args:
+        path (str | io.BytesIO): Path to the CSV file, or buffer of CSV rows.
+        names (list[str], optional): Column names, when the rows have no header (e.g. rows appended to the file).
+
+    Returns:
+        pd.DataFrame: Dataset with a datetime 'date' column and a monthly 'month' period column.
+    """
+    df = pd.read_csv(path, parse_dates=['date'], names=names, header=None if names else 'infer')
     df['month'] = pd.to_datetime(df['month']).dt.to_period('M')
     return df
 
 
-# Load date range from data
-df_payments_and_pledges = load_data()
+def add_date_dimension(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Attaches the date dimension derived from the 'date' column:
+        - 'fiscal_year' (FY ends on June 30), 'quarter_fy' and 'quarter_cy'
+        - 'month_number', 'month_label' (e.g. 'Jan'), 'month_order_fy' and 'month_order_cy'
+          (position of the month in the fiscal or calendar year, 0-based)
+        - 'week_start' (Monday of the ISO week) and 'week_index' (number of the week since the epoch),
+          so weeks elapsed between two dates are a plain integer difference
+
+    Args:
+        df (pd.DataFrame): Frame with a datetime 'date' column (payments, cube or distinct-count index).
+
+    Returns:
+        pd.DataFrame: The frame with the date dimension columns added.
+    """
+    df = df.copy()
+    dates = df['date'].dt
+    month = dates.month
+
+    df['fiscal_year'] = (dates.year + (month >= FISCAL_YEAR_START_MONTH)).astype('int16')
+    df['quarter_fy'] = (((month - FISCAL_YEAR_START_MONTH) % 12) // 3 + 1).astype('int8')
+    df['quarter_cy'] = dates.quarter.astype('int8')
+
+    df['month_number'] = month.astype('int8')
+    df['month_label'] = pd.Categorical.from_codes(month - 1, categories=list(calendar.month_abbr)[1:])
+    df['month_order_fy'] = ((month - FISCAL_YEAR_START_MONTH) % 12).astype('int8')
+    df['month_order_cy'] = (month - 1).astype('int8')
+
+    df['week_start'] = df['date'] - pd.to_timedelta(dates.dayofweek, unit='d')
+    df['week_index'] = (df['week_start'].to_numpy().astype('datetime64[D]').astype('int64') // 7).astype('int32')
+
+    return df
+
+
+def add_derived_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Attaches the date dimension (see `add_date_dimension`) and the per-row derived values used by
+    the metrics and charts, so they are computed once at load time instead of on every request:
+        - 'recurring_flag' ('Recurring' or 'One-Time', based on the pledge frequency)
+        - 'amount_counterfactual' (amount_usd weighted by counterfactuality)
+        - 'annualized_amount' (amount_usd annualized with the frequency multiplier, 0 for one-time
+          and unknown frequencies), used by ARR metrics
+
+    Args:
+        df (pd.DataFrame): Dataset as parsed from the CSV.
+
+    Returns:
+        pd.DataFrame: The dataset with the derived columns added.
+    """
+    df = add_date_dimension(df)
+
+    df['recurring_flag'] = pd.Categorical(
+        df['frequency'].isin(ONE_TIME_FREQUENCY).map({True: 'One-Time', False: 'Recurring'}),
+        categories=['Recurring', 'One-Time']
+    )
+    df['amount_counterfactual'] = df['amount_usd'] * df['counterfactuality']
+    df['annualized_amount'] = df['frequency'].map(FREQ_MULTIPLIER).astype('float64').fillna(0) * df['amount_usd']
+
+    return df
+
+
+def build_cube(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Pre-aggregates the additive measures (amount_usd, amount_counterfactual) at the
+    day × CUBE_DIMENSIONS grain, with the same column names and date dimension as the payments.
+
+    Sums are additive, so any selection (period, quarter, month, week, breakdown category) of an
+    amount metric gives the same result on the cube as on the raw payments, on far fewer rows.
+    The cube is sorted by date like the payments, so periods are sliced the same way.
+
+    Args:
+        df (pd.DataFrame): Payments with derived columns (see `add_derived_columns`).
+
+    Returns:
+        pd.DataFrame: One row per day and combination of dimensions, with float64 summed measures.
+    """
+    measures = df[CUBE_MEASURES].astype('float64')
+    keys = [df['date'], *[df[col] for col in CUBE_DIMENSIONS]]
+
+    cube = measures.groupby(keys, observed=True, dropna=False).sum().reset_index()
+    return add_date_dimension(cube)
+
+
+def build_distinct_index(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Builds the distinct-count index of the identifiers (DISTINCT_INDEX_VALUES, e.g. donor codes).
+
+    Distinct counts can't be pre-summed like the cube, so the index keeps each identifier once per
+    fragment × DISTINCT_INDEX_DIMENSIONS, where a fragment is the part of an ISO week falling within a month
+    (dated by its first day). Any month-aligned period (year or quarter), month or week of a period is a union
+    of fragments, so the number of unique identifiers over a slice of the index, for any status set or
+    breakdown value, is exactly the one of the raw payments.
+
+    Rows are sorted by fragment date, status and identifier code, and carry the same date dimension
+    and column names as the payments; rows without identifier are dropped (they are never counted).
+
+    Args:
+        df (pd.DataFrame): Payments with derived columns (see `add_derived_columns`).
+
+    Returns:
+        pd.DataFrame: The sorted unique combinations, with the date dimension of each fragment.
+    """
+    month_start = df['date'] - pd.to_timedelta(df['date'].dt.day - 1, unit='d')
+
+    df_index = df[[*DISTINCT_INDEX_DIMENSIONS, *DISTINCT_INDEX_VALUES]].copy()
+    df_index.insert(0, 'date', df['week_start'].where(df['week_start'] > month_start, month_start))
+    df_index = df_index.dropna(subset=DISTINCT_INDEX_VALUES).drop_duplicates()
+
+    # Identifier codes (compact schema) no longer need to be nullable
+    for col in DISTINCT_INDEX_VALUES:
+        if pd.api.types.is_integer_dtype(df_index[col]):
+            df_index[col] = df_index[col].astype('int32')
+
+    df_index = df_index.sort_values(['date', 'pledge_status', *DISTINCT_INDEX_VALUES], kind='stable', ignore_index=True)
+    return add_date_dimension(df_index)
+
+
+def compact_schema(
+        df: pd.DataFrame,
+        id_decoders: Optional[dict[str, pd.Index]] = None
+) -> tuple[pd.DataFrame, dict[str, pd.Index]]:
+    """
+    Converts the dataset to a compact in-memory representation:
+        - Low-cardinality label columns (status, frequency, platform, ...) become categoricals
+        - Identifier columns (donor_id, pledge_id) become dense nullable int32 codes
+        - Amount and counterfactuality columns are downcast to float32
+
+    Codes preserve equality and missing values, so distinct counts and null filters give
+    the same results as on the original strings.
+
+    Args:
+        df (pd.DataFrame): Dataset as parsed from the CSV.
+        id_decoders (dict[str, pd.Index], optional): Reverse dictionaries to extend (e.g. when compacting rows
+            appended to an already compacted dataset): known identifiers keep their code, new ones are appended.
+
+    Returns:
+        tuple[pd.DataFrame, dict[str, pd.Index]]: The compacted dataset and, for each identifier column,
+        the reverse dictionary mapping a code (position) back to the original identifier.
+    """
+    df = df.copy()
+    known_decoders = id_decoders or {}
+    id_decoders = {}
+
+    for col in CATEGORICAL_COLUMNS:
+        if col in df:
+            df[col] = df[col].astype('category')
+
+    for col in ID_COLUMNS:
+        if col in df:
+            if col in known_decoders:
+                known = known_decoders[col]
+                new_values = pd.Index(df[col].dropna().unique())
+                uniques = known.append(new_values[~new_values.isin(known)])
+                codes = uniques.get_indexer(df[col])
+            else:
+                codes, uniques = pd.factorize(df[col])
+            df[col] = pd.arrays.IntegerArray(codes.astype('int32'), mask=codes < 0)
+            id_decoders[col] = pd.Index(uniques)
+
+    for col in FLOAT32_COLUMNS:
+        if col in df:
+            df[col] = df[col].astype('float32')
+
+    return df, id_decoders
+
+
+def concat_tables(df: pd.DataFrame, df_other: pd.DataFrame) -> pd.DataFrame:
+    """
+    Concatenates two tables with the same columns, unifying the categories of categorical columns, so the result
+    keeps categorical dtypes. Categories unknown to `df` are merged in sorted order, as `compact_schema` would
+    have produced them from the whole dataset.
+    """
+    df, df_other = df.copy(), df_other.copy()
+
+    for col in df.columns:
+        dtype, other_dtype = df[col].dtype, df_other[col].dtype
+        if isinstance(dtype, pd.CategoricalDtype) and isinstance(other_dtype, pd.CategoricalDtype):
+            if other_dtype.categories.isin(dtype.categories).all():
+                categories = dtype.categories
+            else:
+                categories = dtype.categories.union(other_dtype.categories)
+            df[col] = df[col].cat.set_categories(categories)
+            df_other[col] = df_other[col].cat.set_categories(categories)
+        elif dtype != other_dtype and df_other[col].isna().all():
+            # A column missing from every new row is parsed as float
+            df_other[col] = df_other[col].astype(dtype)
+
+    return pd.concat([df, df_other], ignore_index=True)
+
+
+def get_fragment_start(date: pd.Timestamp) -> pd.Timestamp:
+    """Returns the first day of the fragment (week within a month) of a date (see `build_distinct_index`)."""
+    return max(date - pd.Timedelta(days=date.dayofweek), date.replace(day=1))
+
+
+def append_rows(dataset: LoadedDataset, df_new: pd.DataFrame, version: str) -> LoadedDataset:
+    """
+    Ingests rows appended to the CSV into a loaded dataset, without parsing the rows already loaded.
+
+    Derived columns are computed on the new rows only, identifiers are encoded with the existing reverse
+    dictionaries (extended with the new identifiers), and only the part of the cube and of the distinct-count index
+    from the earliest new date (from its fragment, for the index) is rebuilt: rows may arrive out of order.
+
+    Args:
+        dataset (LoadedDataset): Currently loaded dataset (its tables are not modified).
+        df_new (pd.DataFrame): New rows, as parsed by `read_payments_and_pledges_csv`.
+        version (str): Data version of the extended dataset.
+
+    Returns:
+        LoadedDataset: The extended dataset, with in-memory read-only tables.
+    """
+    df_new = add_derived_columns(df_new)
+    id_decoders = dataset.id_decoders
+    if id_decoders:
+        df_new, id_decoders = compact_schema(df_new, id_decoders=id_decoders)
+
+    df, cube, donor_index = (
+        table.read_all() if isinstance(table, PartitionedTable) else table
+        for table in (dataset.df, dataset.cube, dataset.donor_index)
+    )
+
+    # Same order as sorting the whole CSV: the new rows come after the loaded ones within a date
+    df = concat_tables(df, df_new).sort_values('date', kind='stable', ignore_index=True)
+
+    date_min = df_new['date'].min()
+    df_tail = df.iloc[df['date'].searchsorted(date_min):]
+    cube = concat_tables(cube.iloc[:cube['date'].searchsorted(date_min)], build_cube(df_tail))
+
+    fragment_start = get_fragment_start(date_min)
+    df_tail = df.iloc[df['date'].searchsorted(fragment_start):]
+    donor_index = concat_tables(donor_index.iloc[:donor_index['date'].searchsorted(fragment_start)],
+                                build_distinct_index(df_tail))
+
+    return LoadedDataset(df=make_read_only(df), cube=make_read_only(cube), donor_index=make_read_only(donor_index),
+                         id_decoders=id_decoders, version=version,
+                         summary=get_summary(df, memory_report=dataset.summary.memory_report))
+
+
+def decode_ids(codes: pd.Series, id_decoder: pd.Index) -> pd.Series:
+    """
+    Maps int32 identifier codes back to the original identifiers (missing codes stay missing).
+
+    Args:
+        codes (pd.Series): Codes produced by `compact_schema`.
+        id_decoder (pd.Index): Reverse dictionary of the identifier column (see `id_decoders`).
+
+    Returns:
+        pd.Series: The original identifiers, aligned with `codes`.
+    """
+    positions = codes.fillna(-1).astype('int64').to_numpy()
+    values = id_decoder.take(positions, allow_fill=True, fill_value=None)
+    return pd.Series(values, index=codes.index, name=codes.name)
+
+
+def read_only(array: np.ndarray) -> np.ndarray:
+    """Returns a read-only view of a numpy array (no copy)."""
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+
+def make_read_only(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Rebuilds a frame on read-only views of its column buffers, without copying the data
+    (except the small validity masks of nullable identifier codes).
+
+    The loaded tables are shared by every request, and by every gunicorn worker when the app is preloaded
+    (see gunicorn.conf.py): any attempt to modify them in place raises instead of silently corrupting other
+    requests or copying shared memory pages, while pandas' copy-on-write keeps derived frames writable.
+
+    Args:
+        df (pd.DataFrame): Loaded table (payments, cube or distinct-count index).
+
+    Returns:
+        pd.DataFrame: The same table, backed by read-only arrays.
+    """
+    columns = {}
+
+    for col in df.columns:
+        values = df[col].array
+        if isinstance(values, pd.Categorical):
+            columns[col] = pd.Categorical.from_codes(read_only(values.codes), dtype=values.dtype)
+        elif isinstance(values, pd.arrays.IntegerArray):
+            columns[col] = pd.arrays.IntegerArray(
+                read_only(values.to_numpy(dtype=values.dtype.numpy_dtype, na_value=0)),
+                read_only(values.isna())
+            )
+        elif isinstance(values, pd.arrays.PeriodArray):
+            columns[col] = pd.arrays.PeriodArray(read_only(values.asi8), dtype=values.dtype)
+        elif isinstance(values, (pd.arrays.NumpyExtensionArray, pd.arrays.DatetimeArray)):
+            columns[col] = read_only(np.asarray(values))
+        else:
+            columns[col] = values  # Arrow-backed arrays (e.g. strings) are immutable
+
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+def get_memory_report(df_before: pd.DataFrame, df_after: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compares the deep memory usage of each column before and after compaction.
+
+    Returns:
+        pd.DataFrame: One row per column with 'bytes_before', 'bytes_after', 'bytes_saved'
+                      and 'ratio' (before / after), plus a 'total' row.
+    """
+    report = pd.DataFrame({
+        'bytes_before': df_before.memory_usage(index=False, deep=True),
+        'bytes_after': df_after.memory_usage(index=False, deep=True),
+    })
+    report.loc['total'] = report.sum()
+    report['bytes_saved'] = report['bytes_before'] - report['bytes_after']
+    report['ratio'] = (report['bytes_before'] / report['bytes_after']).round(1)
+    return report
+
+
+def get_cache_key(fingerprint: str, compact: bool, partition_freq: str = PARTITION_FREQ) -> str:
+    return f'{fingerprint}-v{CACHE_SCHEMA_VERSION}{"c" if compact else ""}{partition_freq.lower()}'
+
+
+def get_cache_path(cache_key: str, cache_dir: str = CACHE_DIR, suffix: str = 'feather') -> str:
+    return os.path.join(cache_dir, f'{CACHE_PREFIX}.{cache_key}.{suffix}')
+
+
+def get_summary(df: pd.DataFrame, memory_report: Optional[dict] = None) -> DatasetSummary:
+    """Returns the year range and last date of the dataset (used for the year selector and as 'today')."""
+    return DatasetSummary(year_min=int(df['year'].min()), year_max=int(df['year'].max()), date_max=df['date'].max(),
+                          memory_report=memory_report)
+
+
+def write_partitioned_table(df: pd.DataFrame, path: str, partition_freq: str = PARTITION_FREQ,
+                            metadata: Optional[dict] = None) -> None:
+    """
+    Writes a table sorted by date as an uncompressed Arrow IPC (Feather) file holding one record batch
+    per calendar year or quarter (see `PartitionedTable`). The partition of each batch is recorded in
+    the schema metadata.
+
+    Args:
+        df (pd.DataFrame): Table to persist, sorted by its 'date' column.
+        path (str): Destination file.
+        partition_freq (str): 'Y' to partition by calendar year, 'Q' by calendar quarter.
+        metadata (dict, optional): Extra schema metadata (JSON-serializable values).
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False).combine_chunks()
+
+    # Rows are sorted by date: each partition is a contiguous range of rows
+    labels = df['date'].dt.to_period(partition_freq).astype(str).to_numpy()
+    starts = np.flatnonzero(np.r_[True, labels[1:] != labels[:-1]]) if len(labels) else np.array([], dtype=int)
+    stops = np.r_[starts[1:], len(labels)]
+
+    batches, partitions = [], []
+    for start, stop in zip(starts, stops):
+        partition_batches = table.slice(start, stop - start).to_batches()
+        partitions.append([labels[start], len(batches), len(partition_batches)])
+        batches.extend(partition_batches)
+
+    schema = table.schema.with_metadata({
+        **(table.schema.metadata or {}),
+        PARTITIONS_METADATA_KEY: json.dumps(partitions).encode(),
+        **{key.encode(): json.dumps(value, default=str).encode() for key, value in (metadata or {}).items()},
+    })
+    with pa.ipc.new_file(path, schema) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+
+
+class PartitionedTable:
+    """
+    Table sorted by date, stored on disk as one record batch per calendar year or quarter
+    (see `write_partitioned_table`) and loaded lazily, one partition at a time.
+
+    The file is memory-mapped; a partition is converted to a read-only DataFrame on its first access and kept in
+    a bounded LRU cache, so memory scales with the years being viewed rather than with the whole history.
+    """
+
+    def __init__(self, path: str, maxsize: int = PARTITION_CACHE_SIZE):
+        self.path: str = path
+        self._reader = pa.ipc.open_file(pa.memory_map(path))
+        self.partitions: dict[pd.Period, tuple[int, int]] = {
+            pd.Period(label): (first_batch, n_batches)
+            for label, first_batch, n_batches in json.loads(self._reader.schema.metadata[PARTITIONS_METADATA_KEY])
+        }
+        self._cache = LRUCache(maxsize=maxsize)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}: {os.path.basename(self.path)} | {len(self.partitions)} partitions>"
+
+    def get_metadata(self, key: str) -> Any:
+        return json.loads(self._reader.schema.metadata[key.encode()])
+
+    def load_partition(self, partition: pd.Period) -> pd.DataFrame:
+        """Returns the (read-only) rows of a partition, converting them on the first access."""
+        def convert() -> pd.DataFrame:
+            first_batch, n_batches = self.partitions[partition]
+            table = pa.Table.from_batches(
+                [self._reader.get_batch(i) for i in range(first_batch, first_batch + n_batches)],
+                schema=self._reader.schema
+            )
+            return make_read_only(table.to_pandas(split_blocks=True))
+
+        return self._cache.get_or_compute(partition, convert)
+
+    def load(self, date_min: datetime, date_max: datetime) -> pd.DataFrame:
+        """
+        Returns the rows of the partitions overlapping [`date_min`, `date_max`], sorted by date.
+        Partitions outside the range are neither read nor converted: callers still slice the exact range
+        (see `utils.helpers.slice_dates`).
+        """
+        frames = [
+            self.load_partition(partition) for partition in self.partitions
+            if partition.start_time <= pd.Timestamp(date_max) and partition.end_time >= pd.Timestamp(date_min)
+        ]
+        if not frames:
+            return make_read_only(self._reader.schema.empty_table().to_pandas())
+        if len(frames) == 1:
+            return frames[0]
+        return make_read_only(pd.concat(frames, ignore_index=True))
+
+    def read_all(self) -> pd.DataFrame:
+        """Converts the whole table at once (bypassing the partition cache)."""
+        return self._reader.read_all().to_pandas(split_blocks=True)
+
+
+def is_being_written(filename: str) -> bool:
+    """Whether a cache file is the temporary file of a running process (named '<cache file>.<pid>.tmp')."""
+    parts = filename.split('.')
+    if parts[-1] != 'tmp' or not parts[-2].isdigit():
+        return False
+    if os.name == 'nt':  # os.kill would terminate the process: keep temporary files
+        return True
+
+    try:
+        os.kill(int(parts[-2]), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:  # Running, under another user
+        return True
+    return True
+
+
+def write_cache(
+        df: pd.DataFrame,
+        cube: pd.DataFrame,
+        donor_index: pd.DataFrame,
+        id_decoders: dict[str, pd.Index],
+        cache_key: str,
+        cache_dir: str = CACHE_DIR,
+        partition_freq: str = PARTITION_FREQ,
+        memory_report: Optional[dict] = None
+) -> None:
+    """
+    Writes the typed dataset, its cube and distinct-count index as uncompressed Arrow IPC (Feather) files
+    partitioned by year or quarter (see `write_partitioned_table`), so they can be memory-mapped and loaded
+    partition by partition on later starts, along with the identifier reverse dictionaries when the schema is compact.
+    Files are written to a temporary path first and atomically moved in place, which keeps
+    concurrent workers from reading a partially written cache.
+    Caches built from previous versions of the CSV (or of the schema) are removed.
+
+    Args:
+        df (pd.DataFrame): Typed dataset to persist (including derived columns such as 'month').
+        cube (pd.DataFrame): Pre-aggregated cube of the dataset (see `build_cube`).
+        donor_index (pd.DataFrame): Distinct-count index of the dataset (see `build_distinct_index`).
+        id_decoders (dict[str, pd.Index]): Reverse dictionaries of the identifier columns.
+        cache_key (str): Key identifying the CSV content and schema.
+        cache_dir (str): Directory holding the cache files.
+        partition_freq (str): 'Y' to partition by calendar year, 'Q' by calendar quarter.
+        memory_report (dict, optional): Memory savings of the compact schema, stored with the summary.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+
+    # The summary is written last, with the main table: its presence marks a complete cache
+    tables = {'cube.feather': cube, 'donor_index.feather': donor_index, 'feather': df}
+    metadata = {'feather': {'summary': get_summary(df, memory_report=memory_report)._asdict()}}
+
+    if id_decoders:
+        df_ids = pd.DataFrame({
+            'column': [col for col, uniques in id_decoders.items() for _ in range(len(uniques))],
+            'value': [value for uniques in id_decoders.values() for value in uniques],
+        })
+        cache_path = get_cache_path(cache_key=cache_key, cache_dir=cache_dir, suffix='ids.feather')
+        tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+        feather.write_feather(df_ids, tmp_path, compression='uncompressed')
+        os.replace(tmp_path, cache_path)
+
+    for suffix, table in tables.items():
+        cache_path = get_cache_path(cache_key=cache_key, cache_dir=cache_dir, suffix=suffix)
+        tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+        write_partitioned_table(df=table, path=tmp_path, partition_freq=partition_freq,
+                                metadata=metadata.get(suffix))
+        os.replace(tmp_path, cache_path)
+
+    # Clean up caches of previous CSV versions (but not the files other processes are writing)
+    for filename in os.listdir(cache_dir):
+        if (filename.startswith(f'{CACHE_PREFIX}.') and not filename.startswith(f'{CACHE_PREFIX}.{cache_key}.')
+                and not is_being_written(filename)):
+            try:
+                os.remove(os.path.join(cache_dir, filename))
+            except FileNotFoundError:  # Removed by another process meanwhile
+                pass
+
+
+def read_cache(
+        cache_key: str,
+        compact: bool,
+        cache_dir: str = CACHE_DIR,
+        lazy: bool = PARTITIONED_LOADING
+) -> tuple[Union[pd.DataFrame, PartitionedTable], ...]:
+    """
+    Opens the cached dataset, cube and distinct-count index through a memory map. Column dtypes (datetime, period,
+    categorical, ...) are restored from the Arrow schema, so no text parsing happens.
+
+    If `lazy`, tables are returned as `PartitionedTable`s, converted partition by partition on access.
+    Otherwise they are converted at once, column by column (no consolidation into 2D blocks), so numeric columns
+    of single-partition tables without missing values keep pointing to the memory-mapped pages of the file
+    (shared with every process mapping it) instead of being copied.
+
+    Returns:
+        tuple: (df, cube, donor_index, id_decoders, summary).
+    """
+    df, cube, donor_index = (
+        PartitionedTable(get_cache_path(cache_key, cache_dir, suffix=suffix))
+        for suffix in ('feather', 'cube.feather', 'donor_index.feather')
+    )
+    summary = df.get_metadata('summary')
+    summary = DatasetSummary(year_min=summary['year_min'], year_max=summary['year_max'],
+                             date_max=pd.Timestamp(summary['date_max']), memory_report=summary.get('memory_report'))
+
+    if not lazy:
+        df, cube, donor_index = (make_read_only(table.read_all()) for table in (df, cube, donor_index))
+
+    id_decoders = {}
+    if compact:
+        df_ids = feather.read_feather(get_cache_path(cache_key, cache_dir, suffix='ids.feather'))
+        id_decoders = {col: pd.Index(df_col['value']) for col, df_col in df_ids.groupby('column', sort=False)}
+
+    return df, cube, donor_index, id_decoders, summary
+
+
+def load_data(
+        path: str = PAYMENTS_AND_PLEDGES_PATH,
+        cache_dir: str = CACHE_DIR,
+        compact: bool = COMPACT_SCHEMA,
+        lazy: bool = PARTITIONED_LOADING
+) -> LoadedDataset:
+    """
+    Loads the payments + pledges dataset, using the columnar cache when it matches the CSV content.
+
+    On the first start (or whenever the CSV changes), the CSV is parsed, sorted by date,
+    optionally compacted, aggregated into the cube of additive measures and the distinct-count index,
+    and the cache is rebuilt. Any failure to read or write the cache falls back to parsing the CSV,
+    so the cache can never prevent the app from starting.
+
+    Args:
+        path (str): Path to the CSV file.
+        cache_dir (str): Directory holding the cache files.
+        compact (bool): Whether to use the compact schema (see `compact_schema`).
+        lazy (bool): Whether to load the tables partition by partition on access (see `PartitionedTable`).
+
+    Returns:
+        LoadedDataset: Named tuple (df, cube, donor_index, id_decoders, version, summary) with the typed dataset,
+        its cube and distinct-count index, the identifier reverse dictionaries (empty if the schema is not compact),
+        the data version, which changes whenever the CSV content or the schema changes, and the dataset summary.
+        Tables are backed by read-only arrays (see `make_read_only`), or are `PartitionedTable`s if `lazy`
+        and the cache is available.
+    """
+    cache_key = get_cache_key(fingerprint=get_file_fingerprint(path), compact=compact)
+
+    if os.path.exists(get_cache_path(cache_key, cache_dir)):
+        try:
+            df, cube, donor_index, id_decoders, summary = read_cache(
+                cache_key=cache_key, compact=compact, cache_dir=cache_dir, lazy=lazy)
+            return LoadedDataset(df=df, cube=cube, donor_index=donor_index, id_decoders=id_decoders,
+                                 version=cache_key, summary=summary)
+        except (OSError, KeyError, ValueError, pa.ArrowException):
+            pass
+
+    df = add_derived_columns(read_payments_and_pledges_csv(path))
+    id_decoders = {}
+
+    # Keep rows sorted by date, so periods can be sliced with a binary search (see `utils.helpers.slice_dates`)
+    df = df.sort_values('date', kind='stable', ignore_index=True)
+
+    memory_report = None
+    if compact:
+        df_compact, id_decoders = compact_schema(df)
+        df_memory_report = get_memory_report(df_before=df, df_after=df_compact)
+        logger.info('Compact schema memory usage (bytes):\n%s', df_memory_report.to_string())
+        memory_report = df_memory_report.to_dict('index')
+        df = df_compact
+
+    cube = build_cube(df)
+    donor_index = build_distinct_index(df)
+    logger.info('Cube of additive measures: %d rows, distinct-count index: %d rows (%d payments)',
+                len(cube), len(donor_index), len(df))
+
+    try:
+        write_cache(df=df, cube=cube, donor_index=donor_index, id_decoders=id_decoders, cache_key=cache_key,
+                    cache_dir=cache_dir, memory_report=memory_report)
+        if lazy:
+            # Serve from the partitioned cache just written, releasing the parsed tables
+            df, cube, donor_index, id_decoders, summary = read_cache(
+                cache_key=cache_key, compact=compact, cache_dir=cache_dir, lazy=True)
+            return LoadedDataset(df=df, cube=cube, donor_index=donor_index, id_decoders=id_decoders,
+                                 version=cache_key, summary=summary)
+    except (OSError, KeyError, ValueError, pa.ArrowException):
+        pass
+
+    return LoadedDataset(df=make_read_only(df), cube=make_read_only(cube), donor_index=make_read_only(donor_index),
+                         id_decoders=id_decoders, version=cache_key,
+                         summary=get_summary(df, memory_report=memory_report))
+
@@ -1,5 +1,7 @@
 import json
 
+TARGETS_PATH = 'data/targets.json'
+
 # Targets data (with quarter target and annual target)
-with open("data/targets.json", "r") as f:
+with open(TARGETS_PATH, "r") as f:
     targets_data = json.load(f)
\ No newline at end of file
@@ -0,0 +1,239 @@
+import hashlib
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Hashable, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows: no locking across processes
+    fcntl = None
+
+
+class LRUCache:
+    """
+    Thread-safe, bounded mapping evicting the least recently used entries.
+
+    Used to keep computed objects (dataset slices, metric values, ...) in process memory
+    across requests without letting the cache grow unbounded.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize: int = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}: {len(self)}/{self.maxsize} entries>"
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns the cached value (marking it as recently used), or `default` if missing."""
+        with self._lock:
+            value = self._data.get(key, self._MISSING)
+            if value is self._MISSING:
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Stores a value, evicting the least recently used entries beyond `maxsize`."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Returns the cached value for `key`, computing and storing it with `compute()` on a miss.
+        The computation runs outside the lock, so concurrent misses on the same key may compute twice.
+        """
+        value = self.get(key, self._MISSING)
+        if value is self._MISSING:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class FrameCache:
+    """
+    Memoizes values derived from a DataFrame (filtered tables, masks, ...) for as long as
+    that DataFrame object is alive, keyed on its identity.
+
+    Frames flowing through a request are treated as read-only, so a value derived once
+    can be shared by every metric evaluated on the same frame.
+    """
+
+    def __init__(self):
+        self._entries: dict = {}
+        self._lock = threading.RLock()  # re-entrant: weakref callbacks may run during garbage collection
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}: {len(self._entries)} frames>"
+
+    def _get_frame_entry(self, df) -> dict:
+        frame_id = id(df)
+        with self._lock:
+            entry = self._entries.get(frame_id)
+            if entry is None or entry[0]() is not df:
+                ref = weakref.ref(df, lambda r: self._discard(frame_id, r))
+                entry = (ref, {})
+                self._entries[frame_id] = entry
+            return entry[1]
+
+    def _discard(self, frame_id: int, ref: weakref.ref) -> None:
+        with self._lock:
+            entry = self._entries.get(frame_id)
+            if entry is not None and entry[0] is ref:
+                del self._entries[frame_id]
+
+    def get_or_compute(self, df, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Returns the value memoized for (`df`, `key`), computing it with `compute()` on a miss."""
+        values = self._get_frame_entry(df)
+        if key not in values:
+            values[key] = compute()
+        return values[key]
+
+
+class OutputCache(LRUCache):
+    """
+    LRU cache of rendered callback outputs, with an optional time-to-live and hit/miss counters.
+
+    Entries belong to a data version: looking up a key with another version than the cached one
+    clears the cache, so outputs rendered from a previous dataset are never served.
+
+    Optionally backed by a persistent store (see `utils.result_store.ResultStore`): outputs are written
+    through to it, and memory misses are looked up in it, so outputs survive restarts and deploys.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: Optional[float] = None, persistent_store=None):
+        super().__init__(maxsize=maxsize)
+        self.ttl: Optional[float] = ttl  # In seconds (no expiry if None)
+        self.persistent_store = persistent_store
+        self.version: Optional[str] = None
+        self.hits: int = 0
+        self.persistent_hits: int = 0
+        self.misses: int = 0
+
+    def __repr__(self):
+        stats = f"hits={self.hits} misses={self.misses}"
+        return f"<{self.__class__.__name__}: {len(self)}/{self.maxsize} entries | {stats}>"
+
+    def lookup(self, key: Hashable, version: str, default: Any = None, count: bool = True) -> Any:
+        """Returns the output cached for `key` and `version`, or `default` (counting a hit or a miss if `count`)."""
+        with self._lock:
+            if version != self.version:
+                self.clear()
+                self.version = version
+                if self.persistent_store is not None:
+                    self.persistent_store.prune(version)
+
+            entry = self.get(key, self._MISSING)
+            if entry is not self._MISSING and self.ttl and time.monotonic() - entry[0] > self.ttl:
+                del self._data[key]
+                entry = self._MISSING
+
+            if entry is self._MISSING and self.persistent_store is not None:
+                value = self.persistent_store.get(version, key, default=self._MISSING)
+                if value is not self._MISSING:
+                    self.persistent_hits += count
+                    entry = (time.monotonic(), value)
+                    self.set(key, entry)
+
+            if entry is self._MISSING:
+                self.misses += count
+                return default
+
+            self.hits += count
+            return entry[1]
+
+    def store(self, key: Hashable, version: str, value: Any) -> None:
+        """Caches an output rendered from `version` (ignored if the data version changed meanwhile)."""
+        with self._lock:
+            if version != self.version:
+                return
+            self.set(key, (time.monotonic(), value))
+
+        if self.persistent_store is not None:
+            self.persistent_store.set(version, key, value)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'persistent_hits': self.persistent_hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else None,
+                'version': self.version,
+            }
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent computations of the same key: the first caller computes, the others wait for it
+    and then find its result in the cache instead of computing it again.
+
+    Keys are locked per process with one lock per key (released locks are discarded), and optionally across
+    processes (e.g. gunicorn workers) with a file lock per key in `lock_dir`, where the leader's result is
+    shared through a persistent cache (see `utils.result_store.ResultStore`).
+    """
+
+    def __init__(self, lock_dir: Optional[str] = None):
+        self.lock_dir: Optional[str] = lock_dir if fcntl is not None else None
+        self._locks: dict = {}  # key -> [lock, number of holders and waiters]
+        self._lock = threading.Lock()
+
+        if self.lock_dir:
+            os.makedirs(self.lock_dir, exist_ok=True)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}: {len(self._locks)} keys in flight | lock_dir={self.lock_dir}>"
+
+    @contextmanager
+    def hold(self, key: str) -> Iterator[None]:
+        """Holds the lock of `key` (within the process, and across processes if enabled)."""
+        with self._lock:
+            entry = self._locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+
+        try:
+            with entry[0]:
+                if self.lock_dir:
+                    with self._hold_file_lock(key):
+                        yield
+                else:
+                    yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._locks[key]
+
+    @contextmanager
+    def _hold_file_lock(self, key: str) -> Iterator[None]:
+        filename = hashlib.blake2b(key.encode(), digest_size=10).hexdigest()
+        with open(os.path.join(self.lock_dir, f'{filename}.lock'), 'a') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
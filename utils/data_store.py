@@ -0,0 +1,169 @@
+import pandas as pd
+from collections import namedtuple
+from dash.exceptions import PreventUpdate
+from typing import Union
+
+from constants.settings import SELECTION_CACHE_SIZE
+from load_data.load_payments_and_pledges import PartitionedTable
+from utils.cache import LRUCache
+from utils.helpers import (
+    select_comparison_periods, get_comparison_period_bounds, filter_to_comparison_periods, get_year_bounds
+)
+from utils.metrics_engine import label_periods
+
+SelectionKey = namedtuple('SelectionKey', 'year_mode, year, quarter, version')
+
+# Tables and data version, swapped together when a new version is loaded
+SelectionData = namedtuple('SelectionData', 'tables, version')
+
+
+class SelectionStore:
+    """
+    Server-side store of the dataset slices filtered for each user selection.
+
+    The browser-side `dcc.Store` only holds a small selection key (year mode, year, quarter)
+    and the data version. Callbacks resolve it to the already-typed DataFrame slice kept in
+    process memory, so request payloads stay tiny and no JSON → DataFrame rebuild is needed.
+
+    Each selection can be resolved against any of the tables sorted by date (see `Metric.source`):
+        - 'payments': the raw payments
+        - 'cube': the cube of additive measures (see `load_data.load_payments_and_pledges.build_cube`)
+        - 'donor_index': the distinct-count index (see `load_data.load_payments_and_pledges.build_distinct_index`)
+
+    Tables may be loaded lazily (see `load_data.load_payments_and_pledges.PartitionedTable`): a selection then only
+    reads the partitions overlapping its two years (see `get_year_bounds`), so the filter helpers applied to
+    the slice downstream (`filter_to_period`, ...) never scan the rest of the history.
+
+    When a new data version is loaded (see `load_data.data_manager.DataManager`), `swap` replaces the tables
+    and the version at once: slices are keyed on the version, so those of the previous version are never served.
+
+    Slices are shared between requests: consumers must treat them as read-only.
+    """
+
+    def __init__(
+            self,
+            df: Union[pd.DataFrame, PartitionedTable],
+            cube: Union[pd.DataFrame, PartitionedTable],
+            donor_index: Union[pd.DataFrame, PartitionedTable],
+            version: str,
+            maxsize: int = SELECTION_CACHE_SIZE
+    ):
+        self._data = SelectionData(tables={'payments': df, 'cube': cube, 'donor_index': donor_index}, version=version)
+        self._slices = LRUCache(maxsize=maxsize)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}: version='{self.version}' | {self._slices}>"
+
+    @property
+    def tables(self) -> dict[str, Union[pd.DataFrame, PartitionedTable]]:
+        return self._data.tables
+
+    @property
+    def version(self) -> str:
+        return self._data.version
+
+    def swap(self, dataset) -> None:
+        """
+        Replaces the tables and data version with the ones of a new dataset, and drops the slices of the previous one.
+
+        Args:
+            dataset (LoadedDataset): The new dataset (see `load_data.load_payments_and_pledges.load_data`).
+        """
+        self._data = SelectionData(
+            tables={'payments': dataset.df, 'cube': dataset.cube, 'donor_index': dataset.donor_index},
+            version=dataset.version
+        )
+        self._slices.clear()
+
+    def make_store_data(self, year_mode: str, year_selected: str, quarter_selected: str) -> dict:
+        """
+        Builds the JSON-serializable payload kept in the browser for a selection.
+
+        Args:
+            year_mode (str): Either 'fy' or 'cy'.
+            year_selected (str): Year selected by the user (e.g. '2025').
+            quarter_selected (str): Quarter filter (e.g. '1', '2', ..., or 'all').
+
+        Returns:
+            dict: The selection key and data version.
+        """
+        return SelectionKey(
+            year_mode=year_mode,
+            year=int(year_selected),
+            quarter=quarter_selected,
+            version=self.version
+        )._asdict()
+
+    def get_key(self, store_data: dict, version: str = None) -> SelectionKey:
+        """
+        Returns the key of a selection payload, for the current data version (or `version`).
+
+        The payload comes back from the browser: only its selection fields are read, and a malformed payload
+        (e.g. missing fields, or kept by the browser across a change of its layout) raises `PreventUpdate`.
+        """
+        try:
+            year_mode, year, quarter = store_data['year_mode'], int(store_data['year']), store_data['quarter']
+        except (KeyError, TypeError, ValueError):
+            raise PreventUpdate
+        if not isinstance(year_mode, str) or not isinstance(quarter, str):
+            raise PreventUpdate
+        return SelectionKey(year_mode=year_mode, year=year, quarter=quarter, version=version or self.version)
+
+    def resolve(self, store_data: dict, table: str = 'payments') -> pd.DataFrame:
+        """
+        Returns the dataset slice of a selection, computing it on the first access.
+
+        A payload created for another data version is resolved against the current dataset.
+
+        Args:
+            store_data (dict): Payload created by `make_store_data`.
+            table (str): Table to slice ('payments', 'cube' or 'donor_index').
+
+        Returns:
+            pd.DataFrame: The filtered (read-only) dataset slice.
+        """
+        data = self._data
+        key = self.get_key(store_data, version=data.version)
+        return self._slices.get_or_compute(
+            (key, table),
+            lambda: select_comparison_periods(
+                df=self.load_table(data.tables[table], year_mode=key.year_mode, selected_year=key.year),
+                year_mode=key.year_mode,
+                selected_year=key.year,
+                quarter_selected=key.quarter
+            )
+        )
+
+    @staticmethod
+    def load_table(df: Union[pd.DataFrame, PartitionedTable], year_mode: str, selected_year: int) -> pd.DataFrame:
+        """Returns the rows of a table covering the selected and previous year (only their partitions if lazy)."""
+        if isinstance(df, PartitionedTable):
+            date_bounds = get_year_bounds(year_mode=year_mode, selected_year=selected_year, include_previous=True)
+            df = df.load(date_min=date_bounds.date_min, date_max=date_bounds.date_max)
+        return df
+
+    def resolve_periods(self, store_data: dict, table: str = 'payments') -> pd.DataFrame:
+        """
+        Returns the dataset slice of a selection split into the periods compared in the metric panels
+        (labeled by `utils.metrics_engine.label_periods`), computing it on the first access.
+
+        Args:
+            store_data (dict): Payload created by `make_store_data`.
+            table (str): Table to slice ('payments', 'cube' or 'donor_index').
+
+        Returns:
+            pd.DataFrame: The (read-only) labeled frame of the current and previous periods.
+        """
+        key = self.get_key(store_data)
+        period_bounds = get_comparison_period_bounds(
+            selected_year=key.year,
+            year_mode=key.year_mode,
+            quarter_selected=key.quarter
+        )
+        return self._slices.get_or_compute(
+            (key, table, 'periods'),
+            lambda: label_periods(filter_to_comparison_periods(
+                df=self.resolve(store_data, table=table),
+                period_bounds=period_bounds
+            ))
+        )
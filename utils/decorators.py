@@ -1,8 +1,9 @@
+import json
 from functools import wraps
 from constants.colors import TRANSPARENT
 from constants.colors import BLUE, BORDER_COLOR
 
-from typing import Callable
+from typing import Callable, Hashable
 
 
 def add_period(fn: Callable) -> Callable:
@@ -29,9 +30,9 @@ def add_period(fn: Callable) -> Callable:
     @wraps(fn)
     def wrapper(*args, **kwargs):
         period_value = kwargs.pop('period_value', None)
-        df = fn(*args, **kwargs).copy()
+        df = fn(*args, **kwargs)
         if period_value:
-            df['period'] = period_value
+            df = df.assign(period=period_value)
         return df
     return wrapper
 
@@ -48,7 +49,8 @@ def with_annotation(fn: Callable) -> Callable:
 
     The decorator requires the original function to return a Plotly Figure,
     and be passed a `df` DataFrame and an `annotation_args` dict containing:
-        - metric (Metric): Metric object with value/unit
+        - metric (Metric): Metric object (used for its unit)
+        - value (float): Value of the metric over the current period
         - selected_year (int)
         - selected_quarter (str)
         - year_mode (str)
@@ -75,12 +77,13 @@ def with_annotation(fn: Callable) -> Callable:
         df = kwargs.get("df")
         x_axis_col = kwargs.get("x_axis_value")
         metric = annotation_args.get("metric")
+        value = annotation_args.get("value")
         selected_year = annotation_args.get("selected_year")
         selected_quarter = annotation_args.get("selected_quarter")
         year_mode = annotation_args.get("year_mode")
 
         # Secure defaults
-        if df is None or not x_axis_col or not metric:
+        if df is None or not x_axis_col or not metric or value is None:
             return fig
 
         current_period = None
@@ -100,7 +103,7 @@ def with_annotation(fn: Callable) -> Callable:
 
         q_display = f" Q{selected_quarter}" if selected_quarter and selected_quarter != "all" else ""
         year_mode_str = year_mode.upper() if year_mode else ""
-        formatted_value = format_metric_value(metric.value, metric.unit)
+        formatted_value = format_metric_value(value, metric.unit)
 
         annotation_text = f"<b>{selected_year}{q_display} {year_mode_str}</b><br><b>{formatted_value}</b>"
 
@@ -128,3 +131,89 @@ def with_annotation(fn: Callable) -> Callable:
     return wrapper
 
 
+def make_hashable(value) -> Hashable:
+    """Converts callback arguments (dicts and lists from the browser) into a hashable cache key."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, make_hashable(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(make_hashable(v) for v in value)
+    return value
+
+
+def cache_output(output_cache, get_version: Callable[[], str], single_flight=None, minimizer=None) -> Callable:
+    """
+    Decorator serving the outputs of a pure callback from an `OutputCache`.
+
+    Outputs are keyed on the callback name and arguments (selection, metric slug, breakdown options, ...)
+    and the data version returned by `get_version`. They are cached in their serialized (JSON-ready) form,
+    so a hit returns plain dicts and lists without any pandas or Plotly work.
+    Outputs containing `dash.no_update` and raised exceptions (e.g. PreventUpdate) are never cached.
+
+    With a `SingleFlight`, concurrent misses on the same output (e.g. many users opening the default view
+    at once) wait for a single computation and are then served from the cache.
+
+    With a `FigureMinimizer`, the figures of the outputs are minimized once, before being cached.
+
+    The decorated callback gets a `get_cached(*args, **kwargs)` attribute, returning the output cached for
+    these arguments (None if not cached) without computing it.
+
+    Args:
+        output_cache (OutputCache): Cache holding the outputs.
+        get_version (Callable[[], str]): Returns the current data version.
+        single_flight (SingleFlight, optional): Coalesces concurrent computations of the same output.
+        minimizer (FigureMinimizer, optional): Shrinks the figures sent to the browser.
+
+    Returns:
+        Callable: The decorator.
+
+    Example:
+        @cache_output(output_cache, get_version=lambda: selection_store.version)
+        def render_metric_bundle(...):
+            ...
+    """
+    from dash import no_update
+    from plotly.io.json import to_json_plotly
+
+    missing = object()
+
+    def decorator(fn: Callable) -> Callable:
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            version = get_version()
+            key = (fn.__name__, make_hashable(args), make_hashable(kwargs))
+
+            output = output_cache.lookup(key, version, default=missing)
+            if output is not missing:
+                return output
+
+            if single_flight is None:
+                return compute(key, version, *args, **kwargs)
+
+            with single_flight.hold(json.dumps([version, key], default=str)):
+                # The output may have been computed by another request (or worker) while waiting
+                output = output_cache.lookup(key, version, default=missing)
+                if output is not missing:
+                    return output
+                return compute(key, version, *args, **kwargs)
+
+        def get_cached(*args, **kwargs):
+            key = (fn.__name__, make_hashable(args), make_hashable(kwargs))
+            return output_cache.lookup(key, get_version(), count=False)
+
+        def compute(key, version, *args, **kwargs):
+            output = fn(*args, **kwargs)
+            outputs = output if isinstance(output, tuple) else (output,)
+            if any(value is no_update for value in outputs):
+                return output
+
+            serialized = to_json_plotly(output)
+            output = json.loads(serialized)
+            if minimizer is not None:
+                output = minimizer.minimize_output(output, name=fn.__name__, size=len(serialized))
+            output_cache.store(key, version, output)
+            return output
+
+        wrapper.get_cached = get_cached
+        return wrapper
+
+    return decorator
@@ -1,11 +1,12 @@
 import locale
 import pandas as pd
+from collections import namedtuple
 import plotly.express as px
 import plotly.graph_objects as go
 
 from typing import Optional
 
-from utils.metrics_engine import Metric
+from utils.metrics_engine import Metric, MetricResult
 from utils.helpers import format_metric_value
 from utils.decorators import with_annotation
 
@@ -18,6 +19,14 @@ from constants.colors import (
 )
 from constants.charts import DEFAULT_PADDING, HOVERLABEL_TEMPLATE, BAR_CORNER_RADIUS, BAR_WIDTH, CUSTOM_FONT
 
+TargetBarValues = namedtuple(
+    'TargetBarValues', 'display_value, color, customdata, pace_x, target_x, label_text, label_x, label_color'
+)
+DeltaBarValues = namedtuple(
+    'DeltaBarValues', 'delta_clamped, color, label, textposition, insidetextanchor, text_color, customdata'
+)
+BreakdownBarValues = namedtuple('BreakdownBarValues', 'labels, values, texts')
+
 
 def build_value_only_chart(value: float, unit: str = "") -> go.Figure:
     """
@@ -70,40 +79,21 @@ def build_value_only_chart(value: float, unit: str = "") -> go.Figure:
     return fig
 
 
-def make_target_bar_chart(
-        metric_name,
-        value,
-        pace=None,
-        target=None,
-        unit="",
-        max_value=None,
+def get_target_bar_values(
+        value: float,
+        pace: Optional[float] = None,
+        target: Optional[float] = None,
+        unit: str = "",
+        max_value: Optional[float] = None,
         is_attrition_metric: bool = False
-):
+) -> TargetBarValues:
     """
-    Builds a horizontal bullet chart showing actual performance vs. pace and target.
-
-    - If target is missing, it falls back to simple label only.
-    - Uses distinct color logic depending on performance status.
-    - Keeps bars aligned and includes optional vertical pace/target lines.
-
-    Parameters:
-    - metric_name (str): Name of the metric (displayed on y-axis).
-    - value (float): Actual current value.
-    - pace (float, optional): Current expected pace (adds vertical dashed line).
-    - target (float, optional): Final goal (adds solid vertical line).
-    - unit (str): Suffix to display (e.g., $, %, etc.).
-    - max_value (float, optional): Max for normalization (default: target).
+    Computes the values displayed by a target bar chart (see `make_target_bar_chart`): bar length and color
+    depending on performance status, pace and target positions, and the value label.
 
     Returns:
-    - go.Figure: Configured Plotly bullet chart.
+        TargetBarValues: Named tuple of the values, normalized to `max_value` (default: target).
     """
-
-    # Handle case where no target is available: fallback to label only
-    if not target:
-        return build_value_only_chart(value=value, unit=unit)
-
-    fig = go.Figure()
-
     # Normalize all values to max
     max_val = max_value or target
     normalized_value = value / max_val
@@ -134,17 +124,68 @@ def make_target_bar_chart(
     pace_ftd = format_metric_value(value=pace, unit=unit)
     target_ftd = format_metric_value(value=target, unit=unit)
 
+    # Smart label: always aligned except if bar is too small
+    inside_bar = display_value >= 0.2
+
+    return TargetBarValues(
+        display_value=display_value,
+        color=color,
+        customdata=[pace_ftd, target_ftd],
+        pace_x=normalized_pace,
+        target_x=normalized_target,
+        label_text=f"<b>{int(value):,}{unit}</b>",
+        label_x=0.02 if inside_bar else display_value + 0.01,
+        label_color="white" if inside_bar else "black"
+    )
+
+
+def make_target_bar_chart(
+        metric_name,
+        value,
+        pace=None,
+        target=None,
+        unit="",
+        max_value=None,
+        is_attrition_metric: bool = False
+):
+    """
+    Builds a horizontal bullet chart showing actual performance vs. pace and target.
+
+    - If target is missing, it falls back to simple label only.
+    - Uses distinct color logic depending on performance status.
+    - Keeps bars aligned and includes optional vertical pace/target lines.
+
+    Parameters:
+    - metric_name (str): Name of the metric (displayed on y-axis).
+    - value (float): Actual current value.
+    - pace (float, optional): Current expected pace (adds vertical dashed line).
+    - target (float, optional): Final goal (adds solid vertical line).
+    - unit (str): Suffix to display (e.g., $, %, etc.).
+    - max_value (float, optional): Max for normalization (default: target).
+
+    Returns:
+    - go.Figure: Configured Plotly bullet chart.
+    """
+
+    # Handle case where no target is available: fallback to label only
+    if not target:
+        return build_value_only_chart(value=value, unit=unit)
+
+    fig = go.Figure()
+    bar = get_target_bar_values(value=value, pace=pace, target=target, unit=unit, max_value=max_value,
+                                is_attrition_metric=is_attrition_metric)
+
     # Add value bar
     fig.add_trace(go.Bar(
-        x=[display_value],
+        x=[bar.display_value],
         y=[""],
         orientation="h",
-        marker_color=color,
+        marker_color=bar.color,
         hoverinfo="skip",
         showlegend=False,
         cliponaxis=False,
         width=BAR_WIDTH,
-        customdata=[[pace_ftd, target_ftd]],
+        customdata=[bar.customdata],
         hovertemplate=(
             "<b>Pace:</b> %{customdata[0]}<br>"
             "<b>Target:</b> %{customdata[1]}"
@@ -154,23 +195,18 @@ def make_target_bar_chart(
 
     # Add pace and target markers
     if pace:
-        fig.add_vline(x=normalized_pace, line=dict(color="gray", dash="dot", width=1))
-    fig.add_vline(x=normalized_target, line=dict(color=HEADER_COLOR, width=2))
+        fig.add_vline(x=bar.pace_x, line=dict(color="gray", dash="dot", width=1))
+    fig.add_vline(x=bar.target_x, line=dict(color=HEADER_COLOR, width=2))
 
     # Smart label: always aligned except if bar is too small
-    label_text = f"<b>{int(value):,}{unit}</b>"
-    inside_bar = display_value >= 0.2
-    label_x = 0.02 if inside_bar else display_value + 0.01
-    label_color = "white" if inside_bar else "black"
-
     fig.add_annotation(
-        text=label_text,
-        x=label_x,
+        text=bar.label_text,
+        x=bar.label_x,
         y=metric_name,
         showarrow=False,
         font=dict(
             size=13,
-            color=label_color,
+            color=bar.label_color,
             family=CUSTOM_FONT['family']
         ),
         xref="x", yref="y",
@@ -206,21 +242,13 @@ def make_target_bar_chart(
     return fig
 
 
-def make_delta_bar_chart(metric: Metric) -> go.Figure:
+def get_delta_bar_values(metric: MetricResult) -> DeltaBarValues:
     """
-    Generates a relative horizontal bar chart to visualize the difference between
-    the current and previous period of a metric.
-
-    - For standard metrics: shows relative % change.
-    - For rate metrics: shows absolute difference in percentage points (pp).
-    - The visual bar is capped at ±100 for consistency, but the true value is shown on the label.
-    - If abs(delta) >= 90, the label is shown inside the bar for visual clarity.
-
-    Parameters:
-    - metric (Metric): A Metric instance with `delta_pct`, `name`, and `is_rate_metric`.
+    Computes the values displayed by a delta bar chart (see `make_delta_bar_chart`): clamped bar length,
+    color (reversed for attrition metrics), label and its position.
 
     Returns:
-    - go.Figure: A Plotly horizontal bar chart centered at 0.
+        DeltaBarValues: Named tuple of the values.
     """
     current_val = format_metric_value(metric.value, metric.unit)
     prev_val = format_metric_value(metric.previous_value, metric.unit)
@@ -237,22 +265,51 @@ def make_delta_bar_chart(metric: Metric) -> go.Figure:
     # Bar color: blue if positive, orange if negative
     color = COLOR_POSITIVE if is_positive else COLOR_NEGATIVE
 
+    return DeltaBarValues(
+        delta_clamped=delta_clamped,
+        color=color,
+        label=label,
+        textposition='inside' if abs(delta) >= 90 else 'outside',
+        insidetextanchor='start' if delta >= 0 else 'end',
+        text_color='white' if abs(delta) >= 90 else 'black',
+        customdata=[prev_val, label]
+    )
+
+
+def make_delta_bar_chart(metric: MetricResult) -> go.Figure:
+    """
+    Generates a relative horizontal bar chart to visualize the difference between
+    the current and previous period of a metric.
+
+    - For standard metrics: shows relative % change.
+    - For rate metrics: shows absolute difference in percentage points (pp).
+    - The visual bar is capped at ±100 for consistency, but the true value is shown on the label.
+    - If abs(delta) >= 90, the label is shown inside the bar for visual clarity.
+
+    Parameters:
+    - metric (MetricResult): An evaluated metric with `delta_pct`, `previous_value`, and `is_rate_metric`.
+
+    Returns:
+    - go.Figure: A Plotly horizontal bar chart centered at 0.
+    """
+    bar = get_delta_bar_values(metric=metric)
+
     fig = go.Figure()
 
     # Main horizontal bar
     fig.add_trace(go.Bar(
-        x=[delta_clamped],
+        x=[bar.delta_clamped],
         y=[""],
         orientation='h',
-        marker_color=color,
-        text=[label],
-        textposition='inside' if abs(delta) >= 90 else 'outside',
-        insidetextanchor='start' if delta >= 0 else 'end',
-        textfont=dict(color='white' if abs(delta) >= 90 else 'black'),
+        marker_color=bar.color,
+        text=[bar.label],
+        textposition=bar.textposition,
+        insidetextanchor=bar.insidetextanchor,
+        textfont=dict(color=bar.text_color),
         cliponaxis=False,
         width=BAR_WIDTH,
         showlegend=False,
-        customdata=[[prev_val, label]],
+        customdata=[bar.customdata],
         hovertemplate=(
             "<b>Previous:</b> %{customdata[0]}<br>"
             "<b>Change:</b> %{customdata[1]}<extra></extra>"
@@ -288,6 +345,129 @@ def make_delta_bar_chart(metric: Metric) -> go.Figure:
     return fig
 
 
+def merge_values(element: dict, values: Optional[dict]) -> dict:
+    """Returns a copy of a figure element (trace, shape, annotation) with nested `values` merged into it."""
+    if not values:
+        return element
+
+    merged = dict(element)
+    for key, value in values.items():
+        if isinstance(value, dict) and isinstance(element.get(key), dict):
+            value = merge_values(element[key], value)
+        merged[key] = value
+    return merged
+
+
+def fill_template(
+        template: dict,
+        data: Optional[list] = None,
+        shapes: Optional[list] = None,
+        annotations: Optional[list] = None
+) -> dict:
+    """
+    Fills a figure template (see `FIGURE_TEMPLATES`) with the values of one chart, without any validation.
+
+    Values are given per trace, shape and annotation, in the order of the template (None keeps an element as is).
+    Only the modified elements are copied, the rest (e.g. the layout template) is shared between figures:
+    figures built this way must not be modified in place.
+
+    Args:
+        template (dict): Figure template, as returned by `go.Figure.to_plotly_json`.
+        data (list, optional): Values of each trace.
+        shapes (list, optional): Values of each layout shape.
+        annotations (list, optional): Values of each layout annotation.
+
+    Returns:
+        dict: The figure, ready to be passed to `dcc.Graph`.
+    """
+    layout = dict(template['layout'])
+    for key, values in (('shapes', shapes), ('annotations', annotations)):
+        if values is not None:
+            layout[key] = [
+                merge_values(element, element_values) for element, element_values in zip(layout[key], values)
+            ]
+
+    traces = template['data']
+    if data is not None:
+        traces = [merge_values(trace, trace_values) for trace, trace_values in zip(traces, data)]
+
+    return {'data': traces, 'layout': layout}
+
+
+# Metric panel figures validated once per chart kind, built with the `go.Figure` builders on placeholder values.
+# Panels are rendered from these templates (see `make_target_bar_figure` and `make_delta_bar_figure`), so Plotly
+# only validates properties at import, not on each of the ~20 charts of every panel request.
+FIGURE_TEMPLATES = {
+    'value_only': build_value_only_chart(value=0).to_plotly_json(),
+    'target_bar': make_target_bar_chart(metric_name='', value=1, pace=1, target=1).to_plotly_json(),
+    'delta_bar': make_delta_bar_chart(metric=MetricResult(
+        slug='', name='', unit='', value=1, previous_value=1, delta_pct=0, target=None, pace=None,
+        is_rate_metric=False, is_attrition_metric=False
+    )).to_plotly_json(),
+}
+
+# Without pace, the target bar chart only lacks the pace line (the first shape)
+FIGURE_TEMPLATES['target_bar_without_pace'] = fill_template(FIGURE_TEMPLATES['target_bar'])
+FIGURE_TEMPLATES['target_bar_without_pace']['layout']['shapes'] = FIGURE_TEMPLATES['target_bar']['layout']['shapes'][1:]
+
+
+def make_target_bar_figure(
+        metric_name,
+        value,
+        pace=None,
+        target=None,
+        unit="",
+        max_value=None,
+        is_attrition_metric: bool = False
+) -> dict:
+    """
+    Same chart as `make_target_bar_chart` (same parameters), filled in from its template as a plain figure dict.
+
+    Returns:
+    - dict: The bullet chart figure.
+    """
+    label = {'text': f"<b>{int(value):,}{unit}</b>"}
+    if not target:
+        return fill_template(FIGURE_TEMPLATES['value_only'], annotations=[label])
+
+    bar = get_target_bar_values(value=value, pace=pace, target=target, unit=unit, max_value=max_value,
+                                is_attrition_metric=is_attrition_metric)
+    lines = [{'x0': bar.target_x, 'x1': bar.target_x}, None]  # Target line and separator
+    if pace:
+        lines.insert(0, {'x0': bar.pace_x, 'x1': bar.pace_x})
+
+    return fill_template(
+        FIGURE_TEMPLATES['target_bar' if pace else 'target_bar_without_pace'],
+        data=[{'x': [bar.display_value], 'marker': {'color': bar.color}, 'customdata': [bar.customdata]}],
+        shapes=lines,
+        annotations=[{'text': bar.label_text, 'x': bar.label_x, 'y': metric_name,
+                      'font': {'color': bar.label_color}}]
+    )
+
+
+def make_delta_bar_figure(metric: MetricResult) -> dict:
+    """
+    Same chart as `make_delta_bar_chart`, filled in from its template as a plain figure dict.
+
+    Returns:
+    - dict: The delta bar chart figure.
+    """
+    bar = get_delta_bar_values(metric=metric)
+
+    return fill_template(
+        FIGURE_TEMPLATES['delta_bar'],
+        data=[{
+            'x': [bar.delta_clamped],
+            'marker': {'color': bar.color},
+            'text': [bar.label],
+            'textposition': bar.textposition,
+            'insidetextanchor': bar.insidetextanchor,
+            'textfont': {'color': bar.text_color},
+            'customdata': [bar.customdata],
+        }]
+    )
+
+
 @with_annotation
 def make_timeseries_chart(
         df: pd.DataFrame,
@@ -446,3 +626,36 @@ def make_breakdown_bar_chart(df: pd.DataFrame, metric: Metric, group_col) -> go.
     )
 
     return fig
+
+
+def get_breakdown_bar_values(df: pd.DataFrame, metric: Metric, group_col: str) -> BreakdownBarValues:
+    """
+    Values of the breakdown bar chart of a metric: categories (empty values removed) sorted by decreasing value,
+    with their values formatted with the metric's unit.
+
+    Args:
+        df (pd.DataFrame): Breakdown of the metric, with a 'value' column (see `Metric.build_breakdown_df`).
+        metric (Metric): Metric broken down (for its unit).
+        group_col (str): Column of the categories.
+
+    Returns:
+        BreakdownBarValues: The categories, values and formatted values.
+    """
+    df = df[df[group_col].notna()].sort_values('value', ascending=False)
+    values = df['value'].tolist()
+
+    return BreakdownBarValues(
+        labels=df[group_col].tolist(),
+        values=values,
+        texts=[format_metric_value(value, metric.unit) for value in values]
+    )
+
+
+# Breakdown bar chart on placeholder values: its first trace draws the top category, its second one the others.
+# The browser fills it in with the values of the selected metric and category (see `assets/script/clientside.js`)
+FIGURE_TEMPLATES['breakdown_bar'] = make_breakdown_bar_chart(
+    df=pd.DataFrame({'value': [2, 1], 'category': ['', ' ']}),
+    metric=MetricResult(slug='', name='', unit='', value=0, previous_value=None, delta_pct=None, target=None,
+                        pace=None, is_rate_metric=False, is_attrition_metric=False),
+    group_col='category'
+).to_plotly_json()
@@ -1,14 +1,16 @@
+import numpy as np
 import pandas as pd
 from collections import namedtuple
 from datetime import datetime, timedelta
 from typing import Optional, Union
-from utils.metrics_engine import Metric
+from utils.metrics_engine import Metric, CURRENT_PERIOD, PREVIOUS_PERIOD
 from utils.decorators import add_period
-from constants.time import MONTH_ORDER_FY, MONTH_ORDER_CY
+from constants.schema import FISCAL_YEAR_START_MONTH
 
 DateBounds = namedtuple('DateBounds', 'date_min, date_max')
 QuarterPeriod = namedtuple("QuarterPeriod", "year, quarter")
 QuarterSelection = namedtuple("QuarterSelection", "current, previous, same_quarter_last_year")
+PeriodBounds = namedtuple('PeriodBounds', 'start, stop')  # Half-open [start, stop) range of dates
 
 
 def get_year_bounds(year_mode: str, selected_year: int, include_previous: bool = True) -> DateBounds:
@@ -87,26 +89,93 @@ def get_comparison_quarters(selected_year: int, quarter_selected: int, year_mode
     )
 
 
-def add_quarter(df: pd.DataFrame, date_col: str, year_mode: str = "cy") -> pd.DataFrame:
+def get_quarter_start(year: int, quarter: int, year_mode: str) -> pd.Timestamp:
     """
-    Adds a 'quarter' column to the DataFrame based on either calendar or fiscal year logic.
+    Returns the first day of a quarter.
 
     Parameters:
-        df (pd.DataFrame): The input DataFrame
-        date_col (str): Name of the date column
-        year_mode (str): 'cy' for calendar year (default) or 'fy' for fiscal year (starting July 1)
+    - year (int): The calendar year in which the quarter starts (see `get_comparison_quarters`).
+    - quarter (int): The quarter (1 to 4).
+    - year_mode (str): Either "fy" (fiscal year, Q1 starts in July) or "cy" (calendar year).
 
     Returns:
-        pd.DataFrame: The DataFrame with an added 'quarter' column
+    - pd.Timestamp: Start date of the quarter.
     """
-    df = df.copy()
+    first_month = FISCAL_YEAR_START_MONTH if year_mode == 'fy' else 1
+    start_month = (first_month - 1 + 3 * (quarter - 1)) % 12 + 1
+    return pd.Timestamp(year, start_month, 1)
 
-    if year_mode == "fy":
-        df["quarter"] = ((df[date_col].dt.month - 7) % 12) // 3 + 1
-    else:  # default to calendar quarter
-        df["quarter"] = df[date_col].dt.quarter
 
-    return df
+def slice_dates(df: pd.DataFrame, date_min: datetime, date_max: datetime, inclusive: str = 'both') -> pd.DataFrame:
+    """
+    Slices a DataFrame sorted by 'date' between two dates using binary search.
+
+    The dataset is kept sorted by date at load time (and every slice of it stays sorted), so any
+    year, quarter or comparison window is located in O(log n) and returned as a positional slice,
+    without scanning the whole column.
+
+    Parameters:
+    - df (pd.DataFrame): The dataset to slice, sorted by its 'date' column.
+    - date_min (datetime): Lower bound (inclusive).
+    - date_max (datetime): Upper bound, inclusive if `inclusive` is 'both', exclusive if 'left'.
+    - inclusive (str): Either 'both' (default) or 'left'.
+
+    Returns:
+    - pd.DataFrame: The rows within the bounds (a slice of the input, to be treated as read-only).
+    """
+    dates = df['date'].to_numpy()
+    start = dates.searchsorted(np.datetime64(date_min), side='left')
+    stop = dates.searchsorted(np.datetime64(date_max), side='right' if inclusive == 'both' else 'left')
+    return df.iloc[start:stop]
+
+
+def select_comparison_periods(df: pd.DataFrame, year_mode: str, selected_year: int, quarter_selected: str) -> pd.DataFrame:
+    """
+    Filters the main payments + pledges dataset to the rows needed by a selection of year mode, year,
+    and optionally a specific quarter.
+
+    The logic handles:
+        - Applying fiscal or calendar year bounds (FY vs CY), including the previous year
+        - Optional quarter selection, which also includes:
+            - Current quarter
+            - Previous quarter (adjusted for rollover to previous year)
+            - Same quarter of previous year
+
+    Args:
+        df (pd.DataFrame): The full dataset.
+        year_mode (str): Either 'fy' or 'cy'.
+        selected_year (int): Year selected by the user (e.g. 2025).
+        quarter_selected (str): Quarter filter (e.g. '1', '2', ..., or 'all').
+
+    Returns:
+        pd.DataFrame: The filtered dataset.
+    """
+    # Get full date bounds for the selected year and mode (FY or CY)
+    date_bounds = get_year_bounds(year_mode=year_mode, selected_year=selected_year, include_previous=True)
+
+    # Slice rows within the selected year date range
+    df_date_filtered = slice_dates(df=df, date_min=date_bounds.date_min, date_max=date_bounds.date_max)
+
+    # If a specific quarter is selected, filter further to 3 quarters:
+    # - Current quarter
+    # - Previous quarter (adjusted across years if needed)
+    # - Same quarter last year
+    if quarter_selected != 'all':
+        qs = get_comparison_quarters(year_mode=year_mode, selected_year=selected_year,
+                                     quarter_selected=int(quarter_selected))
+
+        # Concatenate the quarter slices chronologically, so the result stays sorted by date
+        quarter_starts = sorted(
+            get_quarter_start(year=q.year, quarter=q.quarter, year_mode=year_mode)
+            for q in (qs.current, qs.previous, qs.same_quarter_last_year)
+        )
+        df_date_filtered = pd.concat([
+            slice_dates(df=df_date_filtered, date_min=start, date_max=start + pd.DateOffset(months=3),
+                        inclusive='left')
+            for start in quarter_starts
+        ])
+
+    return df_date_filtered
 
 
 @add_period
@@ -116,23 +185,23 @@ def filter_to_period(
         quarter: Optional[str] = None,
 ) -> pd.DataFrame:
     """
-    Filters the DataFrame to the selected time range and optionally a specific quarter.
+    Filters the DataFrame (sorted by date) to the selected time range and optionally a specific quarter.
 
     Parameters:
     - df (pd.DataFrame): The dataset to filter.
-    - date_bounds (namedtuple): NamedTuple with 'date_min' and 'date_max' datetime boundaries.
+    - date_bounds (namedtuple): NamedTuple with 'date_min' and 'date_max' datetime boundaries of a year (CY or FY).
     - quarter (str, optional): Quarter number as string (e.g., '1', '2', '3', '4') or 'all' (default is None).
+      Quarters are counted from 'date_min', so they follow the year mode of the bounds.
 
     Returns:
     - pd.DataFrame: The filtered DataFrame.
     """
-    df_filtered = df.query("date >= @date_bounds.date_min and date <= @date_bounds.date_max")
-
     if quarter and quarter != 'all':
-        q_n = int(quarter)
-        df_filtered = df_filtered.query("quarter == @q_n")
+        quarter_start = pd.Timestamp(date_bounds.date_min) + pd.DateOffset(months=3 * (int(quarter) - 1))
+        return slice_dates(df=df, date_min=quarter_start, date_max=quarter_start + pd.DateOffset(months=3),
+                           inclusive='left')
 
-    return df_filtered
+    return slice_dates(df=df, date_min=date_bounds.date_min, date_max=date_bounds.date_max)
 
 
 @add_period
@@ -140,19 +209,83 @@ def filter_to_specific_quarter(
     df: pd.DataFrame,
     year: int,
     quarter: int,
+    year_mode: str = 'cy',
 ) -> pd.DataFrame:
     """
-    Filters the DataFrame to a specific quarter only.
+    Filters the DataFrame (sorted by date) to a specific quarter only.
 
     Parameters:
     - df (pd.DataFrame): The dataset to filter.
-    - year (int): The year to filter on.
+    - year (int): The calendar year in which the quarter starts.
     - quarter (int): The quarter to filter on.
+    - year_mode (str): 'cy' (default) or 'fy', defines where quarters start.
 
     Returns:
     - pd.DataFrame: Filtered DataFrame for the specified year and quarter.
     """
-    return df.query("year == @year and quarter == @quarter")
+    quarter_start = get_quarter_start(year=year, quarter=quarter, year_mode=year_mode)
+    return slice_dates(df=df, date_min=quarter_start, date_max=quarter_start + pd.DateOffset(months=3),
+                       inclusive='left')
+
+
+def get_comparison_period_bounds(
+        selected_year: int,
+        year_mode: str,
+        quarter_selected: str
+) -> dict[str, PeriodBounds]:
+    """
+    Returns the bounds of the two periods compared in the metric panels:
+    the current period (year or quarter) and the previous one (year - 1, or quarter - 1 / Q4 of previous year).
+
+    Bounds identify a period independently of the selection it is displayed in (e.g. FY2024 is both the
+    current period of FY2024 and the previous period of FY2025), which is what metric values are memoized on.
+
+    Args:
+        selected_year (int): Year selected by the user (e.g., 2025).
+        year_mode (str): Either 'fy' or 'cy'.
+        quarter_selected (str): 'all' for full year, or '1'–'4' for specific quarter.
+
+    Returns:
+        dict[str, PeriodBounds]: Half-open bounds of the CURRENT_PERIOD and PREVIOUS_PERIOD.
+    """
+    if quarter_selected == 'all':
+        current, previous = (
+            get_year_bounds(year_mode=year_mode, selected_year=year, include_previous=False)
+            for year in (selected_year, selected_year - 1)
+        )
+        return {
+            CURRENT_PERIOD: PeriodBounds(start=pd.Timestamp(current.date_min),
+                                         stop=pd.Timestamp(current.date_max) + pd.Timedelta(days=1)),
+            PREVIOUS_PERIOD: PeriodBounds(start=pd.Timestamp(previous.date_min),
+                                          stop=pd.Timestamp(previous.date_max) + pd.Timedelta(days=1)),
+        }
+
+    quarter = get_comparison_quarters(
+        selected_year=selected_year, quarter_selected=int(quarter_selected), year_mode=year_mode)
+    starts = {
+        CURRENT_PERIOD: get_quarter_start(year=quarter.current.year, quarter=quarter.current.quarter,
+                                          year_mode=year_mode),
+        PREVIOUS_PERIOD: get_quarter_start(year=quarter.previous.year, quarter=quarter.previous.quarter,
+                                           year_mode=year_mode),
+    }
+    return {label: PeriodBounds(start=start, stop=start + pd.DateOffset(months=3)) for label, start in starts.items()}
+
+
+def filter_to_comparison_periods(df: pd.DataFrame, period_bounds: dict[str, PeriodBounds]) -> dict[str, pd.DataFrame]:
+    """
+    Splits a selection into the periods compared in the metric panels.
+
+    Args:
+        df (pd.DataFrame): Dataset (or cube, or distinct-count index) slice of the selection, sorted by date.
+        period_bounds (dict[str, PeriodBounds]): Bounds of each period (see `get_comparison_period_bounds`).
+
+    Returns:
+        dict[str, pd.DataFrame]: Data of each period, keyed like `period_bounds`.
+    """
+    return {
+        label: slice_dates(df=df, date_min=bounds.start, date_max=bounds.stop, inclusive='left')
+        for label, bounds in period_bounds.items()
+    }
 
 
 def find_metric_by_slug(slug: str, metrics: list) -> Optional[Metric]:
@@ -223,18 +356,21 @@ def get_combined_comparison_df(
                 df=df,
                 year=quarters.same_quarter_last_year.year,
                 quarter=quarters.same_quarter_last_year.quarter,
+                year_mode=year_mode,
                 period_value='Same Quarter Last Year'
             ),
             "Previous Quarter": filter_to_specific_quarter(
                 df=df,
                 year=quarters.previous.year,
                 quarter=quarters.previous.quarter,
+                year_mode=year_mode,
                 period_value='Previous Quarter'
             ),
             "Current Quarter": filter_to_specific_quarter(
                 df=df,
                 year=quarters.current.year,
                 quarter=quarters.current.quarter,
+                year_mode=year_mode,
                 period_value='Current Quarter'
             ),
         }
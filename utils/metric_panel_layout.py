@@ -1,17 +1,23 @@
 import dash_mantine_components as dmc
-import pandas as pd
 from dash import dcc, html
-from typing import Optional
+from typing import Optional, Union
 from plotly.graph_objs import Figure
 from dash_iconify import DashIconify
 
-from utils.metrics_engine import Metric
-from utils.figures import make_target_bar_chart, make_delta_bar_chart
+from utils.metrics_engine import MetricResult
+from utils.figures import (
+    make_target_bar_figure, make_delta_bar_figure, get_target_bar_values, get_delta_bar_values
+)
 
-from constants.charts import FIG_CONFIG, HEIGHT_METRIC_BAR_CHART
+from constants.charts import FIG_CONFIG, HEIGHT_METRIC_BAR_CHART, BAR_WIDTH, BAR_CORNER_RADIUS
 from constants.colors import TITLE_COLOR
+from constants.settings import PANEL_RENDERER
 from constants.ui import NO_ENOUGH_DATA_LAYOUT
 
+# Axis ranges of the target and delta bar charts, mapped to the width of their HTML cells
+TARGET_BAR_RANGE = (0, 1.1)
+DELTA_BAR_RANGE = (-110, 110)
+
 
 def make_color_legend(label: str, color: str) -> html.Div:
     return dmc.Group(
@@ -127,9 +133,9 @@ def add_header_to_panel(
 
 def add_row_to_metric_panel(
         metric_panel_layout: list,
-        metric: Metric,
-        fig_target: Optional[Figure] = None,
-        fig_delta: Optional[Figure] = None
+        metric: MetricResult,
+        fig_target: Optional[Union[Figure, dict, html.Div]] = None,
+        fig_delta: Optional[Union[Figure, dict, html.Div]] = None
 ) -> None:
     metric_panel_layout.append(
         html.Div(
@@ -156,85 +162,176 @@ def add_metric_name_to_cell(metric_name: str) -> dmc.GridCol:
     return dmc.GridCol(dmc.Text(metric_name, ta='center', size='sm'), span=1.8)
 
 
-def add_target_chart_to_cell(fig_target: Optional[Figure] = None) -> dmc.GridCol:
+def make_chart(chart: Optional[Union[Figure, dict, html.Div]], width: str) -> Union[dcc.Graph, html.Div, dmc.Text]:
+    """Wraps a figure in a graph component (HTML charts are used as is), or returns the placeholder if missing."""
+    if chart is None:
+        return NO_ENOUGH_DATA_LAYOUT
+    if isinstance(chart, (Figure, dict)):
+        return dcc.Graph(
+            figure=chart,
+            config=FIG_CONFIG,
+            style={"height": HEIGHT_METRIC_BAR_CHART, "width": width},
+            responsive=True
+        )
+    return chart
+
+
+def add_target_chart_to_cell(fig_target: Optional[Union[Figure, dict, html.Div]] = None) -> dmc.GridCol:
     return dmc.GridCol(
         [
-            dcc.Graph(
-                figure=fig_target,
-                config=FIG_CONFIG,
-                style={"height": HEIGHT_METRIC_BAR_CHART, "width": "98%"},
-                responsive=True
-            ) if fig_target else NO_ENOUGH_DATA_LAYOUT
+            make_chart(chart=fig_target, width="98%")
         ],
         offset=0.1,
         span=6.1
     )
 
 
-def add_delta_bar_chart_to_cell(fig_delta: Optional[Figure] = None) -> dmc.GridCol:
+def add_delta_bar_chart_to_cell(fig_delta: Optional[Union[Figure, dict, html.Div]] = None) -> dmc.GridCol:
     return dmc.GridCol(
         [
-            dcc.Graph(
-                figure=fig_delta,
-                config=FIG_CONFIG,
-                style={"height": HEIGHT_METRIC_BAR_CHART, "width": '90%'},
-                responsive=True
-            ) if fig_delta else NO_ENOUGH_DATA_LAYOUT
+            make_chart(chart=fig_delta, width='90%')
         ],
         span=4
     )
 
 
+def to_percent(x: float, axis_range: tuple) -> str:
+    """Converts an x coordinate of a chart to a CSS position, in % of the width of its cell."""
+    return f'{(x - axis_range[0]) / (axis_range[1] - axis_range[0]) * 100:.2f}%'
+
+
+def make_html_bar_chart(children: list, width: str, title: Optional[str] = None) -> html.Div:
+    """
+    Draws a bar chart of the metric panel with HTML elements, styled by the `metric-bar` classes of
+    assets/style.css (only positions, sizes and colors are set inline).
+    """
+    return html.Div(
+        [*children, html.Div(className='metric-bar-separator')],
+        className='metric-bar',
+        title=title,
+        style={'height': HEIGHT_METRIC_BAR_CHART, 'width': width}
+    )
+
+
+def make_bar(left: str, width: str, color: str) -> html.Div:
+    return html.Div(
+        className='metric-bar-fill',
+        style={'left': left, 'width': width, 'height': f'{BAR_WIDTH:.0%}', 'backgroundColor': color,
+               'borderRadius': BAR_CORNER_RADIUS}
+    )
+
+
+def make_target_bar_html(
+        value: float,
+        pace: Optional[float] = None,
+        target: Optional[float] = None,
+        unit: str = "",
+        is_attrition_metric: bool = False
+) -> html.Div:
+    """
+    HTML version of the target bar chart (see `utils.figures.make_target_bar_chart`): value bar colored
+    by performance status, pace and target lines, and value label (pace and target are shown on hover).
+    """
+    label = f'{int(value):,}{unit}'
+    if not target:
+        return make_html_bar_chart([html.B(label, className='metric-bar-value')], width='98%')
+
+    bar = get_target_bar_values(value=value, pace=pace, target=target, unit=unit,
+                                is_attrition_metric=is_attrition_metric)
+
+    children = [make_bar(left='0%', width=to_percent(bar.display_value, TARGET_BAR_RANGE), color=bar.color)]
+    if pace:
+        children.append(html.Div(className='metric-bar-pace', style={'left': to_percent(bar.pace_x, TARGET_BAR_RANGE)}))
+    children.append(html.Div(className='metric-bar-target', style={'left': to_percent(bar.target_x, TARGET_BAR_RANGE)}))
+    children.append(html.B(
+        label,
+        className='metric-bar-label',
+        style={'left': to_percent(bar.label_x, TARGET_BAR_RANGE), 'color': bar.label_color}
+    ))
+
+    return make_html_bar_chart(children, width='98%', title=f'Pace: {bar.customdata[0]}\nTarget: {bar.customdata[1]}')
+
+
+def make_delta_bar_html(metric: MetricResult) -> html.Div:
+    """
+    HTML version of the delta bar chart (see `utils.figures.make_delta_bar_chart`): bar centered at 0,
+    capped at ±100, with its label inside or outside the bar (previous value and change are shown on hover).
+    """
+    bar = get_delta_bar_values(metric=metric)
+
+    start, end = sorted((0, bar.delta_clamped))
+    tip = to_percent(bar.delta_clamped, DELTA_BAR_RANGE)
+    center = to_percent(0, DELTA_BAR_RANGE)
+
+    # Label anchored to the tip of the bar (outside), or inside the bar at its base (positive) or tip (negative)
+    if bar.textposition == 'inside':
+        label_position = {'left': f'calc({center if metric.delta_pct >= 0 else tip} + 4px)'}
+    elif metric.delta_pct >= 0:
+        label_position = {'left': f'calc({tip} + 4px)'}
+    else:
+        label_position = {'right': f'calc(100% - {tip} + 4px)'}
+
+    children = [
+        make_bar(
+            left=to_percent(start, DELTA_BAR_RANGE),
+            width=f'{(end - start) / (DELTA_BAR_RANGE[1] - DELTA_BAR_RANGE[0]) * 100:.2f}%',
+            color=bar.color
+        ),
+        html.Div(className='metric-bar-pace', style={'left': center}),
+        html.Span(bar.label, className='metric-bar-label', style={**label_position, 'color': bar.text_color}),
+    ]
+
+    return make_html_bar_chart(children, width='90%', title=f'Previous: {bar.customdata[0]}\nChange: {bar.label}')
+
+
 def create_metrics_panel(
-        metrics: list,
-        df_current: pd.DataFrame,
-        df_previous: pd.DataFrame,
-        targets_data: dict,
-        year_selected: int,
-        year_mode: str,
-        quarter_selected: str,
+        metric_results: list,
         metric_layout: list,
-        today_override: Optional[pd.Timestamp] = None
+        renderer: str = PANEL_RENDERER
 ):
+    """
+    Appends one row per metric (name, target chart and delta chart) to a metric panel layout.
 
-    for metric in metrics:
-        # Compute target and pace for a metric
-        metric.compute(df_current)
-        metric.set_target(
-            target_data=targets_data,
-            year_selected=str(year_selected),
-            year_mode=year_mode,
-            quarter_selected=quarter_selected
-        )
-        metric.set_pace(
-            year_selected=year_selected,
-            year_mode=year_mode,
-            quarter_selected=quarter_selected,
-            today_override=today_override
-        )
+    Args:
+        metric_results (list): Evaluated metrics (see `utils.metrics_engine.evaluate_metrics`).
+        metric_layout (list): Layout of the panel, extended in place.
+        renderer (str): 'graph' to draw the charts with Plotly, or 'html' to draw them with HTML/CSS.
+    """
+    if renderer == 'html':
+        for result in metric_results:
+            add_row_to_metric_panel(
+                metric_panel_layout=metric_layout,
+                metric=result,
+                fig_target=make_target_bar_html(
+                    value=result.value,
+                    pace=result.pace,
+                    target=result.target,
+                    unit=result.unit,
+                    is_attrition_metric=result.is_attrition_metric
+                ) if result.value else None,
+                fig_delta=make_delta_bar_html(metric=result) if result.delta_pct is not None else None
+            )
+        return
 
-        # Compute difference with previous year or previous quarter
-        metric.set_previous(df=df_previous)
-        metric.compute_percentage_difference()
-
-        # Create target bar chart with target value and pace value
-        fig_target = make_target_bar_chart(
-            metric_name=metric.name,
-            value=metric.value,
-            pace=metric.pace,
-            target=metric.target,
-            unit=metric.unit,
-            is_attrition_metric=metric.is_attrition_metric
-            # max_value=metric.value if not metric.target else None
-        ) if metric.value else None
+    for result in metric_results:
+        # Create target bar chart with target value and pace value (filled in from a template, see `FIGURE_TEMPLATES`)
+        fig_target = make_target_bar_figure(
+            metric_name=result.name,
+            value=result.value,
+            pace=result.pace,
+            target=result.target,
+            unit=result.unit,
+            is_attrition_metric=result.is_attrition_metric
+            # max_value=result.value if not result.target else None
+        ) if result.value else None
 
         # Create delta bar chart to see the difference in % with previous year or previous quarter
-        fig_delta = make_delta_bar_chart(metric=metric) if metric.delta_pct is not None else None
+        fig_delta = make_delta_bar_figure(metric=result) if result.delta_pct is not None else None
 
         # Create the complete row containing metric name, target chart and delta chart
         add_row_to_metric_panel(
             metric_panel_layout=metric_layout,
-            metric=metric,
+            metric=result,
             fig_target=fig_target,
             fig_delta=fig_delta
         )
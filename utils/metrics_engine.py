@@ -1,8 +1,69 @@
+import numpy as np
 import pandas as pd
+from collections import namedtuple
 
-from constants.time import FREQ_MULTIPLIER
+from utils.cache import FrameCache, LRUCache
 from utils.mixins import TimeSeriesMixin
-from typing import List, Optional
+from constants.schema import DISTINCT_INDEX_VALUES
+from constants.settings import METRIC_MEMO_SIZE
+from typing import Callable, List, Optional
+
+# Values derived from the frames being evaluated (shared across metrics within a request)
+frame_cache = FrameCache()
+
+# Values of the metrics per (slug, period bounds, data version), shared across selections and requests.
+# Entries of a previous data version are never hit again and get evicted as new ones are stored.
+period_values = LRUCache(maxsize=METRIC_MEMO_SIZE)
+MISSING = object()
+
+# Immutable result of a metric evaluated for a selection (current vs previous period, target and pace).
+# Being a (slots-based) tuple, it can be shared across threads and requests without being mutated.
+MetricResult = namedtuple(
+    'MetricResult',
+    'slug, name, unit, value, previous_value, delta_pct, target, pace, is_rate_metric, is_attrition_metric'
+)
+
+# Labels of the periods compared in the metric panels (see `label_periods` and `evaluate_metrics`)
+CURRENT_PERIOD = 'current'
+PREVIOUS_PERIOD = 'previous'
+
+
+class CategoryFilter:
+    """
+    Predicate `column in values` (or `column not in values` when negated), compiled once at metric construction.
+
+    On categorical columns, the predicate is evaluated through a lookup table over the categories indexed by
+    the integer codes, instead of comparing labels row by row (or parsing a `DataFrame.query` expression).
+    Masks are memoized per frame, so every metric filtering on the same statuses in a request shares
+    the same boolean array. Missing values never match (so they are kept by a negated filter).
+    """
+
+    def __init__(self, column: str, values: List[str], negate: bool = False):
+        self.column: str = column
+        self.values: frozenset = frozenset(values)
+        self.negate: bool = negate
+        self.key: tuple = ('category_filter', column, self.values, negate)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}: {self.column} {'not in' if self.negate else 'in'} {sorted(self.values)}>"
+
+    def mask(self, df: pd.DataFrame) -> np.ndarray:
+        """Returns the (memoized) boolean mask of the rows of `df` matching the predicate."""
+        return frame_cache.get_or_compute(df, self.key, lambda: self.evaluate(df[self.column]))
+
+    def evaluate(self, values: pd.Series) -> np.ndarray:
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # One entry per category, plus a last one (False) looked up by the code -1 of missing values
+            lookup = np.append(values.cat.categories.isin(self.values), False)
+            matching = lookup[values.cat.codes.to_numpy()]
+        else:
+            matching = values.isin(self.values).to_numpy()
+        return ~matching if self.negate else matching
+
+
+# Rows kept by attrition rates, and recurring payments (ARR)
+NOT_ERROR_FILTER = CategoryFilter('pledge_status', ['ERROR'], negate=True)
+RECURRING_FILTER = CategoryFilter('recurring_flag', ['Recurring'])
 
 
 class Metric:
@@ -10,6 +71,10 @@ class Metric:
     Abstract base class for all metrics.
     Each metric has a name, unit, and value (computed dynamically).
     Optionally, it can have a target and a pace value for comparison.
+
+    Metric instances only hold their configuration and are shared module-level singletons:
+    evaluation is pure and returns an immutable `MetricResult`, so concurrent requests
+    never see each other's values.
     """
 
     def __init__(self, name: str, slug: str, unit: str = ""):
@@ -18,66 +83,76 @@ class Metric:
         self.unit: str = unit
         self.is_rate_metric: Optional[bool] = None
         self.is_attrition_metric: Optional[bool] = None
-        self.value: Optional[float] = None
-        self.previous_value: Optional[float] = None
-        self.delta_pct: Optional[float] = None
-        self.target: Optional[float] = None
-        self.pace: Optional[float] = None
+        self.source: str = 'payments'  # Table the metric is computed on ('payments', 'cube' or 'donor_index')
 
     def __repr__(self):
         return f"<{self.__class__.__name__}: {self.name} | slug='{self.slug}'>"
 
-    def compute(self, df: pd.DataFrame):
-        raise NotImplementedError("Subclasses must implement 'compute'")
-
     def compute_on(self, df: pd.DataFrame):
         raise NotImplementedError("Subclasses must implement 'compute_on'")
 
-    def set_target(self, target_data: dict, year_selected: str, year_mode: str, quarter_selected: str):
+    def compute_by_period(self, df_periods: pd.DataFrame) -> pd.Series:
+        """
+        Computes the value of the metric for every period of a frame labeled by `label_periods`.
+        Subclasses override it with a single grouped pass sharing intermediate results across metrics;
+        this fallback evaluates `compute_on` on each period.
         """
-        Sets the target value based on year mode and optionally quarter.
+        return pd.Series({
+            period: self.compute_on(df_period)
+            for period, df_period in df_periods.groupby('period', observed=False)
+        })
+
+    def get_target(
+            self,
+            target_data: dict,
+            year_selected: str,
+            year_mode: str,
+            quarter_selected: str
+    ) -> Optional[float]:
+        """
+        Returns the target value based on year mode and optionally quarter.
         Expects a dictionary like the loaded JSON structure.
         """
         key = self.name.lower().replace(" ", "_")
         target_data_of_year = target_data.get(year_selected)
 
         if not target_data_of_year or key not in target_data_of_year:
-            self.target = None
-            return
+            return None
 
         data = target_data_of_year[key]
         target_annual = data.get("target_annual")
 
         if quarter_selected == 'all':
-            self.target = target_annual
-        else:
-            proportion_key = "quarter_proportion_fiscal" if year_mode == "fy" else "quarter_proportion_civil"
-            proportion_dict = data.get(proportion_key, {})
-            proportion = proportion_dict.get(quarter_selected)
+            return target_annual
 
-            self.target = round(target_annual * proportion / 100, 2) if proportion else None
+        proportion_key = "quarter_proportion_fiscal" if year_mode == "fy" else "quarter_proportion_civil"
+        proportion_dict = data.get(proportion_key, {})
+        proportion = proportion_dict.get(quarter_selected)
 
-    def set_pace(
-            self,
+        return round(target_annual * proportion / 100, 2) if proportion else None
+
+    @staticmethod
+    def get_pace(
+            target: Optional[float],
             year_selected: int,
             year_mode: str,
             quarter_selected: str = 'all',
             today_override: pd.Timestamp = None
-    ) -> None:
+    ) -> Optional[float]:
         """
         Computes the expected pace linearly based on elapsed time
         within the selected period (full year or specific quarter),
         adjusted for fiscal or calendar year mode.
 
         Parameters:
+        - target (float, optional): The target of the period (no pace without target).
         - year_selected (int): The reference year (e.g., 2025).
         - year_mode (str): Either 'fy' (fiscal year) or 'cy' (calendar year).
         - quarter_selected (str): Either 'all' or '1'-'4' to select a specific quarter.
         - today_override (pd.Timestamp, optional): Use this as "today" instead of the real date (for frozen datasets).
         """
-        if not self.target:
-            self.pace = None
-            return
+        if not target:
+            return None
 
         # Determine "today" from override or real time
         today = today_override or pd.Timestamp.today()
@@ -119,63 +194,131 @@ class Metric:
 
         if days_elapsed <= 0 or total_days <= 0:
             # print(f'> days elapsed={days_elapsed}, total_days={total_days}')
-            self.pace = None
-            return
+            return None
 
         progress_ratio = min(days_elapsed / total_days, 1.0)
-        self.pace = round(self.target * progress_ratio, 2)
+        return round(target * progress_ratio, 2)
 
-    def set_previous(self, df: pd.DataFrame):
-        """
-        Sets the previous value (n-1) for the metric using the provided dataframe.
-        """
-        self.previous_value = self.compute_on(df)
-
-    def compute_percentage_difference(self) -> None:
+    def get_delta_pct(self, value: float, previous_value: Optional[float]) -> Optional[float]:
         """
         Computes the difference between current and previous value.
         - For rate metrics: returns delta in percentage points (pp).
         - For standard metrics: returns delta in relative percent change.
         """
 
-        if not self.previous_value:
-            self.delta_pct = None
-            return
+        if not previous_value:
+            return None
 
         if self.is_rate_metric:
             # Difference in absolute terms (e.g., 18% - 15% = 3pp)
-            self.delta_pct = round(self.value - self.previous_value, 1)
-        else:
-            # Standard percent change
-            self.delta_pct = round(((self.value - self.previous_value) / self.previous_value) * 100, 1)
+            return round(value - previous_value, 1)
+
+        # Standard percent change
+        return round(((value - previous_value) / previous_value) * 100, 1)
+
+    def build_result(
+            self,
+            value: float,
+            previous_value: Optional[float],
+            targets_data: dict,
+            year_selected: int,
+            year_mode: str,
+            quarter_selected: str,
+            today_override: Optional[pd.Timestamp] = None
+    ) -> MetricResult:
+        """
+        Builds the immutable result of the metric from its current and previous values,
+        resolving the target, pace and delta for the selection.
+        """
+        target = self.get_target(
+            target_data=targets_data,
+            year_selected=str(year_selected),
+            year_mode=year_mode,
+            quarter_selected=quarter_selected
+        )
+        pace = self.get_pace(
+            target=target,
+            year_selected=year_selected,
+            year_mode=year_mode,
+            quarter_selected=quarter_selected,
+            today_override=today_override
+        )
+
+        return MetricResult(
+            slug=self.slug,
+            name=self.name,
+            unit=self.unit,
+            value=value,
+            previous_value=previous_value,
+            delta_pct=self.get_delta_pct(value=value, previous_value=previous_value),
+            target=target,
+            pace=pace,
+            is_rate_metric=self.is_rate_metric,
+            is_attrition_metric=self.is_attrition_metric
+        )
+
+    def evaluate(
+            self,
+            df_current: pd.DataFrame,
+            df_previous: pd.DataFrame,
+            targets_data: dict,
+            year_selected: int,
+            year_mode: str,
+            quarter_selected: str,
+            today_override: Optional[pd.Timestamp] = None
+    ) -> MetricResult:
+        """
+        Evaluates the metric for a selection without modifying the metric object.
+
+        Parameters:
+        - df_current (pd.DataFrame): Data of the current period.
+        - df_previous (pd.DataFrame): Data of the comparison period (previous year or previous quarter).
+        - targets_data (dict): Loaded targets JSON.
+        - year_selected (int): The reference year (e.g., 2025).
+        - year_mode (str): Either 'fy' (fiscal year) or 'cy' (calendar year).
+        - quarter_selected (str): Either 'all' or '1'-'4'.
+        - today_override (pd.Timestamp, optional): Use this as "today" instead of the real date.
+
+        Returns:
+        - MetricResult: Value, previous value, delta, target and pace of the metric.
+        """
+        return self.build_result(
+            value=self.compute_on(df_current),
+            previous_value=self.compute_on(df_previous),
+            targets_data=targets_data,
+            year_selected=year_selected,
+            year_mode=year_mode,
+            quarter_selected=quarter_selected,
+            today_override=today_override
+        )
 
 
 class AmountMetric(TimeSeriesMixin, Metric):
     """
     Computes the sum of amount_usd, optionally weighted by counterfactuality.
 
-    - Use `compute(df)` to update the internal value.
-    - Use `compute_on(df)` to get the result without modifying the metric object.
+    - Use `compute_on(df)` to get the value for a given period.
     """
 
     def __init__(self, name: str, slug: str, unit: str = "$", use_counterfactual: bool = False):
         super().__init__(name, slug, unit)
         self.use_counterfactual = use_counterfactual
-
-    def compute(self, df: pd.DataFrame):
-        """Updates the internal value attribute based on the input DataFrame."""
-        self.value = self.compute_on(df=df)
+        self.source = 'cube'  # Sums are additive: served by the pre-aggregated cube
 
     def compute_on(self, df: pd.DataFrame) -> float:
         """Computes the value without modifying the object (stateless)."""
-        if self.use_counterfactual:
-            return (df['amount_usd'] * df['counterfactuality']).sum()
-        return df['amount_usd'].sum()
+        return self.get_value_series(df).sum()
+
+    def compute_by_period(self, df_periods: pd.DataFrame) -> pd.Series:
+        """Reads the value of each period from the amount sums shared by all amount metrics."""
+        return get_amount_sums_by_period(df_periods)[self.get_value_column()]
+
+    def get_value_column(self) -> str:
+        return 'amount_counterfactual' if self.use_counterfactual else 'amount_usd'
 
     def get_value_series(self, df: pd.DataFrame) -> pd.Series:
-        if self.use_counterfactual:
-            return df['amount_usd'] * df['counterfactuality']
-        return df['amount_usd']
+        # Amounts may be stored as float32 (compact schema): accumulate in float64
+        return df[self.get_value_column()].astype('float64')
 
 
 class CountMetric(TimeSeriesMixin, Metric):
@@ -183,7 +326,6 @@ class CountMetric(TimeSeriesMixin, Metric):
     Counts unique values in a given column after filtering pledge_status.
     Supports time series and index chart rendering via TimeSeriesMixin.
 
-    - Use `compute(df)` to update internal state.
     - Use `compute_on(df)` for stateless value computation.
     """
 
@@ -191,13 +333,21 @@ class CountMetric(TimeSeriesMixin, Metric):
         super().__init__(name, slug, unit)
         self.target_col = target_col
         self.status_to_filter = status_to_filter
-
-    def compute(self, df: pd.DataFrame):
-        self.value = self.compute_on(df=df)
+        self.status_filter = CategoryFilter('pledge_status', status_to_filter)
+        if target_col in DISTINCT_INDEX_VALUES:
+            self.source = 'donor_index'  # Exact distinct counts from the index, without scanning payments
 
     def compute_on(self, df: pd.DataFrame) -> int:
-        df_filtered = df.query("pledge_status in @self.status_to_filter")
-        return df_filtered[self.target_col].nunique()
+        return df.loc[self.status_filter.mask(df), self.target_col].nunique()
+
+    def compute_by_period(self, df_periods: pd.DataFrame) -> pd.Series:
+        """Counts unique values per period (one nunique per status set, shared by metrics using the same one)."""
+        def compute() -> pd.Series:
+            df_filtered = df_periods.loc[self.status_filter.mask(df_periods), ['period', self.target_col]]
+            return df_filtered.groupby('period', observed=False)[self.target_col].nunique()
+
+        key = ('distinct_count', self.target_col, self.status_filter.key)
+        return frame_cache.get_or_compute(df_periods, key, compute)
 
     def aggregate_value(self, df: pd.DataFrame, group_cols: list) -> pd.DataFrame:
         """
@@ -216,10 +366,10 @@ class CountMetric(TimeSeriesMixin, Metric):
         Returns:
             pd.DataFrame: Aggregated result with one row per group and a 'value' column.
         """
-        df_filtered = df.query("pledge_status in @self.status_to_filter")
+        df_filtered = df.loc[self.status_filter.mask(df), [*group_cols, self.target_col]]
         df_filtered = df_filtered[df_filtered[self.target_col].notna()]  # Exclude null IDs
 
-        return df_filtered.groupby(group_cols)[self.target_col].nunique().reset_index(name='value')
+        return df_filtered.groupby(group_cols, observed=True)[self.target_col].nunique().reset_index(name='value')
 
 
 class RateMetric(TimeSeriesMixin, Metric):
@@ -242,21 +392,37 @@ class RateMetric(TimeSeriesMixin, Metric):
     ):
         super().__init__(name, slug, unit)
         self.status_to_filter = status_to_filter
+        self.status_filter = CategoryFilter('pledge_status', status_to_filter)
         self.is_attrition_metric = is_attrition_metric
         self.is_rate_metric = True
 
-    def compute(self, df: pd.DataFrame):
-        self.value = self.compute_on(df=df)
+    def get_masks(self, df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the masks of the rows counted in the rate (all rows, or all but 'ERROR' for attrition)
+        and of the counted rows matching the status filter.
+        """
+        total = NOT_ERROR_FILTER.mask(df) if self.is_attrition_metric else np.ones(len(df), dtype=bool)
+        return total, self.status_filter.mask(df) & total
 
     def compute_on(self, df: pd.DataFrame) -> float:
         """
         Calculates the rate as the percentage of rows where the pledge_status
         matches any of the specified statuses.
         """
-        if self.is_attrition_metric:
-            df = df.query("pledge_status != 'ERROR'")
-        matching = df.query("pledge_status in @self.status_to_filter")
-        return round((matching.shape[0] / df.shape[0]) * 100, 1) if len(df) > 0 else 0.0
+        total, matching = self.get_masks(df)
+        n_total, n_matching = int(total.sum()), int(matching.sum())
+        return round((n_matching / n_total) * 100, 1) if n_total > 0 else 0.0
+
+    def compute_by_period(self, df_periods: pd.DataFrame) -> pd.Series:
+        """Counts matching and total rows per period in one grouped pass, from the shared status masks."""
+        total, matching = self.get_masks(df_periods)
+        counts = pd.DataFrame({'matching': matching, 'total': total}, index=df_periods.index)
+        counts = counts.groupby(df_periods['period'], observed=False).sum()
+
+        return pd.Series({
+            period: round((row.matching / row.total) * 100, 1) if row.total > 0 else 0.0
+            for period, row in counts.iterrows()
+        })
 
     def aggregate_value(self, df: pd.DataFrame, group_cols: list) -> pd.DataFrame:
         """
@@ -264,17 +430,47 @@ class RateMetric(TimeSeriesMixin, Metric):
         If is_attrition_metric is True, rows with pledge_status == 'ERROR' are excluded.
         The result is scaled to percentage (0–100).
         """
-        df = df.copy()
-        df["is_match"] = df["pledge_status"].isin(self.status_to_filter).astype(int)
-
-        if self.is_attrition_metric:
-            df = df.query("pledge_status != 'ERROR'")
+        total, matching = self.get_masks(df)
+        is_match = pd.Series(matching[total].astype(int), index=df.index[total], name="is_match")
+        keys = [df.loc[total, col] for col in group_cols]
 
-        grouped = df.groupby(group_cols)["is_match"].mean().reset_index(name="value")
+        grouped = is_match.groupby(keys, observed=True).mean().reset_index(name="value")
         grouped["value"] = grouped["value"] * 100  # Convert to percentage
         return grouped
 
 
+def get_amount_sums_by_period(df_periods: pd.DataFrame) -> pd.DataFrame:
+    """Returns the (memoized) sums of 'amount_usd' and 'amount_counterfactual' per period, in float64."""
+    def compute() -> pd.DataFrame:
+        df_amounts = df_periods[['amount_usd', 'amount_counterfactual']].astype('float64')
+        return df_amounts.groupby(df_periods['period'], observed=False).sum()
+
+    return frame_cache.get_or_compute(df_periods, 'amount_sums', compute)
+
+
+def get_recurring_pledges(df: pd.DataFrame, by: tuple = ()) -> pd.DataFrame:
+    """
+    Returns the recurring payments of a frame reduced to one row per (pledge, status):
+    the first payment of each pledge in the frame, with its precomputed 'annualized_amount'.
+
+    The table is memoized per frame, so All, Active and Future ARR (and their previous period)
+    share a single vectorized deduplication pass; each ARR metric then only filters its statuses
+    on this much smaller table.
+
+    Args:
+        df (pd.DataFrame): Payments of a period, sorted by date.
+        by (tuple): Extra columns to deduplicate within (e.g. ('period',) for a frame labeled by period).
+
+    Returns:
+        pd.DataFrame: Recurring payments deduplicated on (*by, 'pledge_id', 'pledge_status').
+    """
+    def compute() -> pd.DataFrame:
+        df_recurring = df[RECURRING_FILTER.mask(df)]
+        return df_recurring.drop_duplicates(subset=[*by, 'pledge_id', 'pledge_status'])
+
+    return frame_cache.get_or_compute(df, ('recurring_pledges', by), compute)
+
+
 class ARRMetric(TimeSeriesMixin, Metric):
     """
     Computes the Annual Recurring Revenue (ARR) by annualizing pledge amounts
@@ -291,24 +487,27 @@ class ARRMetric(TimeSeriesMixin, Metric):
     def __init__(self, name: str, slug: str, status_to_filter: List[str], unit: str = "$"):
         super().__init__(name, slug, unit)
         self.status_to_filter = status_to_filter
+        self.status_filter = CategoryFilter('pledge_status', status_to_filter)
 
-    def compute(self, df: pd.DataFrame):
-        """Computes the ARR value and stores it in self.value."""
-        self.value = self.compute_on(df)
+    def get_unique_pledges(self, df: pd.DataFrame, by: tuple = ()) -> pd.DataFrame:
+        """
+        Keeps one row per recurring pledge matching the status filter (its first payment in the frame).
+        Pledges whose first matching payment happens later than a non-matching one are kept as well,
+        exactly as if the frame was filtered on status before deduplicating on 'pledge_id'.
+        """
+        df_pledges = get_recurring_pledges(df, by=by)
+        df_pledges = df_pledges[self.status_filter.mask(df_pledges)]
+        return df_pledges.drop_duplicates(subset=[*by, 'pledge_id'])
 
     def compute_on(self, df: pd.DataFrame) -> float:
         """Stateless computation of ARR, filtered and annualized."""
-        frequency_to_exclude = ['One-Time', 'Unspecified']
-        df_cleaned = df.query("frequency not in @frequency_to_exclude")
-        df_filtered = df_cleaned.query("pledge_status in @self.status_to_filter")
-        df_unique_pledges = df_filtered.drop_duplicates(subset='pledge_id').copy()
-
-        df_unique_pledges['annualized_amount'] = df_unique_pledges.apply(
-            lambda x: FREQ_MULTIPLIER.get(x['frequency'], 0) * x['amount_usd'],
-            axis=1
-        )
+        return self.get_unique_pledges(df)['annualized_amount'].astype('float64').sum()
 
-        return df_unique_pledges['annualized_amount'].sum()
+    def compute_by_period(self, df_periods: pd.DataFrame) -> pd.Series:
+        """Sums the annualized pledges per period, on the deduplicated table shared by all ARR metrics."""
+        df_pledges = self.get_unique_pledges(df_periods, by=('period',))
+        values = df_pledges['annualized_amount'].astype('float64')
+        return values.groupby(df_pledges['period'], observed=False).sum()
 
     def aggregate_value(self, df: pd.DataFrame, group_cols: list) -> pd.DataFrame:
         """
@@ -320,7 +519,7 @@ class ARRMetric(TimeSeriesMixin, Metric):
             - Removes duplicate pledge entries.
 
         Computation:
-            - Each pledge is annualized using a multiplier based on its frequency.
+            - Each pledge is annualized using a multiplier based on its frequency (precomputed at load time).
             - The aggregated value is then summed per specified group columns.
 
         Parameters:
@@ -331,10 +530,88 @@ class ARRMetric(TimeSeriesMixin, Metric):
             pd.DataFrame: Grouped and summed DataFrame with one row per group and
                           a 'value' column representing total ARR.
         """
-        df = df.copy()
-        df = df.query("frequency not in ['One-Time', 'Unspecified']")
-        df = df.query("pledge_status in @self.status_to_filter")
-        df = df.drop_duplicates(subset='pledge_id')
-        df['value'] = df.apply(lambda x: FREQ_MULTIPLIER.get(x['frequency'], 0) * x['amount_usd'], axis=1)
+        df_pledges = self.get_unique_pledges(df)
+        values = df_pledges['annualized_amount'].astype('float64').rename('value')
+
+        return values.groupby([df_pledges[col] for col in group_cols], observed=True).sum().reset_index()
+
+
+def label_periods(frames: dict) -> pd.DataFrame:
+    """
+    Stacks the frames of several periods into one frame with a categorical 'period' column,
+    so every metric can be evaluated for all periods at once (see `evaluate_metrics`).
+
+    Args:
+        frames (dict): Mapping of period label (e.g. CURRENT_PERIOD) to the data of the period.
+
+    Returns:
+        pd.DataFrame: The concatenated frames, in the order of `frames`, with their 'period' label.
+    """
+    df_periods = pd.concat(frames.values(), ignore_index=True)
+    df_periods['period'] = pd.Categorical.from_codes(
+        np.repeat(np.arange(len(frames)), [len(df) for df in frames.values()]),
+        categories=list(frames)
+    )
+    return df_periods
+
+
+def evaluate_metrics(
+        metrics: List[Metric],
+        period_bounds: dict,
+        resolve_periods: Callable[[str], pd.DataFrame],
+        version: str,
+        targets_data: dict,
+        year_selected: int,
+        year_mode: str,
+        quarter_selected: str,
+        today_override: Optional[pd.Timestamp] = None
+) -> dict:
+    """
+    Evaluates a batch of metrics for the current and previous periods of a selection.
+
+    Each metric computes its values for both periods in a single grouped pass over the labeled frame,
+    and intermediate results (status masks, amount sums, distinct counts, ARR pledge table) are shared
+    across metrics, so the cost grows with the data size rather than with data size × number of metrics.
+
+    Values are memoized per (metric, period bounds, data version), so a period computed once is served
+    to every selection displaying it (e.g. FY2024 as current period, then as previous period of FY2025),
+    and the labeled frames are only resolved when a value is missing.
+
+    Parameters:
+    - metrics (List[Metric]): Metrics to evaluate (e.g. `all_metrics`).
+    - period_bounds (dict): Bounds of CURRENT_PERIOD and PREVIOUS_PERIOD (see `get_comparison_period_bounds`).
+    - resolve_periods (Callable[[str], pd.DataFrame]): Returns the frame labeled with the periods (see
+      `label_periods`) of the table a metric is computed on (see `Metric.source`).
+    - version (str): Version of the dataset the frames are resolved from.
+    - targets_data (dict): Loaded targets JSON.
+    - year_selected (int): The reference year (e.g., 2025).
+    - year_mode (str): Either 'fy' (fiscal year) or 'cy' (calendar year).
+    - quarter_selected (str): Either 'all' or '1'-'4'.
+    - today_override (pd.Timestamp, optional): Use this as "today" instead of the real date.
+
+    Returns:
+    - dict: MetricResult of each metric, keyed by slug.
+    """
+    results = {}
+
+    for metric in metrics:
+        keys = {period: (metric.slug, bounds, version) for period, bounds in period_bounds.items()}
+        values = {period: period_values.get(key, MISSING) for period, key in keys.items()}
+
+        if any(value is MISSING for value in values.values()):
+            computed = metric.compute_by_period(resolve_periods(metric.source)).to_dict()
+            for period, key in keys.items():
+                values[period] = computed.get(period, 0)
+                period_values.set(key, values[period])
+
+        results[metric.slug] = metric.build_result(
+            value=values[CURRENT_PERIOD],
+            previous_value=values[PREVIOUS_PERIOD],
+            targets_data=targets_data,
+            year_selected=year_selected,
+            year_mode=year_mode,
+            quarter_selected=quarter_selected,
+            today_override=today_override
+        )
 
-        return df.groupby(group_cols)['value'].sum().reset_index()
+    return results
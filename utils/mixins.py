@@ -1,5 +1,5 @@
 import pandas as pd
-from constants.time import MONTH_ORDER_FY, MONTH_ORDER_CY
+from constants.schema import MONTH_ORDER_COLUMNS
 
 
 class TimeSeriesMixin:
@@ -18,33 +18,29 @@ class TimeSeriesMixin:
         """
         df = df.copy()
         df["value"] = self.get_value_series(df)
-        return df.groupby(group_cols)['value'].sum().reset_index()
+        return df.groupby(group_cols, observed=True)['value'].sum().reset_index()
 
     def build_time_series_df(self, df: pd.DataFrame, year_mode: str) -> pd.DataFrame:
         """
         Builds a time series DataFrame aggregated by month for plotting.
 
-        The method assigns month labels, uses a custom fiscal or calendar month order,
+        The method relies on the precomputed month labels and fiscal or calendar month order,
         aggregates the data per period and month, and returns a DataFrame sorted
         accordingly for clean line chart plotting.
 
         Parameters:
-            df (pd.DataFrame): The input DataFrame containing a 'date' column and value-related fields.
+            df (pd.DataFrame): The input DataFrame containing the date dimension columns and value-related fields.
             year_mode (str): The year aggregation mode, either 'fy' for fiscal year or 'cy' for calendar year.
 
         Returns:
             pd.DataFrame: Aggregated DataFrame with columns for 'period', 'month_label',
                           'month_order', and 'value', ready for visualization.
         """
-        df = df.copy()
-        df['month'] = pd.to_datetime(df['date']).dt.month
-        df['month_label'] = pd.to_datetime(df['date']).dt.strftime('%b')
-
-        month_order = MONTH_ORDER_FY if year_mode == 'fy' else MONTH_ORDER_CY
+        month_order_col = MONTH_ORDER_COLUMNS[year_mode]
 
         # Use month_order for sorting
-        grouped = self.aggregate_value(df, group_cols=['period', 'month_label'])
-        grouped['month_order'] = grouped['month_label'].apply(lambda x: month_order.index(x))
+        grouped = self.aggregate_value(df, group_cols=['period', month_order_col, 'month_label'])
+        grouped = grouped.rename(columns={month_order_col: 'month_order'})
         grouped = grouped.sort_values(['period', 'month_order'])
 
         return grouped
@@ -57,25 +53,21 @@ class TimeSeriesMixin:
         by period and week. Adds a label for weeks (e.g., 'W1', 'W2') and returns a
         chronologically sorted DataFrame.
 
+        Weeks elapsed are computed without any per-row Python code: the first week of each period is
+        broadcast with a grouped transform, and subtracted from the precomputed integer 'week_index'.
+
         Parameters:
-            df (pd.DataFrame): Input DataFrame with a 'date' column and 'period' column for comparison.
+            df (pd.DataFrame): Input DataFrame with a 'week_index' column and 'period' column for comparison.
 
         Returns:
             pd.DataFrame: Aggregated DataFrame with 'weeks_elapsed', 'weeks_label', 'period', and 'value',
                           sorted by 'period' and 'weeks_elapsed'.
         """
-        df = df.copy()
-        df['date'] = pd.to_datetime(df['date'])
-        df['week_start'] = df['date'] - pd.to_timedelta(df['date'].dt.dayofweek, unit='d')
-
-        start_dates = df.groupby('period')['week_start'].min().to_dict()
-        df['weeks_elapsed'] = df.apply(
-            lambda row: ((row['week_start'] - start_dates[row['period']]).days // 7) + 1,
-            axis=1
-        )
+        first_week = df.groupby('period', observed=True)['week_index'].transform('min')
+        df = df.assign(weeks_elapsed=(df['week_index'] - first_week + 1).astype('int64'))
 
         df_result = self.aggregate_value(df, group_cols=['period', 'weeks_elapsed'])
-        df_result['weeks_label'] = df_result['weeks_elapsed'].apply(lambda x: f'W{x}')
+        df_result['weeks_label'] = 'W' + df_result['weeks_elapsed'].astype(str)
         return df_result.sort_values(by=['period', 'weeks_elapsed']).reset_index(drop=True)
 
     def build_breakdown_df(self, df: pd.DataFrame, group_col: str) -> pd.DataFrame:
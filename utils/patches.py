@@ -0,0 +1,68 @@
+from typing import Any, Iterator, Union
+
+from dash import Patch, no_update
+
+# Change removing a key of a dict (e.g. a layout property only set on the previous figure)
+DELETED = object()
+
+
+def get_component_type(value: dict) -> tuple:
+    """Returns the (namespace, type) of a serialized Dash component, or (None, None) for other dicts."""
+    return value.get('namespace'), value.get('type')
+
+
+def iter_changes(previous: Any, current: Any, location: tuple = ()) -> Iterator[tuple[tuple, Any]]:
+    """
+    Compares two serialized (JSON-ready) values, such as component trees or figures, and yields the
+    smallest subtrees of `current` that differ from `previous`, with their location (keys and indexes).
+
+    Dicts are compared key by key (keys missing from `current` are yielded as `DELETED`), and lists of the same
+    length item by item, so only changed numbers, colors or labels are yielded. A list whose length changed,
+    a component whose type changed, or a value whose type changed, is yielded whole.
+    """
+    if (isinstance(current, dict) and isinstance(previous, dict)
+            and get_component_type(current) == get_component_type(previous)):
+        for key, value in current.items():
+            if key in previous:
+                yield from iter_changes(previous[key], value, (*location, key))
+            else:
+                yield (*location, key), value
+        for key in previous:
+            if key not in current:
+                yield (*location, key), DELETED
+    elif isinstance(current, list) and isinstance(previous, list) and len(current) == len(previous):
+        for index, value in enumerate(current):
+            yield from iter_changes(previous[index], value, (*location, index))
+    elif current != previous:
+        yield location, current
+
+
+def make_patch(previous: Any, current: Any) -> Union[Patch, Any]:
+    """
+    Builds the update of an output property from its `previous` value to its `current` value.
+
+    Args:
+        previous (Any): Serialized value displayed in the browser.
+        current (Any): Serialized new value.
+
+    Returns:
+        Patch | Any: `dash.no_update` if nothing changed, a `dash.Patch` assigning (or deleting) only the changed
+        subtrees (the browser keeps its components mounted), or `current` itself if the whole value changed.
+    """
+    patch = Patch()
+    changed = False
+
+    for location, value in iter_changes(previous, current):
+        if not location:
+            return current
+
+        target = patch
+        for key in location[:-1]:
+            target = target[key]
+        if value is DELETED:
+            del target[location[-1]]
+        else:
+            target[location[-1]] = value
+        changed = True
+
+    return patch if changed else no_update
@@ -0,0 +1,135 @@
+import glob
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+RESULT_STORE_PATH = 'data/cache/results.sqlite'
+
+# Python sources of the app (relative to its root directory), other files of the checkout (virtual environments,
+# build directories, notebooks, ...) never change the results
+CODE_SOURCES = ('app.py', 'constants', 'load_data', 'utils')
+
+
+def get_code_fingerprint(
+        root: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        sources: tuple[str, ...] = CODE_SOURCES
+) -> str:
+    """
+    Computes a short hash of the Python sources of the app, so results rendered by a previous
+    version of the code (metrics, figures, layouts) are never served after a deploy.
+
+    Args:
+        root (str): Root directory of the app.
+        sources (tuple[str, ...]): Python files and packages of the app, relative to `root`.
+
+    Returns:
+        str: Hex digest identifying the code version.
+    """
+    digest = hashlib.blake2b(digest_size=10)
+
+    paths = []
+    for source in sources:
+        source_path = os.path.join(root, source)
+        if os.path.isdir(source_path):
+            paths.extend(glob.glob(os.path.join(source_path, '**', '*.py'), recursive=True))
+        elif os.path.isfile(source_path):
+            paths.append(source_path)
+
+    for path in sorted(paths):
+        digest.update(os.path.relpath(path, root).encode())
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+
+    return digest.hexdigest()
+
+
+def get_namespace(*fingerprints: str) -> str:
+    """Combines the fingerprints of the inputs results depend on (e.g. targets file, code) into one key."""
+    return hashlib.blake2b('|'.join(fingerprints).encode(), digest_size=10).hexdigest()
+
+
+class ResultStore:
+    """
+    Persistent key-value store of serialized (JSON) results, backed by a local SQLite file.
+
+    Results are stored per namespace (fingerprint of the targets and code) and data version (fingerprint of
+    the CSV), so they survive restarts and deploys as long as these inputs are unchanged, and are never served
+    once any of them changes. Several processes (gunicorn workers) can share the file.
+
+    Any storage failure is logged and ignored: the store can never prevent a callback from answering.
+    """
+
+    def __init__(self, namespace: str, path: str = RESULT_STORE_PATH):
+        self.namespace: str = namespace
+        self.path: str = path
+        self._local = threading.local()
+
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            with self._connect() as connection:
+                connection.execute(
+                    'CREATE TABLE IF NOT EXISTS results ('
+                    'namespace TEXT, version TEXT, key TEXT, value TEXT, created_at REAL, '
+                    'PRIMARY KEY (namespace, version, key))'
+                )
+        except (sqlite3.Error, OSError):
+            logger.exception('Result store %s is unavailable', path)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}: {self.path} | namespace='{self.namespace}'>"
+
+    def _connect(self) -> sqlite3.Connection:
+        """Returns the connection of the calling thread (SQLite connections can't be shared across threads)."""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10)
+            connection.execute('PRAGMA journal_mode=WAL')
+            self._local.connection = connection
+        return connection
+
+    @staticmethod
+    def make_key(key: Any) -> str:
+        return json.dumps(key, separators=(',', ':'), default=str)
+
+    def get(self, version: str, key: Any, default: Any = None) -> Any:
+        """Returns the result stored for (`version`, `key`), or `default`."""
+        try:
+            row = self._connect().execute(
+                'SELECT value FROM results WHERE namespace = ? AND version = ? AND key = ?',
+                (self.namespace, version, self.make_key(key))
+            ).fetchone()
+        except sqlite3.Error:
+            logger.exception('Failed to read from result store %s', self.path)
+            return default
+
+        return json.loads(row[0]) if row else default
+
+    def set(self, version: str, key: Any, value: Any) -> None:
+        """Stores a JSON-serializable result for (`version`, `key`)."""
+        try:
+            with self._connect() as connection:
+                connection.execute(
+                    'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)',
+                    (self.namespace, version, self.make_key(key), json.dumps(value, separators=(',', ':')),
+                     time.time())
+                )
+        except (sqlite3.Error, TypeError, ValueError):
+            logger.exception('Failed to write to result store %s', self.path)
+
+    def prune(self, version: Optional[str] = None) -> None:
+        """Deletes the results of other namespaces and, if given, of other data versions."""
+        try:
+            with self._connect() as connection:
+                connection.execute(
+                    'DELETE FROM results WHERE namespace != ? OR (? IS NOT NULL AND version != ?)',
+                    (self.namespace, version, version)
+                )
+        except sqlite3.Error:
+            logger.exception('Failed to prune result store %s', self.path)
@@ -0,0 +1,262 @@
+import base64
+import math
+import threading
+from typing import Any
+
+import numpy as np
+
+# Subplot containers of the layout template, only needed by figures drawing traces of these types
+SUBPLOT_TRACE_TYPES = {
+    'geo': {'scattergeo', 'choropleth'},
+    'polar': {'scatterpolar', 'scatterpolargl', 'barpolar'},
+    'ternary': {'scatterternary'},
+    'scene': {'scatter3d', 'surface', 'mesh3d', 'cone', 'streamtube', 'volume', 'isosurface'},
+    'mapbox': {'scattermapbox', 'choroplethmapbox', 'densitymapbox'},
+}
+
+# Trace properties moved to the layout template when all the traces of a type share them. Only styling
+# read through the template by plotly.js (not data arrays, names, legend groups or axis references)
+TEMPLATED_TRACE_PROPERTIES = (
+    'cliponaxis', 'fill', 'fillgradient', 'hovertemplate', 'line', 'marker', 'mode', 'textfont', 'textposition',
+    'width'
+)
+
+# Trace data arrays sent as typed arrays, from this length on (shorter arrays are smaller as plain JSON)
+TYPED_ARRAY_PROPERTIES = ('x', 'y', 'base')
+MIN_TYPED_ARRAY_LENGTH = 8
+
+# Smallest integer types supported by plotly.js typed arrays, tried in this order
+INTEGER_DTYPES = ('i1', 'u1', 'i2', 'u2', 'i4', 'u4')
+
+
+def is_figure(value: Any) -> bool:
+    return isinstance(value, dict) and isinstance(value.get('data'), list) and isinstance(value.get('layout'), dict)
+
+
+def is_typed_array(value: Any) -> bool:
+    return isinstance(value, dict) and 'bdata' in value and 'dtype' in value
+
+
+def is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def round_value(value: Any, digits: int) -> Any:
+    """Rounds the floats nested in a serialized value to `digits` significant digits (typed arrays excepted)."""
+    if isinstance(value, float):
+        return float(f'{value:.{digits}g}') if math.isfinite(value) else value
+    if isinstance(value, list):
+        return [round_value(item, digits) for item in value]
+    if isinstance(value, dict) and not is_typed_array(value):
+        return {key: round_value(item, digits) for key, item in value.items()}
+    return value
+
+
+def encode_array(values: np.ndarray) -> dict:
+    return {'dtype': values.dtype.str[1:], 'bdata': base64.b64encode(values.tobytes()).decode()}
+
+
+def compact_array(values: np.ndarray) -> np.ndarray:
+    """
+    Converts numbers to the smallest type holding them at display precision: integers to the smallest integer
+    type, other finite values to 32-bit floats (about 7 significant digits).
+    """
+    if values.dtype.kind not in 'iuf' or not values.size:
+        return values
+
+    if values.dtype.kind == 'f' and not np.isfinite(values).all():
+        return values
+    if values.dtype.kind in 'iu' or np.array_equal(values, np.round(values)):
+        for dtype in INTEGER_DTYPES:
+            info = np.iinfo(dtype)
+            if info.min <= values.min() and values.max() <= info.max:
+                return values.astype(dtype)
+        return values
+    if np.abs(values).max() < np.finfo('f4').max:
+        return values.astype('<f4')
+    return values
+
+
+def compact_typed_array(value: dict) -> dict:
+    """Re-encodes a typed array (e.g. 64-bit floats encoded by Plotly) with the smallest type."""
+    if 'shape' in value:
+        return value
+    values = np.frombuffer(base64.b64decode(value['bdata']), dtype=np.dtype(value['dtype']).newbyteorder('<'))
+    compacted = compact_array(values)
+    return value if compacted is values else encode_array(compacted)
+
+
+def factor_templates(figures: dict) -> tuple[dict, list]:
+    """
+    Replaces the layout template of serialized figures by its index in the list of their distinct templates,
+    so figures sharing a template (e.g. the time series of every metric) send it once.
+
+    Args:
+        figures (dict): Serialized figures, by key.
+
+    Returns:
+        tuple[dict, list]: The figures (with template indexes), and the distinct templates.
+    """
+    templates = []
+    factored = {}
+    for key, figure in figures.items():
+        layout = dict(figure['layout'])
+        template = layout.get('template')
+        if template is not None:
+            if template not in templates:
+                templates.append(template)
+            layout['template'] = templates.index(template)
+        factored[key] = {**figure, 'layout': layout}
+    return factored, templates
+
+
+def merge_defaults(defaults: Any, values: Any) -> Any:
+    """Merges trace properties into template defaults: nested dicts key by key, `values` taking precedence."""
+    if isinstance(defaults, dict) and isinstance(values, dict):
+        return {**defaults, **{key: merge_defaults(defaults.get(key), value) for key, value in values.items()}}
+    return values
+
+
+class FigureMinimizer:
+    """
+    Serialization stage shrinking the figures sent to the browser, without changing how they render.
+
+    Applied to the serialized (JSON-ready) outputs of the callbacks, it rewrites every figure they contain:
+
+    - The layout template only keeps the defaults of the trace types and subplots the figure draws
+      (Plotly's default template carries the styling of every trace type, about 7 kB per figure).
+    - Styling shared by all the traces of a type (bar widths, text positions, hover templates, ...) is moved
+      to the template, so it is sent once instead of once per trace.
+    - Floats are rounded to `digits` significant digits, and numeric data arrays are sent as typed arrays
+      (base64) of the smallest type holding them (integers, or 32-bit floats).
+
+    The outputs are then encoded with orjson, when installed, by Plotly's JSON encoder (used by Dash).
+    Sizes before and after are counted per callback (see `get_stats`).
+    """
+
+    def __init__(self, digits: int = 6):
+        self.digits: int = digits
+        self._stats: dict = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}: digits={self.digits}>"
+
+    def minimize_output(self, output: Any, name: str, size: int) -> Any:
+        """
+        Minimizes the figures of a serialized callback output.
+
+        Args:
+            output (Any): Serialized output (component trees, figures, tuples of these, ...).
+            name (str): Name of the callback, for the statistics.
+            size (int): Size of the output encoded in JSON, in bytes.
+
+        Returns:
+            Any: The output with its figures minimized.
+        """
+        from plotly.io.json import to_json_plotly
+
+        output = self.minimize_value(output)
+        self.record(name, size_before=size, size_after=len(to_json_plotly(output)))
+        return output
+
+    def minimize_value(self, value: Any) -> Any:
+        """Minimizes the figures nested in a serialized value."""
+        if is_figure(value):
+            return self.minimize_figure(value)
+        if isinstance(value, (list, tuple)):
+            return [self.minimize_value(item) for item in value]
+        if isinstance(value, dict):
+            return {key: self.minimize_value(item) for key, item in value.items()}
+        return value
+
+    def minimize_figure(self, figure: dict) -> dict:
+        layout = dict(figure['layout'])
+        template = layout.pop('template', None)
+        traces = [self.minimize_trace(trace) for trace in figure['data']]
+
+        if isinstance(template, dict):
+            template = self.prune_template(template, traces)
+            traces, template = self.move_styling_to_template(traces, template)
+
+        layout = round_value(layout, self.digits)
+        if template is not None:  # May be the index of a factored template (see `factor_templates`)
+            layout['template'] = template
+        return {**figure, 'data': traces, 'layout': layout}
+
+    def minimize_trace(self, trace: dict) -> dict:
+        trace = round_value(trace, self.digits)
+        for key in TYPED_ARRAY_PROPERTIES:
+            value = trace.get(key)
+            if is_typed_array(value):
+                trace[key] = compact_typed_array(value)
+            elif (isinstance(value, list) and len(value) >= MIN_TYPED_ARRAY_LENGTH
+                  and all(is_number(item) for item in value)):
+                trace[key] = encode_array(compact_array(np.asarray(value, dtype='<f8')))
+        return trace
+
+    @staticmethod
+    def prune_template(template: dict, traces: list[dict]) -> dict:
+        """Keeps the template defaults of the trace types drawn, and of the subplots they are drawn on."""
+        trace_types = {trace.get('type', 'scatter') for trace in traces}
+        template = dict(template)
+
+        if isinstance(template.get('data'), dict):
+            template['data'] = {key: value for key, value in template['data'].items() if key in trace_types}
+
+        if isinstance(template.get('layout'), dict):
+            template['layout'] = {
+                key: value for key, value in template['layout'].items()
+                if key not in SUBPLOT_TRACE_TYPES or SUBPLOT_TRACE_TYPES[key] & trace_types
+            }
+        return template
+
+    @staticmethod
+    def move_styling_to_template(traces: list[dict], template: dict) -> tuple[list[dict], dict]:
+        """
+        Moves the styling shared by all the traces of a type (at least two) to the template defaults of that type.
+        Plotly.js falls back to the template for properties missing from a trace, so the figure renders the same.
+        """
+        traces_by_type = {}
+        for trace in traces:
+            traces_by_type.setdefault(trace.get('type', 'scatter'), []).append(trace)
+
+        template_data = dict(template.get('data') or {})
+        for trace_type, typed_traces in traces_by_type.items():
+            if len(typed_traces) < 2:
+                continue
+
+            shared = {
+                key: typed_traces[0][key] for key in TEMPLATED_TRACE_PROPERTIES
+                if key in typed_traces[0] and all(trace.get(key) == typed_traces[0][key] for trace in typed_traces)
+            }
+            if not shared:
+                continue
+
+            # Defaults of a type are cycled through its traces: every entry gets the shared styling
+            defaults = template_data.get(trace_type) or [{}]
+            template_data[trace_type] = [merge_defaults(entry, shared) for entry in defaults]
+            for trace in typed_traces:
+                for key in shared:
+                    del trace[key]
+
+        return traces, {**template, 'data': template_data}
+
+    def record(self, name: str, size_before: int, size_after: int) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(name, {'outputs': 0, 'bytes_before': 0, 'bytes_after': 0})
+            stats['outputs'] += 1
+            stats['bytes_before'] += size_before
+            stats['bytes_after'] += size_after
+
+    def get_stats(self) -> dict:
+        """Returns, per callback, the number of outputs minimized, their sizes before and after, and bytes saved."""
+        with self._lock:
+            return {
+                name: {
+                    **stats,
+                    'bytes_saved': stats['bytes_before'] - stats['bytes_after'],
+                    'ratio': round(stats['bytes_after'] / stats['bytes_before'], 3) if stats['bytes_before'] else None,
+                }
+                for name, stats in self._stats.items()
+            }
@@ -0,0 +1,85 @@
+import logging
+import threading
+import time
+from collections import namedtuple
+from typing import Callable, Optional
+
+from dash.exceptions import PreventUpdate
+
+logger = logging.getLogger(__name__)
+
+# A callback to run with its arguments, exactly as Dash would call it
+WarmupTask = namedtuple('WarmupTask', 'fn, args')
+
+
+class Warmup:
+    """
+    Precomputes callback outputs (and, through them, the dataset slices and metric values) over the
+    selection space, so the first users after a deploy are served from the caches.
+
+    Tasks are built lazily by `get_tasks` and run in order, either in a background thread (`start`)
+    or synchronously (`run`, e.g. at import time when the app is preloaded before gunicorn forks).
+    A failing task is logged and skipped: the warm-up can never prevent the app from serving requests.
+    """
+
+    def __init__(self, get_tasks: Callable[[], list]):
+        self.get_tasks: Callable[[], list] = get_tasks
+        self.total: int = 0
+        self.done: int = 0
+        self.failed: int = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}: {self.done}/{self.total} tasks | ready={self.is_ready}>"
+
+    @property
+    def is_running(self) -> bool:
+        return self.started_at is not None and self.finished_at is None
+
+    @property
+    def is_ready(self) -> bool:
+        return self.finished_at is not None
+
+    def run(self) -> None:
+        """Runs every task in the calling thread."""
+        self.started_at = time.monotonic()
+        tasks = self.get_tasks()
+        self.total = len(tasks)
+
+        for task in tasks:
+            try:
+                task.fn(*task.args)
+            except PreventUpdate:
+                pass
+            except Exception:
+                self.failed += 1
+                logger.exception('Warm-up task %s%s failed', task.fn.__name__, task.args)
+            self.done += 1
+
+        self.finished_at = time.monotonic()
+        logger.info('Warm-up completed: %d tasks (%d failed) in %.1fs',
+                    self.total, self.failed, self.finished_at - self.started_at)
+
+    def start(self) -> threading.Thread:
+        """Runs the tasks in a daemon thread (only once)."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run, name='warmup', daemon=True)
+            self._thread.start()
+        return self._thread
+
+    def get_status(self) -> dict:
+        if self.started_at is None:
+            elapsed = None
+        else:
+            elapsed = round((self.finished_at or time.monotonic()) - self.started_at, 1)
+
+        return {
+            'ready': self.is_ready,
+            'running': self.is_running,
+            'done': self.done,
+            'total': self.total,
+            'failed': self.failed,
+            'elapsed_seconds': elapsed,
+        }